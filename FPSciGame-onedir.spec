@@ -0,0 +1,47 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Fast-start profile: a onedir build with UPX disabled, so nothing is unpacked
+# or decompressed on launch. Build with `pyinstaller FPSciGame-onedir.spec` and
+# ship the whole dist\FPSciGame folder.
+
+
+a = Analysis(
+    ['TennisCognitiveGame.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=['numpy', 'analytics'],
+    noarchive=False,
+    optimize=0,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='FPSciGame',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='FPSciGame',
+)
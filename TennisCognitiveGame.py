@@ -1,43 +1,140 @@
-import random
+from startup import StartupTimer
+
+STARTUP = StartupTimer()
+
+import os
+import sys
 import time
 import tkinter as tk
-from tkinter import messagebox, simpledialog
+
+import checkpoint
+import game_engine as engine
+import trial_log
+from history_view import HistoryView
+from results_store import ResultsStore, default_data_dir, session_writer
+from scheduler import SharedScheduler
+from session import PlayerSession
+from write_behind import WriteBehind, append_bytes, write_files
+
+
+def upload_after(write, writer, upload):
+    # Local storage first; only what was stored is queued for upload, under its own sink so a
+    # failed spool append is retried without writing the local copy again.
+    def write_then_upload(items, sync):
+        write(items, sync)
+        for item in items:
+            writer.submit(upload, item)
+
+    return write_then_upload
+
+
+class SharedServices:
+    def __init__(self, root, persistence_fsync="interval", aggregator=None, telemetry=False):
+        self.root = root
+        self.stations = []
+        self.scheduler = SharedScheduler(root)
+        self.results = ResultsStore()
+        self.writer = WriteBehind(fsync=persistence_fsync)
+        self.trial_log = trial_log.TrialLog(writer=lambda data: self.writer.submit("trials", data))
+        write_sessions = session_writer(self.results.path)
+        write_trials = lambda chunks, sync: append_bytes(self.trial_log.path, chunks, sync)
+
+        aggregator = aggregator or os.environ.get("FPSCI_AGGREGATOR")
+        self.uploader = None
+        if aggregator:
+            from aggregation import UploadClient, parse_address
+
+            host, port = parse_address(aggregator)
+            self.uploader = UploadClient(host, port)
+            self.writer.register("upload-sessions", self.uploader.spool_sessions)
+            self.writer.register("upload-trials", self.uploader.spool_trials)
+            write_sessions = upload_after(write_sessions, self.writer, "upload-sessions")
+            write_trials = upload_after(write_trials, self.writer, "upload-trials")
+        self.writer.register("sessions", write_sessions)
+        self.writer.register("trials", write_trials)
+        self.journal = checkpoint.SessionJournal(writer=lambda frame: self.writer.submit("journal", frame))
+        self.writer.register("journal", self.journal.write_frames)
+        self.writer.register(
+            "recordings",
+            lambda items, sync: write_files(((path, rec.to_bytes()) for path, rec in items), sync)
+        )
+        self.telemetry = telemetry
+        if telemetry:
+            import telemetry as timing
+
+            self.scheduler.observer = timing.observe_job
+            self.writer.register("telemetry", timing.write_summaries)
+        self._calibration = None
+        self._leaderboard = None
+        self._roster = None
+
+    @property
+    def leaderboard(self):
+        if self._leaderboard is None:
+            from leaderboard import Leaderboard
+
+            self._leaderboard = Leaderboard.from_records(self.results.iter_sessions(), k=10)
+        return self._leaderboard
+
+    @property
+    def calibration(self):
+        if self._calibration is None:
+            import stimulus
+
+            self._calibration = stimulus.load_calibration() or {}
+        return self._calibration
+
+    @calibration.setter
+    def calibration(self, summary):
+        self._calibration = summary
+
+    @property
+    def roster(self):
+        if self._roster is None:
+            from roster import PlayerRoster
+
+            self._roster = PlayerRoster.from_store(self.results)
+        return self._roster
+
+    def close(self):
+        self.trial_log.close()
+        if self.writer.close():
+            # A sink that outlived the timeout still writes to these; process exit closes them then.
+            self.journal.close()
+            if self.uploader is not None:
+                self.uploader.close()
+        self.results.close()
 
 
 class TennisCognitiveApp:
-    def __init__(self, master):
+    def __init__(self, master, services=None, station=1):
         self.master = master
-        self.master.title("Tennis Cognitive Training")
+        self.station = station
+        self.master.title("Tennis Cognitive Training" if station == 1 else f"Tennis Cognitive Training - Station {station}")
         self.master.resizable(False, False)
 
-        self.level = 1
-        self.score = 0
-        self.total_score = 0
-        self.current_player = None
-        self.current_game = None
-        self.game_running = False
-        self.level_2_unlock_score = 50
-        self.level_3_unlock_score = 100
-
-        self.base_speed = {
-            "Attention": 1200,
-            "Coordination": 20,
-            "Decision": 1400,
-            "Reaction": 1500,
-            "Memory": 2600
-        }
-
-        self.best_scores = {
-            "Attention": {},
-            "Coordination": {},
-            "Decision": {},
-            "Reaction": {},
-            "Memory": {}
-        }
-        self.game_records = []
-
-        self._after_jobs = []
-        self._bindings = []
+        self.services = services or SharedServices(master)
+        self.services.stations.append(self)
+        self.scheduler = self.services.scheduler
+        self.results = self.services.results
+        self.writer = self.services.writer
+        self.trial_log = self.services.trial_log
+
+        self.level_2_unlock_score = engine.LEVEL_2_UNLOCK_SCORE
+        self.level_3_unlock_score = engine.LEVEL_3_UNLOCK_SCORE
+
+        self.base_speed = dict(engine.BASE_SPEED)
+        self.target_fps = 60
+        self.physics_step = engine.PHYSICS_STEP
+        self.max_physics_steps_per_frame = 5
+        self.record_inputs = True
+        self.difficulty = "fixed"
+        self.correct_input_latency = False
+        self.coordination_balls = 1
+        self.multiball_count = 200
+        self.multiball_seconds = 60
+        self.telemetry_overlay = False
+        self.resume_from = None
 
         container = tk.Frame(master, bg="#1f2f1f")
         container.pack(fill="both", expand=True)
@@ -66,6 +163,12 @@ class TennisCognitiveApp:
         tk.Button(sidebar, text="3. Decision-Making Task", command=self.start_decision, **btn_style).pack(pady=3)
         tk.Button(sidebar, text="4. Reaction Time Task", command=self.start_reaction, **btn_style).pack(pady=3)
         tk.Button(sidebar, text="5. Working Memory Task", command=self.start_memory, **btn_style).pack(pady=3)
+        tk.Button(
+            sidebar,
+            text="Multi-ball Coordination",
+            command=lambda: self.start_coordination(self.multiball_count),
+            **btn_style
+        ).pack(pady=3)
 
         tk.Frame(sidebar, height=20, bg="#193d28").pack()
         tk.Button(
@@ -78,6 +181,26 @@ class TennisCognitiveApp:
             pady=4,
             bg="#ffe8c7"
         ).pack(pady=3)
+        tk.Button(
+            sidebar,
+            text="Leaderboards",
+            command=self.start_leaderboard,
+            width=27,
+            anchor="w",
+            padx=8,
+            pady=4,
+            bg="#ffe8c7"
+        ).pack(pady=3)
+        tk.Button(
+            sidebar,
+            text="Station Calibration",
+            command=self.start_calibration,
+            width=27,
+            anchor="w",
+            padx=8,
+            pady=4,
+            bg="#ffe8c7"
+        ).pack(pady=3)
 
         tk.Label(
             sidebar,
@@ -88,45 +211,68 @@ class TennisCognitiveApp:
         ).pack(side="bottom", anchor="w", padx=8, pady=10)
 
         self.canvas = tk.Canvas(container, width=830, height=600, bg="darkgreen", highlightthickness=0)
-        self.canvas.pack(side="left")
+        self.menu_canvas = tk.Canvas(container, width=830, height=600, bg="#123d2d", highlightthickness=0)
+        self.visible_canvas = None
+        self.history = None
 
         self.title_id = None
         self.player_id = None
         self.level_id = None
         self.score_id = None
         self.help_id = None
+        self.notice_id = None
+        self.telemetry_id = None
         self.exit_btn = None
         self.exit_btn_window = None
+        self.player_dialog = None
+        self.chosen_player = None
+        self.menu_notice_id = None
+        self.menu_notice = ""
+        self.session = PlayerSession(self.canvas)
 
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)
         self.start_menu()
 
     # --------------------------
     # Utilities
     # --------------------------
-    def _schedule(self, delay, callback):
-        job = self.master.after(delay, callback)
-        self._after_jobs.append(job)
-        return job
+    def _schedule(self, delay, callback, onset=None):
+        # onset names a stimulus event (trial_log.ONSET_*): the job is scheduled precisely and
+        # its planned and actual onset go to the trial log.
+        if onset is None:
+            return self.scheduler.after(delay, self.session.timer(callback), owner=self.session)
+
+        def log_onset(planned, actual):
+            # planned and actual are scheduler clock readings; put the planned onset on the
+            # wall-clock axis every other record's t_ns uses.
+            planned_ns = time.time_ns() - int((self.scheduler.clock() - planned) * 1e9)
+            self.log_trial(
+                trial_log.KIND_ONSET, stimulus=onset, response=delay, latency=actual - planned, new_trial=False, t_ns=planned_ns
+            )
+
+        return self.scheduler.after(delay, self.session.timer(callback), owner=self.session, onset=log_onset)
+
+    def _cancel(self, job):
+        if job is not None:
+            self.scheduler.cancel(job)
 
     def _bind(self, widget, sequence, callback):
-        funcid = widget.bind(sequence, callback)
-        self._bindings.append((widget, sequence, funcid))
-        return funcid
+        return self.session.bind(widget, sequence, callback)
 
-    def clear_canvas(self):
-        for job in self._after_jobs:
-            try:
-                self.master.after_cancel(job)
-            except Exception:
-                pass
-        self._after_jobs.clear()
+    def clock(self):
+        return self.session.now()
 
-        for widget, seq, funcid in self._bindings:
-            try:
-                widget.unbind(seq, funcid=funcid)
-            except Exception:
-                pass
-        self._bindings.clear()
+    def show_canvas(self, canvas):
+        if self.visible_canvas is canvas:
+            return
+        if self.visible_canvas is not None:
+            self.visible_canvas.pack_forget()
+        canvas.pack(side="left")
+        self.visible_canvas = canvas
+
+    def clear_canvas(self):
+        self.scheduler.cancel_owner(self.session)
+        self.session.unbind_all()
 
         if self.exit_btn is not None:
             try:
@@ -139,30 +285,30 @@ class TennisCognitiveApp:
         self.canvas.delete("all")
         self.canvas.configure(bg="darkgreen")
 
-    def update_score(self, task, score, better="higher"):
-        best = self.best_scores[task].get(self.level)
-        if best is None:
-            self.best_scores[task][self.level] = score
-        elif (better == "higher" and score > best) or (better == "lower" and score < best):
-            self.best_scores[task][self.level] = score
+    @property
+    def leaderboard(self):
+        return self.services.leaderboard
 
-    def ask_player_name(self, game_name):
-        result = {"name": None}
+    def update_score(self, task, score):
+        if self.session.current_player:
+            self.leaderboard.add(self.session.current_player, task, self.session.level, score)
 
+    def build_player_dialog(self):
         dialog = tk.Toplevel(self.master)
-        dialog.title(f"{game_name} Setup")
+        dialog.withdraw()
         dialog.resizable(False, False)
         dialog.transient(self.master)
-        dialog.grab_set()
         dialog.configure(bg="#eef5ee")
+        parts = {"dialog": dialog, "on_name": None, "suggestions": []}
 
-        tk.Label(
+        parts["heading"] = tk.Label(
             dialog,
-            text=f"{game_name} - Player Setup",
+            text="",
             bg="#eef5ee",
             fg="#163b27",
             font=("Helvetica", 14, "bold")
-        ).grid(row=0, column=0, columnspan=2, padx=16, pady=(12, 10), sticky="w")
+        )
+        parts["heading"].grid(row=0, column=0, columnspan=2, padx=16, pady=(12, 10), sticky="w")
 
         tk.Label(
             dialog,
@@ -172,9 +318,13 @@ class TennisCognitiveApp:
             font=("Helvetica", 11, "bold")
         ).grid(row=1, column=0, padx=(16, 8), pady=(0, 8), sticky="e")
 
-        name_var = tk.StringVar()
+        name_var = tk.StringVar(master=dialog)
         name_entry = tk.Entry(dialog, textvariable=name_var, width=28, font=("Helvetica", 11))
         name_entry.grid(row=1, column=1, padx=(0, 16), pady=(0, 8), sticky="w")
+        suggestions = tk.Listbox(dialog, height=5, width=28, font=("Helvetica", 10), activestyle="none")
+        suggestions.grid(row=2, column=1, padx=(0, 16), pady=(0, 8), sticky="w")
+        parts["name_var"] = name_var
+        parts["entry"] = name_entry
 
         tk.Label(
             dialog,
@@ -182,14 +332,14 @@ class TennisCognitiveApp:
             bg="#eef5ee",
             fg="#163b27",
             font=("Helvetica", 11, "bold")
-        ).grid(row=2, column=0, columnspan=2, padx=16, pady=(2, 4), sticky="w")
+        ).grid(row=3, column=0, columnspan=2, padx=16, pady=(2, 4), sticky="w")
 
         level_lines = [
             "Level 1: Unlocked",
             f"Level 2: Locked (Unlock at {self.level_2_unlock_score} score)",
             f"Level 3: Locked (Unlock at {self.level_3_unlock_score} score)"
         ]
-        for idx, line in enumerate(level_lines, start=3):
+        for idx, line in enumerate(level_lines, start=4):
             tk.Label(
                 dialog,
                 text=line,
@@ -198,217 +348,562 @@ class TennisCognitiveApp:
                 font=("Helvetica", 10)
             ).grid(row=idx, column=0, columnspan=2, padx=16, pady=1, sticky="w")
 
-        btn_row = 3 + len(level_lines)
+        btn_row = 4 + len(level_lines)
         btn_frame = tk.Frame(dialog, bg="#eef5ee")
         btn_frame.grid(row=btn_row, column=0, columnspan=2, padx=16, pady=(12, 14), sticky="e")
+        parts["warning"] = tk.Label(dialog, text="", bg="#eef5ee", fg="#a33b2a", font=("Helvetica", 10))
+        parts["warning"].grid(row=btn_row + 1, column=0, columnspan=2, padx=16, pady=(0, 8), sticky="w")
+
+        def show_suggestions(*_args):
+            names = self.services.roster.complete(name_var.get().strip())
+            if names == parts["suggestions"]:
+                return
+            parts["suggestions"] = names
+            suggestions.delete(0, tk.END)
+            for name in names:
+                suggestions.insert(tk.END, name)
+
+        def pick(_event=None):
+            selection = suggestions.curselection()
+            if selection:
+                name_var.set(parts["suggestions"][selection[0]])
+                name_entry.icursor(tk.END)
+                name_entry.focus_set()
+
+        def complete_first(_event):
+            if parts["suggestions"]:
+                name_var.set(parts["suggestions"][0])
+                name_entry.icursor(tk.END)
+            return "break"
+
+        def close(name):
+            dialog.withdraw()
+            on_name, parts["on_name"] = parts["on_name"], None
+            if on_name is not None:
+                on_name(name)
 
         def submit():
             name = name_var.get().strip()
             if not name:
-                messagebox.showwarning("Player Name", "Please enter player name.", parent=dialog)
+                parts["warning"].configure(text="Please enter player name.")
                 name_entry.focus_set()
                 return
-            result["name"] = name
-            dialog.destroy()
-
-        def cancel():
-            dialog.destroy()
+            # Reuse the registered spelling so "ann " and "Ann" stay one player.
+            close(self.services.roster.add(name))
 
         tk.Button(btn_frame, text="Start", width=10, command=submit, bg="#d6efd6").pack(side="left", padx=(0, 8))
-        tk.Button(btn_frame, text="Cancel", width=10, command=cancel, bg="#f2d6d6").pack(side="left")
+        tk.Button(btn_frame, text="Cancel", width=10, command=lambda: close(None), bg="#f2d6d6").pack(side="left")
 
+        name_var.trace_add("write", show_suggestions)
+        suggestions.bind("<<ListboxSelect>>", pick)
+        name_entry.bind("<Tab>", complete_first)
         dialog.bind("<Return>", lambda _e: submit())
-        dialog.bind("<Escape>", lambda _e: cancel())
+        dialog.bind("<Escape>", lambda _e: close(None))
+        dialog.protocol("WM_DELETE_WINDOW", lambda: close(None))
+        return parts
+
+    def ask_player_name(self, game_name, on_name):
+        # No grab and no nested wait: every station shares one Tk interpreter, so a modal prompt
+        # here would hold up the games running at the others. The answer comes back via on_name.
+        if self.player_dialog is None:
+            self.player_dialog = self.build_player_dialog()
+        parts = self.player_dialog
+        dialog = parts["dialog"]
+        dialog.title(f"{game_name} Setup")
+        parts["heading"].configure(text=f"{game_name} - Player Setup")
+        parts["warning"].configure(text="")
+        parts["on_name"] = on_name
+        parts["name_var"].set(self.session.current_player or "")
+        parts["entry"].select_range(0, tk.END)
 
+        dialog.deiconify()
         dialog.update_idletasks()
         x = self.master.winfo_rootx() + (self.master.winfo_width() - dialog.winfo_width()) // 2
         y = self.master.winfo_rooty() + (self.master.winfo_height() - dialog.winfo_height()) // 2
         dialog.geometry(f"+{max(10, x)}+{max(10, y)}")
-
-        name_entry.focus_set()
-        self.master.wait_window(dialog)
-
-        if not result["name"]:
-            return False
-
-        self.current_player = result["name"]
-        self.current_game = game_name
-        return True
+        dialog.lift()
+        parts["entry"].focus_set()
 
     def save_game_record(self, score):
-        if self.current_player and self.current_game:
-            self.game_records.append({
-                "game": self.current_game,
-                "player": self.current_player,
+        if self.session.current_player and self.session.current_game:
+            self.writer.submit("sessions", {
+                "player": self.session.current_player,
+                "game": self.session.current_game,
+                "level": self.session.level,
                 "score": score,
-                "level": self.level
+                "started_at": self.session.session_started_at,
+                "ended_at": time.time(),
+                "session_key": self.session.session_key
             })
 
+    def checkpoint(self, rng=True):
+        if self.session.game_running and self.session.session_key is not None:
+            balls = self.coordination_balls if self.session.current_game == "Coordination" else 1
+            self.services.journal.checkpoint(self.session, self.station, balls, rng)
+
+    def close_checkpoint(self):
+        # Queued behind the session row, so the journal only marks it closed once that is written.
+        if self.session.current_game and self.session.session_key is not None:
+            state = checkpoint.session_state(self.session, self.station)
+            self.writer.submit("journal", checkpoint.encode(checkpoint.KIND_CLOSED, state))
+
+    def recover_sessions(self):
+        # Sessions a crash left open: offer each to the station that was running it; whatever is
+        # not resumed is saved as it stood at its last checkpoint.
+        journal = self.services.journal
+        orphans, journal.orphans = journal.orphans, []
+        if not orphans:
+            return
+        from tkinter import messagebox
+
+        stations = {station.station: station for station in self.services.stations}
+        resumes = []
+        for state in orphans:
+            # Saved before the crash, with only its closed frame lost: nothing to resume.
+            saved = self.services.results.has_session(state["session_key"])
+            station = None if saved else stations.pop(state["station"], None)
+            if station is not None and messagebox.askyesno(
+                "Resume session",
+                f"{state['player']}'s {state['game']} session was interrupted at level {state['level']}, "
+                f"score {state['total_score']}.\n\nResume it? No saves it as finished.",
+                parent=station.master
+            ):
+                resumes.append((station, state))
+            else:
+                self.close_out_session(state)
+        # Only once every question is answered: a modal box would run a resumed game's timers.
+        for station, state in resumes:
+            station.resume_session(state)
+
+    def close_out_session(self, state):
+        if not self.services.results.has_session(state["session_key"]):
+            self.leaderboard.add(state["player"], state["game"], state["level"], state["total_score"])
+            self.writer.submit("sessions", {
+                "player": state["player"],
+                "game": state["game"],
+                "level": state["level"],
+                "score": state["total_score"],
+                "started_at": state["session_key"] / 1e9,
+                "ended_at": state["t_ns"] / 1e9,
+                "session_key": state["session_key"]
+            })
+        self.writer.submit("journal", checkpoint.encode(checkpoint.KIND_CLOSED, state))
+
+    def resume_session(self, state):
+        self.resume_from = state
+        if state["game"] == "Coordination":
+            self.start_coordination(state["balls"])
+        else:
+            getattr(self, "start_" + state["game"].lower())()
+
+    def resumed_session(self, state):
+        # Same session key, so its trials and final record carry on from the original. There is no
+        # input recording: a replay could not reproduce what was played before the crash.
+        key = state["session_key"]
+        session = PlayerSession(self.canvas, state["player"], state["game"], key, key / 1e9, seed=key)
+        session.level = state["level"]
+        session.score = state["score"]
+        session.total_score = state["total_score"]
+        session.trial_index = state["trial"]
+        if state["rng_state"] is not None:
+            session.rng.setstate(state["rng_state"])
+        return session
+
     def game_speed(self, game_name):
-        base = self.base_speed[game_name]
-        speed_boost = max(0, self.score - 25) * 0.015
-        level_boost = (self.level - 1) * 0.18
-        scale = max(0.35, 1.0 - speed_boost - level_boost)
-        return max(8, int(base * scale))
+        tracker = self.session.difficulty
+        if tracker is not None and tracker.measure == "speed":
+            return tracker.value()
+        return engine.game_speed(self.base_speed[game_name], self.session.score, self.session.level)
+
+    def memory_length(self):
+        tracker = self.session.difficulty
+        if tracker is not None and tracker.measure == "length":
+            return tracker.value()
+        return engine.memory_sequence_length(self.session.level, self.session.score)
+
+    def adapt(self, success):
+        if self.session.difficulty is not None:
+            self.session.difficulty.update(success)
 
     def setup_game_screen(self, title, help_text):
         self.clear_canvas()
+        self.show_canvas(self.canvas)
         self.canvas.configure(bg="darkgreen")
         self.title_id = self.canvas.create_text(415, 30, text=title, fill="white", font=("Helvetica", 20, "bold"))
         self.player_id = self.canvas.create_text(20, 25, text="", fill="white", anchor="w", font=("Helvetica", 12, "bold"))
         self.level_id = self.canvas.create_text(20, 50, text="", fill="white", anchor="w", font=("Helvetica", 12))
         self.score_id = self.canvas.create_text(780, 25, text="", fill="white", anchor="e", font=("Helvetica", 12, "bold"))
         self.help_id = self.canvas.create_text(415, 76, text=help_text, fill="yellow", font=("Helvetica", 13))
+        self.notice_id = self.canvas.create_text(415, 582, text="", fill="#ffe27a", font=("Helvetica", 13, "bold"))
+        self.telemetry_id = None
+        if self.session.telemetry is not None and self.telemetry_overlay:
+            self.telemetry_id = self.canvas.create_text(
+                780, 582, text="", fill="#9fd8ff", anchor="e", font=("Courier", 10)
+            )
+            self.session.telemetry.on_update = self.show_telemetry
         self.exit_btn = tk.Button(self.canvas, text="Exit Game", command=self.exit_current_game, bg="#ffd7d7")
         self.exit_btn_window = self.canvas.create_window(790, 52, window=self.exit_btn, anchor="e")
         self.refresh_hud()
 
     def refresh_hud(self):
         if self.player_id:
-            self.canvas.itemconfigure(self.player_id, text=f"Player: {self.current_player}")
+            self.canvas.itemconfigure(self.player_id, text=f"Player: {self.session.current_player}")
         if self.level_id:
-            l2_status = "Unlocked" if self.score >= self.level_2_unlock_score else f"Locked({self.level_2_unlock_score})"
-            l3_status = "Unlocked" if self.score >= self.level_3_unlock_score else f"Locked({self.level_3_unlock_score})"
+            l2_status = "Unlocked" if self.session.score >= self.level_2_unlock_score else f"Locked({self.level_2_unlock_score})"
+            l3_status = "Unlocked" if self.session.score >= self.level_3_unlock_score else f"Locked({self.level_3_unlock_score})"
             self.canvas.itemconfigure(
                 self.level_id,
-                text=f"Level: {self.level}/3   L2: {l2_status}   L3: {l3_status}"
+                text=f"Level: {self.session.level}/3   L2: {l2_status}   L3: {l3_status}"
             )
         if self.score_id:
-            self.canvas.itemconfigure(self.score_id, text=f"Score: {self.score}")
-
-    def begin_game(self, game_name, title, help_text):
-        if not self.ask_player_name(game_name):
+            self.canvas.itemconfigure(self.score_id, text=f"Score: {self.session.score}")
+
+    def begin_game(self, game_name, title, help_text, start):
+        resume, self.resume_from = self.resume_from, None
+        player, self.chosen_player = self.chosen_player, None
+        if resume is not None:
+            player = resume["player"]
+        elif player is None:
+            # The game is started again, from the prompt's callback, once a name is given.
+            def chosen(name):
+                if name:
+                    self.chosen_player = name
+                    start()
+
+            self.ask_player_name(game_name, chosen)
             return False
-        self.level = 1
-        self.score = 0
-        self.total_score = 0
-        self.game_running = True
+        self.finish_running_session()
+        self.clear_canvas()
+        self.session = self.new_session(player, game_name) if resume is None else self.resumed_session(resume)
+        import adaptive
+
+        self.session.difficulty = adaptive.make_tracker(self.difficulty, game_name)
+        if self.services.telemetry:
+            from telemetry import SessionTelemetry
+
+            self.session.telemetry = SessionTelemetry(target_fps=self.target_fps)
+        self.session.game_running = True
         self.setup_game_screen(title, help_text)
         return True
 
+    def new_session(self, player, game_name):
+        session_key = time.time_ns()
+        recorder = None
+        if self.record_inputs:
+            from replay import InputRecorder
+
+            recorder = InputRecorder()
+        return PlayerSession(
+            self.canvas, player, game_name, session_key, session_key / 1e9, seed=session_key, recorder=recorder
+        )
+
+    def save_recording(self):
+        recorder = self.session.recorder
+        if recorder is None or recorder.closed:
+            return
+        from replay import SETTINGS, default_recordings_dir
+
+        settings = {name: getattr(self, name) for name in SETTINGS}
+        settings["input_latency_correction"] = self.input_latency_correction()
+        recording = recorder.finish(self.session, settings)
+        if recording is None:
+            return
+        path = os.path.join(default_recordings_dir(), f"{self.session.session_key}.fprec")
+        self.writer.submit("recordings", (path, recording))
+
+    def show_telemetry(self, stats):
+        if self.session.game_running and self.session.telemetry is stats and self.telemetry_id is not None:
+            self.canvas.itemconfigure(self.telemetry_id, text=stats.overlay_text())
+
+    def save_telemetry(self):
+        stats = self.session.telemetry
+        if stats is None:
+            return
+        self.session.telemetry = None
+        self.writer.submit("telemetry", stats.summary(self.session, self.station))
+
+    def log_trial(self, kind, stimulus=0, response=trial_log.NO_RESPONSE, latency=0.0, new_trial=None, t_ns=None):
+        if self.session.session_key is None:
+            return
+        if new_trial if new_trial is not None else kind == trial_log.KIND_STIMULUS:
+            self.session.trial_index += 1
+            self.checkpoint()
+        self.trial_log.log(
+            self.session.session_key, self.session.current_game, self.session.trial_index, kind, stimulus, response, latency, t_ns
+        )
+
     def exit_current_game(self):
-        if self.game_running:
+        if self.session.game_running:
             self.end_game_session("Game exited.")
         else:
             self.start_menu()
 
     def add_point(self, points=1):
-        self.score += points
-        self.total_score += points
-        previous_level = self.level
-
-        if self.score >= self.level_3_unlock_score:
-            self.level = 3
-        elif self.score >= self.level_2_unlock_score:
-            self.level = 2
-        else:
-            self.level = 1
+        self.session.score += points
+        self.session.total_score += points
+        previous_level = self.session.level
+        self.session.level = engine.level_for_score(self.session.score, self.level_2_unlock_score, self.level_3_unlock_score)
 
         self.refresh_hud()
+        self.checkpoint(rng=False)
+        if self.session.recorder is not None:
+            self.session.recorder.score(self.session.score, self.session.level)
 
-        if self.level > previous_level:
-            messagebox.showinfo("Level Unlocked", f"🔓 Level {self.level} unlocked in {self.current_game}.")
+        if self.session.level > previous_level:
+            self.log_trial(trial_log.KIND_LEVEL_UP, stimulus=self.session.level, response=self.session.score)
+            # Shown on the canvas: a modal box would run timers nested inside this callback.
+            self.canvas.itemconfigure(
+                self.notice_id,
+                text=f"🔓 Level {self.session.level} unlocked in {self.session.current_game}."
+            )
             return "next_level"
         return "continue"
 
+    def finish_running_session(self):
+        if self.session.game_running:
+            self.session.game_running = False
+            self.update_score(self.session.current_game, self.session.total_score)
+            self.save_game_record(self.session.total_score)
+            self.close_checkpoint()
+            self.save_recording()
+            self.save_telemetry()
+            self.trial_log.flush()
+
+    def shutdown(self):
+        self.finish_running_session()
+        self.clear_canvas()
+        self.services.stations.remove(self)
+
+    def on_close(self):
+        # Closing the root window takes every other station window with it.
+        stations = list(self.services.stations) if self.master is self.services.root else [self]
+        for station in stations:
+            station.shutdown()
+        if not self.services.stations:
+            self.services.close()
+        self.master.destroy()
+
     def end_game_session(self, message=None):
-        if not self.game_running:
+        if not self.session.game_running:
             return
-        self.game_running = False
-        self.update_score(self.current_game, self.total_score, better="higher")
-        self.save_game_record(self.total_score)
-        if message:
-            messagebox.showinfo("Game", message)
+        self.finish_running_session()
         self.start_menu()
+        if message:
+            # On the menu like the level-up notice: a message box would grab every station.
+            self.show_menu_notice(message)
 
     # --------------------------
     # Main Menu
     # --------------------------
     def start_menu(self):
-        if self.game_running:
-            self.game_running = False
-            self.update_score(self.current_game, self.total_score, better="higher")
-            self.save_game_record(self.total_score)
+        self.finish_running_session()
+
+        self.clear_canvas()
+        if self.history is None:
+            self.build_menu()
+        self.show_menu_notice("")
+        self.show_canvas(self.menu_canvas)
+        self.refresh_history()
+
+    def show_menu_notice(self, text):
+        if text != self.menu_notice:
+            self.menu_notice = text
+            self.menu_canvas.itemconfigure(self.menu_notice_id, text=text)
+
+    def refresh_history(self):
+        # Read before refreshing: a batch that commits in between is then picked up next time.
+        pending = self.writer.pending("sessions")
+        self.history.refresh()
+        if pending:
+            # The finished session is still queued for the writer thread; look again shortly.
+            self._schedule(100, self.refresh_history)
+
+    def build_menu(self):
+        self.menu_canvas.create_text(
+            415,
+            48,
+            text="Tennis Cognitive Training",
+            fill="white",
+            font=("Helvetica", 28, "bold")
+        )
+        self.menu_notice_id = self.menu_canvas.create_text(415, 84, text="", fill="#ffe27a", font=("Helvetica", 13, "bold"))
+        self.history = HistoryView(self.menu_canvas, self.results, engine.GAMES)
+        self.menu_canvas.create_text(
+            415,
+            572,
+            text="Use the sidebar buttons to start any game. Click a column header to sort.",
+            fill="white",
+            font=("Helvetica", 12)
+        )
+
+    def start_leaderboard(self):
+        self.finish_running_session()
 
         self.clear_canvas()
+        self.show_canvas(self.canvas)
         self.canvas.configure(bg="#123d2d")
 
         self.canvas.create_text(
             415,
             48,
-            text="Tennis Cognitive Training",
+            text="Top 10 Players",
             fill="white",
             font=("Helvetica", 28, "bold")
         )
 
-        top_y = 120
-        row_h = 34
-        headers = ["Game Name", "Player Name", "Score", "Level"]
-        x_cols = [70, 320, 580, 710, 800]
-
-        self.canvas.create_rectangle(x_cols[0], top_y, x_cols[-1], top_y + row_h, fill="#0f2f22", outline="white")
-        for idx, h in enumerate(headers):
-            cx = (x_cols[idx] + x_cols[idx + 1]) // 2
-            self.canvas.create_text(cx, top_y + row_h // 2, text=h, fill="yellow", font=("Helvetica", 12, "bold"))
-
-        rows = self.game_records[-12:]
-        for i, rec in enumerate(rows, start=1):
-            y1 = top_y + i * row_h
-            y2 = y1 + row_h
-            self.canvas.create_rectangle(x_cols[0], y1, x_cols[-1], y2, fill="#1d5c45", outline="white")
-            vals = [rec["game"], rec["player"], str(rec["score"]), str(rec["level"])]
-            for c, val in enumerate(vals):
-                cx = (x_cols[c] + x_cols[c + 1]) // 2
-                self.canvas.create_text(cx, y1 + row_h // 2, text=val, fill="white", font=("Helvetica", 11))
+        top_y = 110
+        row_h = 38
+        col_w = 160
+        left = 15
+        for c, game in enumerate(engine.GAMES):
+            x1 = left + c * col_w
+            self.canvas.create_rectangle(x1, top_y, x1 + col_w, top_y + row_h, fill="#0f2f22", outline="white")
+            self.canvas.create_text(
+                x1 + col_w // 2, top_y + row_h // 2, text=game, fill="yellow", font=("Helvetica", 12, "bold")
+            )
+            entries = self.leaderboard.top(game)
+            for i in range(10):
+                y1 = top_y + (i + 1) * row_h
+                self.canvas.create_rectangle(x1, y1, x1 + col_w, y1 + row_h, fill="#1d5c45", outline="white")
+                if i < len(entries):
+                    entry = entries[i]
+                    self.canvas.create_text(
+                        x1 + 8, y1 + row_h // 2, text=f"{i + 1}. {entry['player'][:12]}",
+                        fill="white", anchor="w", font=("Helvetica", 10)
+                    )
+                    self.canvas.create_text(
+                        x1 + col_w - 8, y1 + row_h // 2, text=f"{entry['score']} (L{entry['level']})",
+                        fill="white", anchor="e", font=("Helvetica", 10, "bold")
+                    )
 
         self.canvas.create_text(
             415,
             560,
-            text="Use the sidebar buttons to start any game.",
+            text="Best score per player across all levels.",
             fill="white",
             font=("Helvetica", 12)
         )
 
+    def input_latency_correction(self):
+        # The probe only times Tk's event dispatch, so it stays metadata unless asked for.
+        if not self.correct_input_latency or not self.services.calibration:
+            return 0.0
+        median = self.services.calibration.get("event_dispatch_ms", {}).get("median")
+        return (median or 0.0) / 1000.0
+
+    def start_calibration(self):
+        import stimulus
+
+        self.finish_running_session()
+        self.clear_canvas()
+        self.show_canvas(self.canvas)
+        self.canvas.configure(bg="#123d2d")
+
+        self.canvas.create_text(
+            415,
+            48,
+            text="Station Calibration",
+            fill="white",
+            font=("Helvetica", 28, "bold")
+        )
+        probe_id = self.canvas.create_oval(355, 140, 475, 260, fill="red", outline="white", width=3)
+        result_id = self.canvas.create_text(
+            415,
+            360,
+            text="Measuring event dispatch and drawing overhead...",
+            fill="yellow",
+            font=("Helvetica", 14)
+        )
+
+        def done(summary):
+            self.services.calibration = summary
+            try:
+                stimulus.save_calibration(summary)
+                saved = "Saved for this station."
+            except OSError:
+                saved = "Could not save calibration."
+            dispatch = summary["event_dispatch_ms"]
+            flush = summary["draw_to_flush_ms"]
+            if self.correct_input_latency:
+                applied = f"Reaction times are corrected by {dispatch['median']:.2f} ms."
+            else:
+                applied = "Reaction times are not corrected (--correct-input-latency)."
+            self.canvas.itemconfigure(
+                result_id,
+                text=(
+                    f"Event dispatch: median {dispatch['median']:.2f} ms, p95 {dispatch['p95']:.2f} ms\n"
+                    f"Draw to flush: median {flush['median']:.2f} ms, p95 {flush['p95']:.2f} ms\n\n"
+                    f"{applied} {saved}"
+                )
+            )
+
+        stimulus.StationCalibration(self.canvas, self._schedule, self._bind, probe_id, on_done=done).start()
+
     # --------------------------
     # 1) Attention Game
     # --------------------------
     def start_attention(self):
-        if not self.begin_game("Attention", "Attention Task", "Click only the YELLOW target."):
+        if not self.begin_game("Attention", "Attention Task", "Click only the YELLOW target.", self.start_attention):
             return
 
         self.attention_job = None
+        radius = engine.ATTENTION_RADIUS
+        max_count = engine.attention_target_count(engine.ATTENTION_MAX_LEVEL)
+        layouts = engine.LayoutBank(
+            self.session.rng,
+            [engine.attention_target_count(level) for level in range(1, engine.ATTENTION_MAX_LEVEL + 1)]
+        )
+        pool = [
+            self.canvas.create_oval(0, 0, 0, 0, outline="black", width=1, state="hidden", tags=("play",))
+            for _ in range(max_count)
+        ]
+        field = {"shown": 0, "onset": None}
+        targets = engine.TargetField(radius)
+        self.click_outcomes = {"hit": 0, "distractor": 0, "miss": 0}
+        status_id = self.canvas.create_text(415, 100, text="", fill="white", font=("Helvetica", 12))
 
         def draw_targets():
-            if not self.game_running or self.current_game != "Attention":
+            if not self.session.game_running or self.session.current_game != "Attention":
                 return
-            self.canvas.delete("play")
-            count = 6 + (self.level - 1) * 2
-            target_index = random.randint(0, count - 1)
-            colors = ["red", "blue", "white", "orange", "pink", "cyan"]
+            if field["onset"] is not None:
+                self.log_trial(trial_log.KIND_TIMEOUT)
+            count = engine.attention_target_count(self.session.level)
+            target_index = self.session.rng.randint(0, count - 1)
+            layout = layouts.pick(self.session.rng, count)
 
             for i in range(count):
-                r = 18
-                x = random.randint(130, 780)
-                y = random.randint(130, 560)
-                color = "yellow" if i == target_index else random.choice(colors)
-                tags = ("play", "target") if color == "yellow" else ("play",)
-                self.canvas.create_oval(x - r, y - r, x + r, y + r, fill=color, outline="black", width=1, tags=tags)
+                x, y = layout[i]
+                color = "yellow" if i == target_index else self.session.rng.choice(engine.ATTENTION_COLORS)
+                self.canvas.coords(pool[i], x - radius, y - radius, x + radius, y + radius)
+                self.canvas.itemconfigure(pool[i], fill=color, state="normal")
+            for i in range(count, field["shown"]):
+                self.canvas.itemconfigure(pool[i], state="hidden")
+            field["shown"] = count
+            targets.set_targets(layout[:count], target_index)
+            field["onset"] = self.clock()
+            self.log_trial(trial_log.KIND_STIMULUS, stimulus=count)
 
             delay = self.game_speed("Attention")
             self.attention_job = self._schedule(delay, draw_targets)
 
         def on_click(event):
-            if not self.game_running or self.current_game != "Attention":
+            if not self.session.game_running or self.session.current_game != "Attention":
                 return
-            item = self.canvas.find_closest(event.x, event.y)
-            if not item:
-                return
-            if "target" in self.canvas.gettags(item[0]):
+            outcome, _index = targets.hit_test(event.x, event.y)
+            self.click_outcomes[outcome] += 1
+            self.log_trial(
+                trial_log.KIND_RESPONSE,
+                response=trial_log.ATTENTION_OUTCOMES[outcome],
+                latency=self.clock() - field["onset"]
+            )
+            self.canvas.itemconfigure(
+                status_id,
+                text="Hits: {hit}   Wrong colour: {distractor}   Missed: {miss}".format(**self.click_outcomes)
+            )
+            if outcome == "hit":
+                field["onset"] = None
                 if self.attention_job:
-                    try:
-                        self.master.after_cancel(self.attention_job)
-                    except Exception:
-                        pass
+                    self._cancel(self.attention_job)
                 state = self.add_point(1)
                 if state != "ended":
                     draw_targets()
@@ -419,196 +914,175 @@ class TennisCognitiveApp:
     # --------------------------
     # 2) Coordination Game
     # --------------------------
-    def start_coordination(self):
-        if not self.begin_game(
-            "Coordination",
-            "Eye-Hand Coordination Task",
-            "Move mouse to keep one bouncing ball alive. Missing the ball ends the game."
-        ):
+    def start_coordination(self, balls=1):
+        multiball = balls > 1
+        if multiball:
+            title = "Multi-ball Coordination"
+            help_text = f"Return as many of the {balls} balls as you can in {self.multiball_seconds} seconds."
+        else:
+            title = "Eye-Hand Coordination Task"
+            help_text = "Move mouse to keep one bouncing ball alive. Missing the ball ends the game."
+        if not self.begin_game("Coordination", title, help_text, lambda: self.start_coordination(balls)):
             return
+        from ball_field import MULTIBALL_RADIUS_SCALE, ball_field
+        from render_batch import CanvasBatch
 
-        play_left, play_top, play_right, play_bottom = 120, 120, 790, 560
+        self.coordination_balls = balls
+        # No trials to checkpoint at until the first return, so journal the start itself.
+        self.checkpoint()
+
+        play_left, play_top, play_right, play_bottom = engine.PLAY_BOUNDS
         self.canvas.create_rectangle(play_left, play_top, play_right, play_bottom, outline="white", width=2, tags="play")
         ball_fill = "deepskyblue"
 
-        state = {
-            "paddle_x": 455.0,
+        paddle = {
+            "x": 455.0,
+            "prev_x": 455.0,
             "mouse_x": 455.0,
-            "paddle_w": 170.0,
-            "paddle_h": 16.0,
-            "balls": []
+            "w": engine.paddle_width(self.session.level, self.session.score)
         }
+        state = {"last_bounce": self.clock(), "missed": 0}
 
-        paddle_y = play_bottom - 20
         paddle_id = self.canvas.create_rectangle(0, 0, 0, 0, fill="#f4e74f", outline="black", width=1, tags="play")
         status_id = self.canvas.create_text(415, 95, text="", fill="yellow", font=("Helvetica", 12))
-        speed_step_score = 5
-        speed_step_factor = 1.06
-        max_h_speed = 7.5
-        max_v_speed = 10.5
-
-        def clamp(val, lo, hi):
-            return max(lo, min(hi, val))
-
-        def speed_stage():
-            return self.score // speed_step_score
-
-        def desired_ball_count():
-            return 1
-
-        def spawn_ball(ball=None):
-            if ball is None:
-                ball = {}
-
-            ball["fill"] = ball_fill
-            ball["r"] = random.randint(12, 18)
-            ball["x"] = random.randint(play_left + 24, play_right - 24)
-            ball["y"] = random.randint(play_top + 25, play_top + 110)
-            stage_factor = speed_step_factor ** speed_stage()
-            dx_mag = random.uniform(1.8, 2.7) + (self.level - 1) * 0.20 + min(1.0, max(0, self.score - 25) * 0.02)
-            ball["dx"] = clamp(random.choice([-1, 1]) * dx_mag * stage_factor, -max_h_speed, max_h_speed)
-            ball["dy"] = clamp(
-                (random.uniform(2.3, 3.1) + (self.level - 1) * 0.35 + min(2.0, max(0, self.score - 25) * 0.04)) * stage_factor,
-                -max_v_speed,
-                max_v_speed
-            )
-            ball["speed_stage"] = speed_stage()
-
-            if "id" not in ball:
-                ball["id"] = self.canvas.create_oval(0, 0, 0, 0, fill=ball["fill"], outline="white", width=2, tags="play")
-            self.canvas.itemconfigure(ball["id"], fill=ball["fill"])
-            self.canvas.coords(
-                ball["id"],
-                ball["x"] - ball["r"], ball["y"] - ball["r"],
-                ball["x"] + ball["r"], ball["y"] + ball["r"]
-            )
-            return ball
-
-        def apply_speed_step(ball):
-            current_stage = speed_stage()
-            previous_stage = ball.get("speed_stage", current_stage)
-            if current_stage <= previous_stage:
-                return
-
-            factor = speed_step_factor ** (current_stage - previous_stage)
-            ball["dx"] = clamp(ball["dx"] * factor, -max_h_speed, max_h_speed)
-            ball["dy"] = clamp(ball["dy"] * factor, -max_v_speed, max_v_speed)
-            ball["speed_stage"] = current_stage
-            self.canvas.itemconfigure(status_id, text=f"Speed increased at {current_stage * speed_step_score} score")
-
-        def rebuild_balls():
-            need = desired_ball_count()
-            while len(state["balls"]) < need:
-                state["balls"].append(spawn_ball())
-            while len(state["balls"]) > need:
-                extra = state["balls"].pop()
-                self.canvas.delete(extra["id"])
-            for ball in state["balls"]:
-                spawn_ball(ball)
-
-        def update_paddle():
-            target_width = max(84, 170 - ((self.level - 1) * 26) - (max(0, self.score - 25) // 2))
-            state["paddle_w"] = float(target_width)
-
-            # Smooth paddle motion to make it a coordination challenge, not instant snapping.
-            state["paddle_x"] += (state["mouse_x"] - state["paddle_x"]) * 0.32
-            half_w = state["paddle_w"] / 2
-            state["paddle_x"] = clamp(state["paddle_x"], play_left + half_w, play_right - half_w)
-
-            self.canvas.coords(
-                paddle_id,
-                state["paddle_x"] - half_w, paddle_y - state["paddle_h"] / 2,
-                state["paddle_x"] + half_w, paddle_y + state["paddle_h"] / 2
-            )
-
-        def update_ball(ball):
-            ball["x"] += ball["dx"]
-            ball["y"] += ball["dy"]
-
-            if ball["x"] - ball["r"] <= play_left:
-                ball["x"] = play_left + ball["r"]
-                ball["dx"] = abs(ball["dx"])
-            if ball["x"] + ball["r"] >= play_right:
-                ball["x"] = play_right - ball["r"]
-                ball["dx"] = -abs(ball["dx"])
-            if ball["y"] - ball["r"] <= play_top:
-                ball["y"] = play_top + ball["r"]
-                ball["dy"] = abs(ball["dy"])
-
-            self.canvas.coords(
-                ball["id"],
-                ball["x"] - ball["r"], ball["y"] - ball["r"],
-                ball["x"] + ball["r"], ball["y"] + ball["r"]
-            )
-
-        def animate():
-            if not self.game_running or self.current_game != "Coordination":
-                return
+        batch = CanvasBatch(self.canvas)
+
+        rng = self.session.rng
+        field = ball_field(
+            balls,
+            rng,
+            self.session.level,
+            self.session.score,
+            radius_scale=MULTIBALL_RADIUS_SCALE if multiball else 1.0,
+            collide=multiball,
+            spread=multiball
+        )
+        ball_ids = [
+            self.canvas.create_oval(0, 0, 0, 0, fill=ball_fill, outline="white", width=1 if multiball else 2, tags="play")
+            for _ in range(balls)
+        ]
 
-            update_paddle()
-            x1, y1, x2, y2 = self.canvas.coords(paddle_id)
-
-            for ball in state["balls"]:
-                update_ball(ball)
-
-                ball_bottom = ball["y"] + ball["r"]
-                ball_top = ball["y"] - ball["r"]
-                ball_on_paddle_x = x1 <= ball["x"] <= x2
-                ball_hit_paddle = ball_bottom >= y1 and ball_top <= y2 and ball["dy"] > 0 and ball_on_paddle_x
-
-                if ball_hit_paddle:
-                    self.canvas.itemconfigure(status_id, text="Bounce +1")
-                    progression = self.add_point(1)
-                    if progression == "ended":
-                        return
-                    ball["y"] = y1 - ball["r"] - 1
-                    ball["dy"] = -abs(ball["dy"])
-                    paddle_offset = (ball["x"] - state["paddle_x"]) / max(1.0, state["paddle_w"] / 2.0)
-                    ball["dx"] = clamp(ball["dx"] + paddle_offset * 0.9, -max_h_speed, max_h_speed)
-                    apply_speed_step(ball)
-                elif ball["y"] - ball["r"] > play_bottom:
+        def step_physics(_dt):
+            if not self.session.game_running or self.session.current_game != "Coordination":
+                return False
+
+            engine.step_paddle(paddle, self.session.level, self.session.score)
+            field.step()
+            hits, misses = field.paddle_contacts(paddle)
+
+            for i in hits:
+                ball_x, _ball_y = field.position(i)
+                now = self.clock()
+                self.log_trial(
+                    trial_log.KIND_RESPONSE,
+                    stimulus=int(ball_x),
+                    response=int(ball_x - paddle["x"]),
+                    latency=now - state["last_bounce"],
+                    new_trial=True
+                )
+                state["last_bounce"] = now
+                batch.itemconfigure(status_id, text="Bounce +1")
+                progression = self.add_point(1)
+                if progression == "ended":
+                    return False
+                field.bounce_off_paddle(i, paddle)
+                if field.apply_speed_step(i, self.session.score):
+                    batch.itemconfigure(
+                        status_id,
+                        text=f"Speed increased at {field.stage[i] * engine.SPEED_STEP_SCORE} score"
+                    )
+
+            for i in misses:
+                ball_x, _ball_y = field.position(i)
+                self.log_trial(
+                    trial_log.KIND_TIMEOUT,
+                    stimulus=int(ball_x),
+                    response=int(ball_x - paddle["x"]),
+                    latency=self.clock() - state["last_bounce"],
+                    new_trial=True
+                )
+                if not multiball:
                     self.end_game_session("You missed the ball. Game over.")
-                    return
-
-            self._schedule(16, animate)
+                    return False
+                state["missed"] += 1
+                batch.itemconfigure(status_id, text=f"Missed {state['missed']}")
+                field.spawn(i, rng, self.session.level, self.session.score)
+            return True
+
+        def render(alpha):
+            if not self.session.game_running or self.session.current_game != "Coordination":
+                return
+            paddle_x = paddle["prev_x"] + (paddle["x"] - paddle["prev_x"]) * alpha
+            batch.coords(paddle_id, *engine.paddle_rect(paddle_x, paddle["w"]))
+            for item, box in zip(ball_ids, field.boxes(alpha)):
+                batch.coords(item, *box)
+            batch.flush()
 
         def on_mouse_move(event):
-            if not self.game_running or self.current_game != "Coordination":
+            if not self.session.game_running or self.session.current_game != "Coordination":
                 return
-            state["mouse_x"] = clamp(event.x, play_left + 42, play_right - 42)
+            paddle["mouse_x"] = engine.clamp(event.x, play_left + 42, play_right - 42)
+
+        def time_up():
+            self.end_game_session(f"Time up. {self.session.total_score} returned, {state['missed']} missed.")
 
         self._bind(self.canvas, "<Motion>", on_mouse_move)
-        rebuild_balls()
-        animate()
+        if multiball:
+            self._schedule(self.multiball_seconds * 1000, time_up)
+        from frame_loop import FixedStepLoop
+
+        self.coordination_loop = FixedStepLoop(
+            self._schedule,
+            step_physics,
+            render,
+            step=self.physics_step,
+            target_fps=self.target_fps,
+            max_steps_per_frame=self.max_physics_steps_per_frame,
+            clock=self.clock,
+            on_frame=self.session.telemetry.frame if self.session.telemetry is not None else None
+        )
+        self.coordination_loop.start()
 
     # --------------------------
     # 3) Decision Game
     # --------------------------
     def start_decision(self):
-        if not self.begin_game("Decision", "Decision-Making Task", "Press the correct arrow key quickly."):
+        if not self.begin_game("Decision", "Decision-Making Task", "Press the correct arrow key quickly.", self.start_decision):
             return
 
         self.correct_key = None
         self.prompt_id = self.canvas.create_text(415, 310, text="", fill="white", font=("Helvetica", 34, "bold"))
         self.status_id = self.canvas.create_text(415, 370, text="", fill="yellow", font=("Helvetica", 14))
         self.round_job = None
+        self.decision_onset = None
 
         def new_round():
-            if not self.game_running or self.current_game != "Decision":
+            if not self.session.game_running or self.session.current_game != "Decision":
                 return
-            self.correct_key = random.choice(["Left", "Right", "Up", "Down"])
+            if self.decision_onset is not None:
+                self.log_trial(trial_log.KIND_TIMEOUT)
+                self.adapt(False)
+            self.correct_key = self.session.rng.choice(trial_log.DECISION_KEYS)
             self.canvas.itemconfigure(self.prompt_id, text=f"Press {self.correct_key.upper()}")
             self.canvas.itemconfigure(self.status_id, text="")
+            self.decision_onset = self.clock()
+            self.log_trial(trial_log.KIND_STIMULUS, stimulus=trial_log.DECISION_KEYS.index(self.correct_key))
             if self.round_job:
-                try:
-                    self.master.after_cancel(self.round_job)
-                except Exception:
-                    pass
-            self.round_job = self._schedule(self.game_speed("Decision"), new_round)
+                self._cancel(self.round_job)
+            self.round_job = self._schedule(self.game_speed("Decision"), new_round, onset=trial_log.ONSET_DECISION_ROUND)
 
         def on_key(event):
-            if not self.game_running or self.current_game != "Decision":
+            if not self.session.game_running or self.session.current_game != "Decision":
                 return
+            keys = trial_log.DECISION_KEYS
+            self.log_trial(
+                trial_log.KIND_RESPONSE,
+                stimulus=keys.index(self.correct_key),
+                response=keys.index(event.keysym) if event.keysym in keys else trial_log.NO_RESPONSE,
+                latency=self.clock() - self.decision_onset
+            )
+            self.decision_onset = None
+            self.adapt(event.keysym == self.correct_key)
             if event.keysym == self.correct_key:
                 state = self.add_point(1)
                 self.canvas.itemconfigure(self.status_id, text="Correct")
@@ -625,61 +1099,68 @@ class TennisCognitiveApp:
     # 4) Reaction Game
     # --------------------------
     def start_reaction(self):
-        if not self.begin_game("Reaction", "Reaction Time Task", "Wait for GREEN, then press SPACE immediately."):
+        if not self.begin_game("Reaction", "Reaction Time Task", "Wait for GREEN, then press SPACE immediately.", self.start_reaction):
             return
+        import stimulus
 
         self.waiting_green = False
         self.reaction_start_time = None
+        self.foreperiod_ms = 0
         self.signal_circle = self.canvas.create_oval(320, 180, 510, 370, fill="red", outline="white", width=3)
         self.signal_text = self.canvas.create_text(415, 430, text="WAIT...", fill="white", font=("Helvetica", 24, "bold"))
         self.status_id = self.canvas.create_text(415, 475, text="", fill="yellow", font=("Helvetica", 13))
 
-        def points_from_reaction(reaction_time):
-            if reaction_time <= 0.20:
-                return 5
-            if reaction_time <= 0.30:
-                return 4
-            if reaction_time <= 0.40:
-                return 3
-            if reaction_time <= 0.55:
-                return 2
-            return 1
-
         def show_green():
-            if not self.game_running or self.current_game != "Reaction":
+            if not self.session.game_running or self.session.current_game != "Reaction":
                 return
             self.waiting_green = True
-            self.reaction_start_time = time.perf_counter()
-            self.canvas.itemconfigure(self.signal_circle, fill="lime")
-            self.canvas.itemconfigure(self.signal_text, text="PRESS SPACE")
+
+            def draw():
+                self.canvas.itemconfigure(self.signal_circle, fill="lime")
+                self.canvas.itemconfigure(self.signal_text, text="PRESS SPACE")
+
+            self.reaction_start_time = stimulus.present(self.canvas, draw, clock=self.clock)
+            self.log_trial(trial_log.KIND_STIMULUS, stimulus=self.foreperiod_ms)
 
             def timeout_green():
-                if self.game_running and self.current_game == "Reaction" and self.waiting_green:
+                if self.session.game_running and self.session.current_game == "Reaction" and self.waiting_green:
                     self.waiting_green = False
+                    self.log_trial(trial_log.KIND_TIMEOUT, stimulus=self.foreperiod_ms)
+                    self.adapt(False)
                     self.canvas.itemconfigure(self.status_id, text="Missed signal")
                     prepare_round()
 
-            self._schedule(max(220, int(self.game_speed("Reaction") * 0.45)), timeout_green)
+            _wait_min, _wait_max, green_window = engine.reaction_windows(self.game_speed("Reaction"))
+            self._schedule(green_window, timeout_green, onset=trial_log.ONSET_REACTION_TIMEOUT)
 
         def prepare_round():
-            if not self.game_running or self.current_game != "Reaction":
+            if not self.session.game_running or self.session.current_game != "Reaction":
                 return
             self.waiting_green = False
             self.canvas.itemconfigure(self.signal_circle, fill="red")
             self.canvas.itemconfigure(self.signal_text, text="WAIT...")
-            wait_min = max(280, int(self.game_speed("Reaction") * 0.55))
-            wait_max = max(wait_min + 140, int(self.game_speed("Reaction") * 1.05))
-            self._schedule(random.randint(wait_min, wait_max), show_green)
+            wait_min, wait_max, _green_window = engine.reaction_windows(self.game_speed("Reaction"))
+            self.foreperiod_ms = self.session.rng.randint(wait_min, wait_max)
+            self._schedule(self.foreperiod_ms, show_green, onset=trial_log.ONSET_REACTION_GREEN)
 
         def on_space(_event):
-            if not self.game_running or self.current_game != "Reaction":
+            if not self.session.game_running or self.session.current_game != "Reaction":
                 return
             if not self.waiting_green:
+                self.log_trial(trial_log.KIND_RESPONSE, stimulus=self.foreperiod_ms, response=trial_log.TOO_EARLY)
                 self.canvas.itemconfigure(self.status_id, text="Too early")
                 return
             self.waiting_green = False
-            reaction_time = time.perf_counter() - self.reaction_start_time
-            points = points_from_reaction(reaction_time)
+            reaction_time = self.clock() - self.reaction_start_time - self.input_latency_correction()
+            reaction_time = max(0.0, reaction_time)
+            points = engine.points_from_reaction(reaction_time)
+            self.log_trial(
+                trial_log.KIND_RESPONSE,
+                stimulus=self.foreperiod_ms,
+                response=points,
+                latency=reaction_time
+            )
+            self.adapt(True)
             self.canvas.itemconfigure(self.status_id, text=f"Reaction: {reaction_time:.3f}s  Score +{points}")
             state = self.add_point(points)
             if state != "ended":
@@ -692,42 +1173,117 @@ class TennisCognitiveApp:
     # 5) Memory Game
     # --------------------------
     def start_memory(self):
-        if not self.begin_game("Memory", "Working Memory Task", "Memorize and repeat the number pattern."):
+        if not self.begin_game("Memory", "Working Memory Task", "Memorize and repeat the number pattern.", self.start_memory):
             return
+        import stimulus
 
-        self.sequence_id = self.canvas.create_text(415, 300, text="", fill="yellow", font=("Helvetica", 34, "bold"))
-        self.status_id = self.canvas.create_text(415, 390, text="", fill="white", font=("Helvetica", 15))
+        self.sequence_id = self.canvas.create_text(415, 190, text="", fill="yellow", font=("Helvetica", 34, "bold"))
+        self.status_id = self.canvas.create_text(415, 245, text="", fill="white", font=("Helvetica", 15))
         self.current_sequence = []
+        entry = {"digits": [], "keys": 0, "prompted_at": None, "last_key_at": None}
+
+        keypad = []
+        key_size, key_gap = 60, 10
+        labels = [str(d) for d in range(1, 10)] + ["Del", None, "OK"]
+        for i, label in enumerate(labels):
+            if label is None:
+                continue
+            x = 415 + (i % 3 - 1) * (key_size + key_gap)
+            y = 310 + (i // 3) * (key_size + key_gap)
+            box = (x - key_size / 2, y - key_size / 2, x + key_size / 2, y + key_size / 2)
+            self.canvas.create_rectangle(*box, fill="#1f5c44", outline="white", state="hidden", tags=("keypad",))
+            self.canvas.create_text(x, y, text=label, fill="white", font=("Helvetica", 18, "bold"), state="hidden", tags=("keypad",))
+            keypad.append((box, label))
+
+        def recalling():
+            return (
+                self.session.game_running
+                and self.session.current_game == "Memory"
+                and entry["prompted_at"] is not None
+            )
+
+        def show_entry():
+            typed = [str(d) for d in entry["digits"]]
+            blanks = ["_"] * max(0, len(self.current_sequence) - len(typed))
+            self.canvas.itemconfigure(self.sequence_id, text=" ".join(typed + blanks))
 
         def next_round():
-            if not self.game_running or self.current_game != "Memory":
+            if not self.session.game_running or self.session.current_game != "Memory":
                 return
-            length = 3 + self.level + min(6, self.score // 12)
-            self.current_sequence = [random.randint(1, 9) for _ in range(length)]
+            length = self.memory_length()
+            self.current_sequence = [self.session.rng.randint(1, 9) for _ in range(length)]
             self.canvas.itemconfigure(self.sequence_id, text=" ".join(map(str, self.current_sequence)))
             self.canvas.itemconfigure(self.status_id, text="Memorize...")
-            display_ms = max(900, self.game_speed("Memory"))
+            self.log_trial(trial_log.KIND_STIMULUS, stimulus=length)
+            display_ms = engine.memory_display_ms(self.game_speed("Memory"))
             self._schedule(display_ms, ask_input)
 
         def ask_input():
-            if not self.game_running or self.current_game != "Memory":
+            if not self.session.game_running or self.session.current_game != "Memory":
                 return
-            self.canvas.itemconfigure(self.sequence_id, text="...")
-            self.canvas.itemconfigure(self.status_id, text="Type sequence in popup")
-            answer = simpledialog.askstring("Memory", "Enter sequence separated by spaces:")
-            if not self.game_running or self.current_game != "Memory":
+            entry["digits"] = []
+            entry["keys"] = 0
+            entry["last_key_at"] = None
+
+            def draw():
+                show_entry()
+                self.canvas.itemconfigure(self.status_id, text="Type the sequence or use the keypad")
+                self.canvas.itemconfigure("keypad", state="normal")
+
+            entry["prompted_at"] = stimulus.present(self.canvas, draw, clock=self.clock)
+
+        def press(key, pressed_at):
+            if not recalling():
                 return
-            if answer is None:
+            if key == "OK":
+                if entry["digits"]:
+                    finish(pressed_at, answered=True)
+                return
+            if key == "Del":
+                if not entry["digits"]:
+                    return
+                entry["digits"].pop()
+                digit = trial_log.KEY_DELETE
+            else:
+                digit = int(key)
+                entry["digits"].append(digit)
+
+            if entry["last_key_at"] is None:
+                since = max(0.0, pressed_at - entry["prompted_at"] - self.input_latency_correction())
+            else:
+                since = pressed_at - entry["last_key_at"]
+            entry["last_key_at"] = pressed_at
+            self.log_trial(trial_log.KIND_KEY, stimulus=entry["keys"], response=digit, latency=since, new_trial=False)
+            entry["keys"] += 1
+            show_entry()
+            if len(entry["digits"]) == len(self.current_sequence):
+                finish(pressed_at, answered=True)
+
+        def finish(finished_at, answered):
+            recall_time = max(0.0, finished_at - entry["prompted_at"] - self.input_latency_correction())
+            entry["prompted_at"] = None
+            self.canvas.itemconfigure("keypad", state="hidden")
+            if not answered:
+                self.log_trial(
+                    trial_log.KIND_RESPONSE,
+                    stimulus=len(self.current_sequence),
+                    latency=recall_time
+                )
+                self.adapt(False)
+                self.canvas.itemconfigure(self.sequence_id, text="...")
                 self.canvas.itemconfigure(self.status_id, text="No input. Continue...")
                 self._schedule(500, next_round)
                 return
-            try:
-                cleaned = answer.replace(",", " ").strip()
-                user_seq = [int(x) for x in cleaned.split()]
-            except ValueError:
-                user_seq = []
 
-            if user_seq == self.current_sequence:
+            correct = entry["digits"] == self.current_sequence
+            self.log_trial(
+                trial_log.KIND_RESPONSE,
+                stimulus=len(self.current_sequence),
+                response=int(correct),
+                latency=recall_time
+            )
+            self.adapt(correct)
+            if correct:
                 self.canvas.itemconfigure(self.status_id, text="Correct  (+1)")
                 state = self.add_point(1)
                 if state != "ended":
@@ -736,11 +1292,73 @@ class TennisCognitiveApp:
                 self.canvas.itemconfigure(self.status_id, text="Wrong pattern")
                 self._schedule(600, next_round)
 
+        def on_key(event):
+            pressed_at = self.clock()
+            if not recalling():
+                return
+            key = event.keysym[3:] if event.keysym.startswith("KP_") else event.keysym
+            if key in ("Return", "Enter"):
+                press("OK", pressed_at)
+            elif key in ("BackSpace", "Delete"):
+                press("Del", pressed_at)
+            elif key == "Escape":
+                finish(pressed_at, answered=False)
+            elif len(key) == 1 and key in "123456789":
+                press(key, pressed_at)
+
+        def on_click(event):
+            pressed_at = self.clock()
+            for (x0, y0, x1, y1), label in keypad:
+                if x0 <= event.x <= x1 and y0 <= event.y <= y1:
+                    press(label, pressed_at)
+                    return
+
+        self._bind(self.master, "<KeyPress>", on_key)
+        self._bind(self.canvas, "<Button-1>", on_click)
         next_round()
 
 
 if __name__ == "__main__":
+    STARTUP.mark("imports")
+    station_count = 1
+    if "--stations" in sys.argv[1:]:
+        station_count = max(1, int(sys.argv[sys.argv.index("--stations") + 1]))
+    aggregator = None
+    if "--aggregator" in sys.argv[1:]:
+        aggregator = sys.argv[sys.argv.index("--aggregator") + 1]
+    telemetry_overlay = "--telemetry-overlay" in sys.argv[1:]
+    telemetry = telemetry_overlay or "--telemetry" in sys.argv[1:]
+    correct_input_latency = "--correct-input-latency" in sys.argv[1:]
+    difficulty = "fixed"
+    if "--difficulty" in sys.argv[1:]:
+        difficulty = sys.argv[sys.argv.index("--difficulty") + 1]
+        import adaptive
+
+        if difficulty not in adaptive.MODES:
+            sys.exit(f"--difficulty must be one of: {', '.join(adaptive.MODES)}")
     root = tk.Tk()
-    app = TennisCognitiveApp(root)
+    STARTUP.mark("Tk root")
+    app = TennisCognitiveApp(root, services=SharedServices(root, aggregator=aggregator, telemetry=telemetry))
+    for number in range(2, station_count + 1):
+        window = tk.Toplevel(root)
+        # Offset each station by one window width so spanned desktops put it on the next monitor.
+        window.geometry(f"+{(number - 1) * 1090}+0")
+        TennisCognitiveApp(window, services=app.services, station=number)
+    for station in app.services.stations:
+        station.difficulty = difficulty
+        station.telemetry_overlay = telemetry_overlay
+        station.correct_input_latency = correct_input_latency
+    STARTUP.mark("app constructed")
+    # Build the leaderboard once the window is up instead of before it.
+    root.after(250, lambda: (app.services.leaderboard, app.services.roster))
+    root.after(300, app.recover_sessions)
+
+    if "--startup-report" in sys.argv[1:]:
+        def first_paint(_event):
+            root.unbind("<Expose>", paint_binding)
+            STARTUP.mark("first paint")
+            root.after_idle(lambda: STARTUP.emit(os.path.join(default_data_dir(), "startup_report.txt")))
+
+        paint_binding = root.bind("<Expose>", first_paint)
     root.mainloop()
 
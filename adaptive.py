@@ -0,0 +1,180 @@
+import math
+from collections import deque
+
+import game_engine as engine
+
+
+# "fixed" keeps the original pacing, so scores stay comparable with stored history and the
+# leaderboard; the adaptive modes are opt-in. The staircase is not usable for Decision: the bot's
+# success changes so little per ladder step there that it wanders a few steps either side of its
+# threshold all session (about 290 of ~320 trials before it stays within two steps, however the
+# step size or reversal rule is set). Use QUEST for Decision.
+MODES = ("fixed", "staircase", "quest")
+# A 1-up/3-down staircase settles where ~79% of trials succeed; QUEST aims at the same point.
+TARGET = 0.79
+STAIRCASE_DOWN = 3
+LAPSE = 0.04
+# QUEST threshold hypotheses per ladder step.
+GRAIN = 4
+
+
+def log_ladder(easy, hard, count):
+    ratio = (hard / easy) ** (1.0 / (count - 1))
+    return tuple(int(round(easy * ratio ** i)) for i in range(count))
+
+
+class Ladder:
+    # Stimulus values ordered easiest first; trackers move along it by index.
+    def __init__(self, measure, levels, start, slope, step):
+        self.measure = measure
+        self.levels = levels
+        self.start = self.nearest(start)
+        # Psychometric slope per ladder step, and the staircase's opening step size.
+        self.slope = slope
+        self.step = step
+
+    def nearest(self, value):
+        return min(range(len(self.levels)), key=lambda i: abs(self.levels[i] - value))
+
+    def clamp(self, index):
+        return min(len(self.levels) - 1, max(0, index))
+
+
+LADDERS = {
+    # Decision and Reaction track the same "speed" in ms that game_speed() returns, so the
+    # response and green windows keep deriving from it as before. Reaction stops where the
+    # green window reaches its 220 ms floor.
+    "Decision": Ladder("speed", log_ladder(2800, 250, 40), engine.BASE_SPEED["Decision"], slope=0.6, step=4),
+    "Reaction": Ladder("speed", log_ladder(3000, 490, 30), engine.BASE_SPEED["Reaction"], slope=0.6, step=4),
+    "Memory": Ladder("length", tuple(range(3, 13)), engine.memory_sequence_length(1, 0), slope=1.5, step=1)
+}
+
+
+class LikelihoodTable:
+    # log P(outcome | presented step, threshold hypothesis), computed once per ladder so a
+    # QUEST update is a row addition rather than a pass over the trial history.
+    def __init__(self, ladder, grain=GRAIN, target=TARGET, lapse=LAPSE):
+        self.hypotheses = [j / grain for j in range((len(ladder.levels) - 1) * grain + 1)]
+        relative = target / (1.0 - lapse)
+        offset = math.log(relative / (1.0 - relative))
+        self.success = []
+        self.failure = []
+        for k in range(len(ladder.levels)):
+            row = [(1.0 - lapse) / (1.0 + math.exp(-(ladder.slope * (t - k) + offset))) for t in self.hypotheses]
+            self.success.append([math.log(p) for p in row])
+            self.failure.append([math.log(1.0 - p) for p in row])
+        sd = len(ladder.levels) / 4.0
+        self.prior = [-((t - ladder.start) ** 2) / (2.0 * sd * sd) for t in self.hypotheses]
+
+
+_tables = {}
+
+
+def likelihood_table(game):
+    table = _tables.get(game)
+    if table is None:
+        table = _tables[game] = LikelihoodTable(LADDERS[game])
+    return table
+
+
+class Staircase:
+    def __init__(self, ladder, down=STAIRCASE_DOWN, reversals_kept=6):
+        self.ladder = ladder
+        self.measure = ladder.measure
+        self.index = ladder.start
+        self.step = ladder.step
+        self.down = down
+        self.run = 0
+        self.direction = 0
+        self.reversals = deque(maxlen=reversals_kept)
+        self.reversal_sum = 0
+        self.trials = 0
+
+    def value(self):
+        return self.ladder.levels[self.index]
+
+    def update(self, success):
+        self.trials += 1
+        if not success:
+            self.run = 0
+            self._move(-1)
+            return
+        self.run += 1
+        # 1-down until the first reversal gets a new player to their range quickly.
+        if self.run >= (self.down if self.reversals else 1):
+            self.run = 0
+            self._move(1)
+
+    def _move(self, direction):
+        if self.direction and direction != self.direction:
+            if len(self.reversals) == self.reversals.maxlen:
+                self.reversal_sum -= self.reversals[0]
+            self.reversals.append(self.index)
+            self.reversal_sum += self.index
+            self.step = max(1, self.step // 2)
+        self.direction = direction
+        self.index = self.ladder.clamp(self.index + direction * self.step)
+
+    def threshold(self):
+        if not self.reversals:
+            return float(self.index)
+        return self.reversal_sum / len(self.reversals)
+
+
+class Quest:
+    def __init__(self, ladder, table):
+        self.ladder = ladder
+        self.measure = ladder.measure
+        self.table = table
+        self.log_posterior = list(table.prior)
+        self.index = ladder.start
+        self.trials = 0
+
+    def value(self):
+        return self.ladder.levels[self.index]
+
+    def update(self, success):
+        self.trials += 1
+        row = (self.table.success if success else self.table.failure)[self.index]
+        posterior = [a + b for a, b in zip(self.log_posterior, row)]
+        peak = max(posterior)
+        self.log_posterior = [v - peak for v in posterior]
+        self.index = self.ladder.clamp(int(round(self.threshold())))
+
+    def threshold(self):
+        weights = [math.exp(v) for v in self.log_posterior]
+        return sum(w * t for w, t in zip(weights, self.table.hypotheses)) / sum(weights)
+
+
+def make_tracker(mode, game):
+    if mode not in MODES:
+        raise ValueError(f"Unknown difficulty mode: {mode}")
+    ladder = LADDERS.get(game)
+    if mode == "fixed" or ladder is None:
+        return None
+    if mode == "staircase":
+        return Staircase(ladder)
+    return Quest(ladder, likelihood_table(game))
+
+
+def trials_to_settle(trace, threshold, band):
+    # Trials until the presented step stays within `band` steps of the session's final estimate.
+    for i in range(len(trace) - 1, -1, -1):
+        if abs(trace[i] - threshold) > band:
+            return i + 1
+    return 0
+
+
+if __name__ == "__main__":
+    bot = engine.BotPlayer()
+    for game, ladder in LADDERS.items():
+        for mode in ("staircase", "quest"):
+            results = engine.simulate_sessions(game, bot, sessions=200, duration=120.0, difficulty=mode)
+            band = max(1, len(ladder.levels) // 15)
+            settle = sorted(trials_to_settle(r["difficulty_trace"], r["threshold"], band) for r in results)
+            finals = sorted(ladder.levels[ladder.clamp(int(round(r["threshold"])))] for r in results)
+            print(
+                f"{game:<9} {mode:<10} settles in {settle[len(settle) // 2]:>3} trials (p90 {settle[int(len(settle) * 0.9)]:>3})"
+                f"  threshold {ladder.measure} median {finals[len(finals) // 2]}"
+                f"  p10-p90 {finals[len(finals) // 10]}-{finals[int(len(finals) * 0.9)]}"
+            )
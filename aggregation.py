@@ -0,0 +1,604 @@
+import argparse
+import asyncio
+import hashlib
+import math
+import os
+import random
+import re
+import socket
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import trial_log
+from results_store import INSERT_SESSION, ResultsStore, default_data_dir, session_rows
+from write_behind import append_bytes
+
+
+DEFAULT_PORT = 47017
+PROTOCOL_VERSION = 1
+
+# Wire frames: kind, flags, payload length, payload.
+FRAME = struct.Struct("<BBI")
+FRAME_HELLO = 1
+FRAME_BATCH = 2
+FRAME_ACK = 3
+FRAME_ERROR = 4
+FLAG_ZLIB = 1
+MAX_FRAME = 16 * 1024 * 1024
+COMPRESS_OVER = 1024
+
+# Batch payload: spool generation, start and end offset, then the raw spool entries.
+BATCH = struct.Struct("<IQQ")
+ACK = struct.Struct("<IQ")
+HELLO = struct.Struct("<BH")
+
+# Spool entries: kind, length, body. Trial bodies are trial_log.RECORD bytes as-is.
+ENTRY = struct.Struct("<BI")
+ENTRY_SESSIONS = 1
+ENTRY_TRIALS = 2
+# session_key, started_at, ended_at, level, score, game code, player name length (+ name bytes)
+SESSION = struct.Struct("<qddiiBH")
+SPOOL_STATE = struct.Struct("<IQ")
+
+
+# --------------------------
+# Wire format
+# --------------------------
+def encode_frame(kind, payload=b""):
+    flags = 0
+    if len(payload) > COMPRESS_OVER:
+        packed = zlib.compress(payload, 1)
+        if len(packed) < len(payload):
+            payload, flags = packed, FLAG_ZLIB
+    return FRAME.pack(kind, flags, len(payload)) + payload
+
+
+async def read_frame(reader):
+    kind, flags, length = FRAME.unpack(await reader.readexactly(FRAME.size))
+    if length > MAX_FRAME:
+        raise ValueError(f"frame of {length} bytes is over the {MAX_FRAME} limit")
+    payload = await reader.readexactly(length)
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return kind, payload
+
+
+def encode_sessions(records):
+    parts = []
+    for r in records:
+        name = r["player"].encode("utf-8")
+        started_at = r.get("started_at")
+        parts.append(SESSION.pack(
+            r.get("session_key") or 0,
+            math.nan if started_at is None else started_at,
+            r["ended_at"],
+            r["level"],
+            r["score"],
+            trial_log.GAME_CODES[r["game"]],
+            len(name)
+        ))
+        parts.append(name)
+    return b"".join(parts)
+
+
+def decode_sessions(body):
+    records = []
+    offset = 0
+    while offset < len(body):
+        key, started_at, ended_at, level, score, game, name_len = SESSION.unpack_from(body, offset)
+        offset += SESSION.size
+        records.append({
+            "player": body[offset:offset + name_len].decode("utf-8"),
+            "game": trial_log.GAME_NAMES[game],
+            "level": level,
+            "score": score,
+            "started_at": None if math.isnan(started_at) else started_at,
+            "ended_at": ended_at,
+            "session_key": key or None
+        })
+        offset += name_len
+    return records
+
+
+def iter_entries(data):
+    offset = 0
+    while offset < len(data):
+        kind, length = ENTRY.unpack_from(data, offset)
+        offset += ENTRY.size
+        yield kind, data[offset:offset + length]
+        offset += length
+
+
+def default_station_id():
+    return os.environ.get("FPSCI_STATION") or socket.gethostname()
+
+
+# --------------------------
+# Client side
+# --------------------------
+# Append-only outbox: the uploader advances the acked offset and the file resets once fully drained.
+class Spool:
+    def __init__(self, path):
+        self.path = path
+        self.state_path = path + ".state"
+        self.lock = threading.Lock()
+        # Seeded from the clock so a lost state file never reuses a generation the server has seen.
+        self.generation = int(time.time())
+        self.acked = 0
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "rb") as fh:
+                data = fh.read()
+            if len(data) == SPOOL_STATE.size:
+                self.generation, self.acked = SPOOL_STATE.unpack(data)
+        if not os.path.exists(self.path):
+            open(self.path, "wb").close()
+        self.size = os.path.getsize(self.path)
+        # A crash mid-append can leave a torn tail; drop it so entries stay aligned.
+        self.size = self._aligned_end(self.size)
+        self.acked = min(self.acked, self.size)
+
+    def _aligned_end(self, size):
+        with open(self.path, "rb") as fh:
+            data = fh.read(size)
+        offset = 0
+        while offset + ENTRY.size <= len(data):
+            _kind, length = ENTRY.unpack_from(data, offset)
+            if offset + ENTRY.size + length > len(data):
+                break
+            offset += ENTRY.size + length
+        if offset != size:
+            with open(self.path, "r+b") as fh:
+                fh.truncate(offset)
+        return offset
+
+    def append(self, kind, body, sync=False):
+        with self.lock:
+            append_bytes(self.path, [ENTRY.pack(kind, len(body)), body], sync)
+            self.size += ENTRY.size + len(body)
+
+    def pending(self):
+        return self.size - self.acked
+
+    def read(self, start, limit):
+        with self.lock:
+            end = self.size
+        if start >= end:
+            return b"", start
+        with open(self.path, "rb") as fh:
+            fh.seek(start)
+            data = fh.read(end - start)
+        # Cut on an entry boundary; a single oversized entry still goes out whole.
+        offset = 0
+        while offset < len(data):
+            _kind, length = ENTRY.unpack_from(data, offset)
+            step = ENTRY.size + length
+            if offset and offset + step > limit:
+                break
+            offset += step
+        return data[:offset], start + offset
+
+    def ack(self, generation, end):
+        with self.lock:
+            if generation != self.generation or end <= self.acked:
+                return
+            self.acked = end
+            if self.acked == self.size:
+                with open(self.path, "wb"):
+                    pass
+                self.generation = max(self.generation + 1, int(time.time()))
+                self.acked = self.size = 0
+            self._save_state()
+
+    def _save_state(self):
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(SPOOL_STATE.pack(self.generation, self.acked))
+        os.replace(tmp, self.state_path)
+
+
+class UploadClient:
+    def __init__(self, host, port=DEFAULT_PORT, station=None, spool_path=None, batch_bytes=256 * 1024,
+                 window=4, flush_interval=1.0, retry_min=0.5, retry_max=30.0, connect_timeout=5.0, ack_timeout=30.0):
+        self.host = host
+        self.port = port
+        self.station = station or default_station_id()
+        self.spool = Spool(spool_path or os.path.join(default_data_dir(), "upload.spool"))
+        self.batch_bytes = batch_bytes
+        self.window = window
+        self.flush_interval = flush_interval
+        self.retry_min = retry_min
+        self.retry_max = retry_max
+        self.connect_timeout = connect_timeout
+        self.ack_timeout = ack_timeout
+
+        self.connected = False
+        self.batches_sent = 0
+        self.bytes_sent = 0
+        self.reconnects = 0
+        self.last_error = None
+
+        self._loop = None
+        self._wake = None
+        self._stopping = False
+        self._ready = threading.Event()
+        self._drained = threading.Condition()
+        self.thread = threading.Thread(target=self._thread_main, name="upload-client", daemon=True)
+        self.thread.start()
+        self._ready.wait()
+
+    # Called from the write-behind thread, so the spool append is off the UI thread.
+    def spool_sessions(self, records, sync=False):
+        self.spool.append(ENTRY_SESSIONS, encode_sessions(records), sync)
+        self._notify()
+
+    def spool_trials(self, chunks, sync=False):
+        self.spool.append(ENTRY_TRIALS, b"".join(chunks), sync)
+        self._notify()
+
+    def pending(self):
+        return self.spool.pending()
+
+    def metrics(self):
+        return {
+            "connected": self.connected,
+            "spooled_bytes": self.spool.pending(),
+            "batches_sent": self.batches_sent,
+            "bytes_sent": self.bytes_sent,
+            "reconnects": self.reconnects,
+            "last_error": None if self.last_error is None else repr(self.last_error)
+        }
+
+    def flush(self, timeout=None):
+        with self._drained:
+            return self._drained.wait_for(lambda: not self.spool.pending(), timeout)
+
+    def close(self, timeout=2.0):
+        if self._stopping:
+            return
+        # Give a connected uploader a moment to drain; anything left stays spooled for next launch.
+        if self.connected:
+            self.flush(timeout)
+        self._stopping = True
+        self._notify()
+        self.thread.join(timeout)
+
+    def _notify(self):
+        if self._loop is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        self._wake = asyncio.Event()
+        self._ready.set()
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+    async def _run(self):
+        delay = self.retry_min
+        while not self._stopping:
+            if not self.spool.pending():
+                self._wake.clear()
+                await self._wait_wake(None)
+                continue
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.connect_timeout
+                )
+            except (OSError, asyncio.TimeoutError) as exc:
+                self.last_error = exc
+                await self._wait_wake(delay * random.uniform(0.8, 1.2), stop_only=True)
+                delay = min(self.retry_max, delay * 2)
+                continue
+            self.connected = True
+            delay = self.retry_min
+            try:
+                await self._session(reader, writer)
+            except (OSError, asyncio.IncompleteReadError, ValueError, zlib.error) as exc:
+                self.last_error = exc
+                self.reconnects += 1
+            finally:
+                self.connected = False
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+            if not self._stopping:
+                await self._wait_wake(delay * random.uniform(0.8, 1.2), stop_only=True)
+                delay = min(self.retry_max, delay * 2)
+
+    async def _wait_wake(self, timeout, stop_only=False):
+        if stop_only:
+            # Backoff sleep: new spool entries must not cut a retry delay short.
+            end = self._loop.time() + timeout
+            while not self._stopping and self._loop.time() < end:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), end - self._loop.time())
+                except asyncio.TimeoutError:
+                    pass
+            return
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _wait_either(self, task, event, timeout):
+        waiter = asyncio.ensure_future(event.wait())
+        try:
+            await asyncio.wait([task, waiter], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+
+    async def _session(self, reader, writer):
+        name = self.station.encode("utf-8")
+        writer.write(encode_frame(FRAME_HELLO, HELLO.pack(PROTOCOL_VERSION, len(name)) + name))
+        in_flight = []
+        acked = asyncio.Event()
+        generation, position = self.spool.generation, self.spool.acked
+
+        async def read_acks():
+            while True:
+                kind, payload = await read_frame(reader)
+                if kind == FRAME_ERROR:
+                    raise ValueError(payload.decode("utf-8", "replace"))
+                if kind != FRAME_ACK:
+                    raise ValueError(f"unexpected frame {kind}")
+                ack_generation, end = ACK.unpack(payload)
+                while in_flight and in_flight[0] <= end:
+                    in_flight.pop(0)
+                self.spool.ack(ack_generation, end)
+                acked.set()
+                with self._drained:
+                    self._drained.notify_all()
+
+        ack_task = asyncio.ensure_future(read_acks())
+        try:
+            while not self._stopping:
+                if ack_task.done():
+                    ack_task.result()
+                    return
+                if len(in_flight) >= self.window:
+                    # Window full: wait for the server before reading more of the spool.
+                    acked.clear()
+                    await self._wait_either(ack_task, acked, self.ack_timeout)
+                    if not acked.is_set() and not ack_task.done():
+                        raise ConnectionError(f"no ack from {self.host}:{self.port} in {self.ack_timeout}s")
+                    continue
+                if self.spool.generation != generation and not in_flight:
+                    generation, position = self.spool.generation, self.spool.acked
+                self._wake.clear()
+                data, end = self.spool.read(position, self.batch_bytes)
+                if not data or self.spool.generation != generation:
+                    await self._wait_either(ack_task, self._wake, self.flush_interval)
+                    continue
+                frame = encode_frame(FRAME_BATCH, BATCH.pack(generation, position, end) + data)
+                writer.write(frame)
+                # drain() blocks while the server is not reading, which throttles the sender.
+                await writer.drain()
+                in_flight.append(end)
+                position = end
+                self.batches_sent += 1
+                self.bytes_sent += len(frame)
+        finally:
+            ack_task.cancel()
+
+
+# --------------------------
+# Server side
+# --------------------------
+UPLOADS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    station TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    trials_size INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class AggregationServer:
+    def __init__(self, data_dir=None, host="127.0.0.1", port=DEFAULT_PORT):
+        self.data_dir = data_dir or os.path.join(default_data_dir(), "aggregate")
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.results_path = os.path.join(self.data_dir, "results.sqlite3")
+        self.host = host
+        self.port = port
+        self.server = None
+        self.connections = set()
+        self.batches = 0
+        self.duplicates = 0
+        # SQLite connections are bound to their thread, so all storage runs on one worker.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aggregate-store")
+        self._store = None
+
+    def trials_path(self, station):
+        # The readable part can repeat across stations ("a b" and "a_b"); the hash keeps them apart.
+        digest = hashlib.sha1(station.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.data_dir, f"trials-{re.sub(r'[^A-Za-z0-9_.-]', '_', station)}-{digest}.bin")
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self.connections):
+                writer.close()
+            await self.server.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close_store)
+        self._executor.shutdown()
+
+    def _close_store(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    async def _handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        self.connections.add(writer)
+        try:
+            kind, payload = await read_frame(reader)
+            if kind != FRAME_HELLO:
+                raise ValueError("expected hello")
+            version, name_len = HELLO.unpack_from(payload)
+            if version != PROTOCOL_VERSION:
+                raise ValueError(f"unsupported protocol version {version}")
+            station = payload[HELLO.size:HELLO.size + name_len].decode("utf-8")
+            while True:
+                try:
+                    kind, payload = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    return
+                if kind != FRAME_BATCH:
+                    raise ValueError(f"unexpected frame {kind}")
+                # The next frame is not read until this batch is stored, so a slow disk pushes back on the client.
+                generation, end = await loop.run_in_executor(self._executor, self._apply, station, payload)
+                writer.write(encode_frame(FRAME_ACK, ACK.pack(generation, end)))
+                await writer.drain()
+        except (ValueError, struct.error, zlib.error, UnicodeDecodeError, sqlite3.Error) as exc:
+            writer.write(encode_frame(FRAME_ERROR, str(exc).encode("utf-8")))
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections.discard(writer)
+            writer.close()
+
+    def _open_store(self):
+        self._store = ResultsStore(self.results_path)
+        conn = self._store.conn
+        conn.executescript(UPLOADS_SCHEMA)
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(uploads)")}
+        if "trials_size" not in columns:
+            with conn:
+                conn.execute("ALTER TABLE uploads ADD COLUMN trials_size INTEGER NOT NULL DEFAULT 0")
+                for row in conn.execute("SELECT station FROM uploads").fetchall():
+                    path = self.trials_path(row["station"])
+                    size = os.path.getsize(path) if os.path.exists(path) else 0
+                    conn.execute("UPDATE uploads SET trials_size = ? WHERE station = ?", (size, row["station"]))
+        # Trials appended by a batch whose commit never happened are resent by the client.
+        for row in conn.execute("SELECT station, trials_size FROM uploads"):
+            self._truncate_trials(row["station"], row["trials_size"])
+
+    def _truncate_trials(self, station, size):
+        path = self.trials_path(station)
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            os.truncate(path, size)
+
+    def _apply(self, station, payload):
+        if self._store is None:
+            self._open_store()
+        conn = self._store.conn
+        generation, start, end = BATCH.unpack_from(payload)
+        row = conn.execute("SELECT generation, offset, trials_size FROM uploads WHERE station = ?", (station,)).fetchone()
+        if row is not None and (generation, end) <= (row[0], row[1]):
+            # A retry of something already stored (its ack was lost); acknowledge it again.
+            self.duplicates += 1
+            return generation, end
+        stored = row[1] if row is not None and generation == row[0] else 0
+        if start > stored:
+            raise ValueError(f"batch from {station} starts at {start}, past the {stored} bytes stored")
+
+        # A resend after a lost ack can start before what is stored and run past it: keep the suffix.
+        sessions, trials = [], []
+        position = start
+        for kind, body in iter_entries(memoryview(payload)[BATCH.size:]):
+            entry_start, position = position, position + ENTRY.size + len(body)
+            if position <= stored:
+                continue
+            if entry_start < stored:
+                raise ValueError(f"batch from {station} splits an entry at offset {stored}")
+            if kind == ENTRY_SESSIONS:
+                sessions.extend(decode_sessions(bytes(body)))
+            elif kind == ENTRY_TRIALS:
+                trials.append(body)
+        # The trial file's committed length goes in the same transaction as the offset, so anything
+        # past it was appended by a batch that is about to be resent.
+        trials_size = row[2] if row is not None else 0
+        if trials:
+            self._truncate_trials(station, trials_size)
+            path = self.trials_path(station)
+            if trials_size == 0:
+                trials.insert(0, trial_log.HEADER)
+            append_bytes(path, trials, sync=True)
+            trials_size += sum(len(chunk) for chunk in trials)
+        with conn:
+            if sessions:
+                conn.executemany(INSERT_SESSION, session_rows(sessions))
+            conn.execute(
+                "INSERT INTO uploads (station, generation, offset, trials_size) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(station) DO UPDATE SET generation = excluded.generation, offset = excluded.offset, "
+                "trials_size = excluded.trials_size",
+                (station, generation, end, trials_size)
+            )
+        self.batches += 1
+        return generation, end
+
+
+def parse_address(text):
+    host, _, port = text.rpartition(":")
+    if not host:
+        return text, DEFAULT_PORT
+    return host.strip("[]"), int(port)
+
+
+def print_leaderboards(data_dir):
+    from leaderboard import Leaderboard
+
+    store = ResultsStore(os.path.join(data_dir, "results.sqlite3"))
+    try:
+        board = Leaderboard.from_records(store.iter_sessions(), k=10)
+    finally:
+        store.close()
+    for game in trial_log.GAMES:
+        print(game)
+        for rank, entry in enumerate(board.top(game), start=1):
+            print(f"  {rank:>2}. {entry['player']:<20}{entry['score']:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect sessions and trial logs from every station.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (0.0.0.0 for the LAN)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--data-dir", default=None, help="where the combined results are kept")
+    parser.add_argument("--leaderboard", action="store_true", help="print facility-wide leaderboards and exit")
+    args = parser.parse_args(argv)
+
+    server = AggregationServer(args.data_dir, args.host, args.port)
+    if args.leaderboard:
+        print_leaderboards(server.data_dir)
+        return
+
+    async def serve():
+        await server.start()
+        print(f"aggregation server on {server.host}:{server.port}, data in {server.data_dir}", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import trial_log
+from results_store import default_results_path
+
+
+GAME_SLOTS = 8
+RT_BIN_MS = 1
+RT_BINS = 5001
+CURVE_SESSIONS = 100
+PERCENTILES = (10, 50, 90)
+COUNTERS = ("rt", "acc", "total", "recall_onset", "inter_key")
+
+
+# --------------------------
+# Sessions
+# --------------------------
+def stream_sessions(path, chunk_size):
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        cur = conn.execute(
+            "SELECT player, game, score, ended_at, session_key FROM sessions ORDER BY player, game, ended_at, id"
+        )
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        conn.close()
+
+
+def session_stats(path, chunk_size=50000):
+    players = {}
+    keys, key_groups = [], []
+    runs = {"group": [], "count": [], "sum": [], "sum_x": [], "sum_xy": [], "sum_xx": [], "best": [], "first": [], "last": []}
+    curve_sum = np.zeros(GAME_SLOTS * CURVE_SESSIONS)
+    curve_count = np.zeros(GAME_SLOTS * CURVE_SESSIONS, dtype=np.int64)
+    carry_group, carry_count = None, 0
+
+    for rows in stream_sessions(path, chunk_size):
+        player_idx = np.fromiter((players.setdefault(r[0], len(players)) for r in rows), dtype=np.int64, count=len(rows))
+        game = np.fromiter((trial_log.GAME_CODES.get(r[1], 0) for r in rows), dtype=np.int64, count=len(rows))
+        score = np.fromiter((r[2] for r in rows), dtype=np.float64, count=len(rows))
+        session_key = np.fromiter((r[4] if r[4] is not None else -1 for r in rows), dtype=np.int64, count=len(rows))
+        group = player_idx * GAME_SLOTS + game
+
+        # Rows arrive sorted by (player, game, time), so each group is one contiguous run.
+        change = np.empty(len(rows), dtype=bool)
+        change[0] = True
+        change[1:] = group[1:] != group[:-1]
+        starts = np.flatnonzero(change)
+        run_id = np.cumsum(change) - 1
+        ordinal = np.arange(len(rows)) - starts[run_id]
+        continues = group[0] == carry_group
+        if continues:
+            ordinal[run_id == 0] += carry_count
+
+        x = ordinal.astype(np.float64)
+        ends = np.append(starts[1:], len(rows))
+        chunk = {
+            "group": group[starts],
+            "count": ends - starts,
+            "sum": np.add.reduceat(score, starts),
+            "sum_x": np.add.reduceat(x, starts),
+            "sum_xy": np.add.reduceat(x * score, starts),
+            "sum_xx": np.add.reduceat(x * x, starts),
+            "best": np.maximum.reduceat(score, starts),
+            "first": score[starts],
+            "last": score[ends - 1]
+        }
+        if continues:
+            for name in ("count", "sum", "sum_x", "sum_xy", "sum_xx"):
+                runs[name][-1][-1] += chunk[name][0]
+            runs["best"][-1][-1] = max(runs["best"][-1][-1], chunk["best"][0])
+            runs["last"][-1][-1] = chunk["last"][0]
+            chunk = {name: values[1:] for name, values in chunk.items()}
+        for name, values in chunk.items():
+            runs[name].append(values)
+
+        in_curve = ordinal < CURVE_SESSIONS
+        slot = game[in_curve] * CURVE_SESSIONS + ordinal[in_curve]
+        curve_sum += np.bincount(slot, weights=score[in_curve], minlength=curve_sum.size)
+        curve_count += np.bincount(slot, minlength=curve_count.size)
+
+        known = session_key >= 0
+        keys.append(session_key[known])
+        key_groups.append(group[known])
+        carry_group = group[-1]
+        carry_count = int(ordinal[-1]) + 1
+
+    merged = {name: np.concatenate(parts) if parts else np.zeros(0) for name, parts in runs.items()}
+    keys = np.concatenate(keys) if keys else np.zeros(0, dtype=np.int64)
+    key_groups = np.concatenate(key_groups) if key_groups else np.zeros(0, dtype=np.int64)
+    order = np.argsort(keys, kind="stable")
+    return {
+        "players": players,
+        "runs": merged,
+        "curve_sum": curve_sum,
+        "curve_count": curve_count,
+        "keys": keys[order],
+        "key_groups": key_groups[order]
+    }
+
+
+# --------------------------
+# Trials
+# --------------------------
+def sum_by_key(keys, counts):
+    if keys.size == 0:
+        return keys.astype(np.int64), np.zeros(0, dtype=np.int64)
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    return uniq, np.bincount(inverse, weights=counts).astype(np.int64)
+
+
+def merge_counts(keys_a, counts_a, keys_b, counts_b):
+    return sum_by_key(np.concatenate((keys_a, keys_b)), np.concatenate((counts_a, counts_b)))
+
+
+def sparse_count(keys):
+    uniq, counts = np.unique(keys, return_counts=True)
+    return uniq, counts.astype(np.int64)
+
+
+def correct_mask(records):
+    game = records["game"]
+    response = records["response"]
+    codes = trial_log.GAME_CODES
+    return (
+        ((game == codes["Decision"]) & (response == records["stimulus"]))
+        | ((game == codes["Attention"]) & (response == trial_log.ATTENTION_OUTCOMES["hit"]))
+        | ((game == codes["Memory"]) & (response == 1))
+        | ((game == codes["Reaction"]) & (response > 0))
+        | (game == codes["Coordination"])
+    )
+
+
+def scan_trials(task):
+    path, start, stop, chunk_size, keys, key_groups = task
+    records = trial_log.open_memmap(path)
+    empty = np.zeros(0, dtype=np.int64)
+    counts = {name: (empty, empty) for name in COUNTERS}
+    level_ups = []
+
+    def add(name, keys):
+        counts[name] = merge_counts(*counts[name], *sparse_count(keys))
+
+    def latency_keys(mask):
+        rt_bin = np.minimum(chunk["latency_ns"][mask] // (RT_BIN_MS * 1000000), RT_BINS - 1)
+        return group[mask] * RT_BINS + rt_bin
+
+    for lo in range(start, stop, chunk_size):
+        if keys.size == 0:
+            break
+        chunk = np.asarray(records[lo:min(stop, lo + chunk_size)])
+        idx = np.minimum(np.searchsorted(keys, chunk["session_key"]), keys.size - 1)
+        known = keys[idx] == chunk["session_key"]
+        chunk = chunk[known]
+        group = key_groups[idx[known]]
+        kind = chunk["kind"]
+
+        answered = (kind == trial_log.KIND_RESPONSE) & (chunk["response"] != trial_log.TOO_EARLY)
+        scored = answered | (kind == trial_log.KIND_TIMEOUT)
+        correct = answered & correct_mask(chunk)
+
+        add("total", group[scored])
+        add("acc", group[correct])
+        add("rt", latency_keys(answered & (chunk["latency_ns"] > 0)))
+
+        # Typed answers: the first keystroke's latency is recall onset, later ones are inter-key intervals.
+        keyed = kind == trial_log.KIND_KEY
+        first_key = keyed & (chunk["stimulus"] == 0)
+        add("recall_onset", latency_keys(first_key))
+        add("inter_key", latency_keys(keyed & ~first_key))
+
+        lv = kind == trial_log.KIND_LEVEL_UP
+        if lv.any():
+            elapsed = (chunk["t_ns"][lv] - chunk["session_key"][lv]) / 1e9
+            level_ups.append(np.stack((group[lv].astype(np.float64), chunk["stimulus"][lv].astype(np.float64), elapsed), axis=1))
+
+    level_ups = np.concatenate(level_ups) if level_ups else np.zeros((0, 3))
+    return counts, level_ups
+
+
+def trial_stats(path, keys, key_groups, workers=1, chunk_size=1000000):
+    records = trial_log.open_memmap(path)
+    n = len(records)
+    del records
+    parts = max(1, workers)
+    bounds = [n * i // parts for i in range(parts + 1)]
+    tasks = [(path, bounds[i], bounds[i + 1], chunk_size, keys, key_groups) for i in range(parts)]
+    if parts == 1:
+        results = [scan_trials(tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=parts) as pool:
+            results = list(pool.map(scan_trials, tasks))
+
+    empty = np.zeros(0, dtype=np.int64)
+    merged = {name: (empty, empty) for name in COUNTERS}
+    level_ups = []
+    for counts, lv in results:
+        for name in COUNTERS:
+            merged[name] = merge_counts(*merged[name], *counts[name])
+        level_ups.append(lv)
+    stats = {}
+    for name, (keys_out, counts_out) in merged.items():
+        stats[name + "_keys"] = keys_out
+        stats[name + "_counts"] = counts_out
+    stats["level_ups"] = np.concatenate(level_ups) if level_ups else np.zeros((0, 3))
+    return stats
+
+
+def histogram_percentiles(hist_keys, hist_counts, pcts=PERCENTILES):
+    if hist_keys.size == 0:
+        return np.zeros(0, dtype=np.int64), {p: np.zeros(0) for p in pcts}
+    group = hist_keys // RT_BINS
+    rt_bin = hist_keys % RT_BINS
+    change = np.empty(group.size, dtype=bool)
+    change[0] = True
+    change[1:] = group[1:] != group[:-1]
+    starts = np.flatnonzero(change)
+    run_id = np.cumsum(change) - 1
+    cum = np.cumsum(hist_counts)
+    before = np.concatenate(([0], cum[starts[1:] - 1]))
+    within = cum - before[run_id]
+    totals = np.add.reduceat(hist_counts, starts)
+    # group + fraction-of-group is monotone across the whole array, so one searchsorted finds every group's bin.
+    position = run_id + within / totals[run_id]
+    out = {}
+    for p in pcts:
+        idx = np.searchsorted(position, np.arange(starts.size) + p / 100.0, side="left")
+        out[p] = (rt_bin[np.minimum(idx, rt_bin.size - 1)] + 0.5) * RT_BIN_MS
+    return group[starts], out
+
+
+# --------------------------
+# Report
+# --------------------------
+def build_report(results_path, trials_path=None, workers=1, chunk_size=1000000):
+    sessions = session_stats(results_path)
+    names = {idx: name for name, idx in sessions["players"].items()}
+    runs = sessions["runs"]
+
+    report = {"players": {}, "games": {}}
+
+    def entry(group):
+        player = names[int(group) // GAME_SLOTS]
+        game = trial_log.GAME_NAMES.get(int(group) % GAME_SLOTS, "Unknown")
+        return report["players"].setdefault(player, {}).setdefault(game, {})
+
+    n = runs["count"]
+    denom = n * runs["sum_xx"] - runs["sum_x"] ** 2
+    slope = np.divide(n * runs["sum_xy"] - runs["sum_x"] * runs["sum"], denom, out=np.zeros_like(denom), where=denom != 0)
+    for i, group in enumerate(runs["group"]):
+        entry(group).update({
+            "sessions": int(n[i]),
+            "mean_score": float(runs["sum"][i] / n[i]),
+            "best_score": float(runs["best"][i]),
+            "first_score": float(runs["first"][i]),
+            "last_score": float(runs["last"][i]),
+            "score_per_session": float(slope[i])
+        })
+
+    curve_sum = sessions["curve_sum"].reshape(GAME_SLOTS, CURVE_SESSIONS)
+    curve_count = sessions["curve_count"].reshape(GAME_SLOTS, CURVE_SESSIONS)
+    for code, game in trial_log.GAME_NAMES.items():
+        counts = curve_count[code]
+        used = int(np.count_nonzero(counts))
+        if used:
+            report["games"][game] = {
+                "learning_curve": [round(float(v), 3) for v in (curve_sum[code, :used] / counts[:used])]
+            }
+
+    trials_path = trials_path or trial_log.default_trial_log_path()
+    if os.path.exists(trials_path) and os.path.getsize(trials_path) > trial_log.RECORD.size:
+        trials = trial_stats(trials_path, sessions["keys"], sessions["key_groups"], workers, chunk_size)
+
+        groups, pct = histogram_percentiles(trials["rt_keys"], trials["rt_counts"])
+        for i, group in enumerate(groups):
+            entry(group)["rt_ms"] = {f"p{p}": float(pct[p][i]) for p in PERCENTILES}
+        for name in ("recall_onset", "inter_key"):
+            groups, pct = histogram_percentiles(trials[name + "_keys"], trials[name + "_counts"])
+            for i, group in enumerate(groups):
+                entry(group)[name + "_ms"] = {f"p{p}": float(pct[p][i]) for p in PERCENTILES}
+
+        game_keys = (trials["rt_keys"] // RT_BINS) % GAME_SLOTS * RT_BINS + trials["rt_keys"] % RT_BINS
+        game_keys, game_counts = sum_by_key(game_keys, trials["rt_counts"])
+        groups, pct = histogram_percentiles(game_keys, game_counts)
+        for i, code in enumerate(groups):
+            report["games"].setdefault(trial_log.GAME_NAMES[int(code)], {})["rt_ms"] = {
+                f"p{p}": float(pct[p][i]) for p in PERCENTILES
+            }
+
+        correct = dict(zip(trials["acc_keys"].tolist(), trials["acc_counts"].tolist()))
+        for group, total in zip(trials["total_keys"].tolist(), trials["total_counts"].tolist()):
+            entry(group)["trials"] = int(total)
+            entry(group)["accuracy"] = correct.get(group, 0) / total
+
+        level_ups = trials["level_ups"]
+        for group, level, elapsed in level_ups:
+            times = entry(group).setdefault("level_up_s", {})
+            key = f"level_{int(level)}"
+            times[key] = min(times.get(key, elapsed), float(elapsed))
+        for code, game in trial_log.GAME_NAMES.items():
+            for level in (2, 3):
+                mask = ((level_ups[:, 0].astype(np.int64) % GAME_SLOTS) == code) & (level_ups[:, 1] == level)
+                if mask.any():
+                    report["games"].setdefault(game, {}).setdefault("median_level_up_s", {})[f"level_{level}"] = float(
+                        np.median(level_ups[mask, 2])
+                    )
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Learning curves, RT percentiles, accuracy and level-up times.")
+    parser.add_argument("--results", default=None, help="results.sqlite3 path (default: data directory)")
+    parser.add_argument("--trials", default=None, help="trials.bin path (default: data directory)")
+    parser.add_argument("--workers", type=int, default=1, help="processes used to scan the trial log")
+    parser.add_argument("--chunk", type=int, default=1000000, help="trial records per vectorized chunk")
+    parser.add_argument("--out", default=None, help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        sys.exit("analytics requires NumPy (pip install numpy)")
+    report = build_report(args.results or default_results_path(), args.trials, args.workers, args.chunk)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+import math
+from array import array
+
+import game_engine as engine
+
+
+# Imported on first multi-ball start rather than with the game, which starts faster without it.
+np = None
+
+
+# Multi-ball fields use smaller balls so a few hundred still leave room to move.
+MULTIBALL_RADIUS_SCALE = 0.45
+MIN_RADIUS = 4
+
+
+class BallField:
+    # Ball state as parallel arrays (one slot per ball) instead of a dict per ball. This class
+    # steps them with plain loops over `array` buffers; NumpyBallField vectorises the same rules.
+    # Both produce the same floats for the same inputs, so recordings replay on either.
+    def __init__(
+        self,
+        count,
+        rng,
+        level,
+        score,
+        radius_scale=1.0,
+        collide=False,
+        spread=False,
+        bounds=engine.PLAY_BOUNDS
+    ):
+        self.bounds = bounds
+        self.radius_scale = radius_scale
+        self.collide = collide
+        # Exact post-impact state for this step's swept paddle hits, by ball index.
+        self.rebounds = {}
+        self.count = count
+        self._allocate(count)
+        for i in range(count):
+            self.spawn(i, rng, level, score, spread)
+
+    def _allocate(self, count):
+        for name in ("x", "y", "px", "py", "dx", "dy", "r"):
+            setattr(self, name, array("d", bytes(8 * count)))
+        self.stage = array("q", bytes(8 * count))
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, i, rng, level, score, spread=False):
+        ball = engine.spawn_ball({}, rng, level, score, self.bounds)
+        r = ball["r"]
+        if self.radius_scale != 1.0:
+            r = max(MIN_RADIUS, int(round(r * self.radius_scale)))
+        y = ball["y"]
+        if spread:
+            # Opening layout for many balls: fill the upper part of the court instead of one strip.
+            _left, top, _right, bottom = self.bounds
+            y = rng.randint(top + 25, top + int((bottom - top) * 0.55))
+        self.x[i] = self.px[i] = ball["x"]
+        self.y[i] = self.py[i] = y
+        self.dx[i] = ball["dx"]
+        self.dy[i] = ball["dy"]
+        self.r[i] = r
+        self.stage[i] = ball["speed_stage"]
+
+    def position(self, i):
+        return float(self.x[i]), float(self.y[i])
+
+    # --------------------------
+    # Physics
+    # --------------------------
+    def step(self):
+        # Same order as game_engine.step_ball: move, then the left, right and top walls.
+        left, top, right, _bottom = self.bounds
+        x, y, dx, dy, r = self.x, self.y, self.dx, self.dy, self.r
+        self.px[:] = x
+        self.py[:] = y
+        for i in range(self.count):
+            xi = x[i] + dx[i]
+            yi = y[i] + dy[i]
+            ri = r[i]
+            if xi - ri <= left:
+                xi = left + ri
+                dx[i] = abs(dx[i])
+            if xi + ri >= right:
+                xi = right - ri
+                dx[i] = -abs(dx[i])
+            if yi - ri <= top:
+                yi = top + ri
+                dy[i] = abs(dy[i])
+            x[i] = xi
+            y[i] = yi
+        if self.collide:
+            self.collide_balls()
+
+    def sweep(self, i, paddle, paddle_y):
+        # Swept test over the step just taken; falls back to the overlap rule when it finds nothing.
+        x0, y0, x1, y1 = float(self.px[i]), float(self.py[i]), float(self.x[i]), float(self.y[i])
+        impact = engine.paddle_impact(x0, y0, x1, y1, float(self.r[i]), paddle["prev_x"], paddle["x"], paddle["w"], paddle_y)
+        if impact is None:
+            return False
+        rebound = engine.paddle_rebound(x0, y0, x1, y1, impact, paddle["prev_x"], paddle["x"], paddle["w"])
+        if rebound is None:
+            return False
+        self.rebounds[i] = rebound
+        return True
+
+    def paddle_contacts(self, paddle, paddle_y=engine.PADDLE_Y):
+        # (hits, misses) as ball indices. Hits are swept against the paddle's motion over the step
+        # (game_engine.paddle_impact), with the overlap rule of game_engine.resolve_paddle behind it.
+        x1, y1, x2, y2 = engine.paddle_rect(paddle["x"], paddle["w"], paddle_y)
+        bottom = self.bounds[3]
+        hits = []
+        misses = []
+        self.rebounds.clear()
+        x, y, py, dy, r = self.x, self.y, self.py, self.dy, self.r
+        for i in range(self.count):
+            yi = y[i]
+            ri = r[i]
+            if yi + ri >= y1 and py[i] < y1 and self.sweep(i, paddle, paddle_y):
+                hits.append(i)
+            elif yi + ri >= y1 and yi - ri <= y2 and dy[i] > 0 and x1 <= x[i] <= x2:
+                hits.append(i)
+            elif yi - ri > bottom:
+                misses.append(i)
+        return hits, misses
+
+    def bounce_off_paddle(self, i, paddle, paddle_y=engine.PADDLE_Y):
+        rebound = self.rebounds.pop(i, None)
+        if rebound is not None:
+            self.x[i], self.y[i], self.dx[i], self.dy[i] = rebound
+            return
+        self.y[i] = paddle_y - engine.PADDLE_H / 2 - self.r[i] - 1
+        self.dy[i] = -abs(self.dy[i])
+        paddle_offset = (self.x[i] - paddle["x"]) / max(1.0, paddle["w"] / 2.0)
+        self.dx[i] = engine.clamp(self.dx[i] + paddle_offset * 0.9, -engine.MAX_H_SPEED, engine.MAX_H_SPEED)
+
+    def apply_speed_step(self, i, score):
+        current_stage = engine.speed_stage(score)
+        if current_stage <= self.stage[i]:
+            return False
+        factor = engine.SPEED_STEP_FACTOR ** (current_stage - self.stage[i])
+        self.dx[i] = engine.clamp(self.dx[i] * factor, -engine.MAX_H_SPEED, engine.MAX_H_SPEED)
+        self.dy[i] = engine.clamp(self.dy[i] * factor, -engine.MAX_V_SPEED, engine.MAX_V_SPEED)
+        self.stage[i] = current_stage
+        return True
+
+    # --------------------------
+    # Ball-ball collisions
+    # --------------------------
+    def cell_size(self):
+        return 2.0 * max(self.r) if self.count else 1.0
+
+    def candidate_pairs(self):
+        # Uniform grid one diameter wide: touching balls are in the same or an adjacent cell, so
+        # each cell is checked against itself and four forward neighbours.
+        cell = self.cell_size()
+        left, top = self.bounds[0], self.bounds[1]
+        grid = {}
+        for i in range(self.count):
+            grid.setdefault((int((self.x[i] - left) // cell), int((self.y[i] - top) // cell)), []).append(i)
+        pairs = []
+        for (cx, cy), members in grid.items():
+            for n, i in enumerate(members):
+                for j in members[n + 1:]:
+                    pairs.append((i, j) if i < j else (j, i))
+            for key in ((cx + 1, cy), (cx - 1, cy + 1), (cx, cy + 1), (cx + 1, cy + 1)):
+                others = grid.get(key)
+                if others:
+                    for i in members:
+                        for j in others:
+                            pairs.append((i, j) if i < j else (j, i))
+        return pairs
+
+    def touching(self, pairs):
+        x, y, r = self.x, self.y, self.r
+        found = []
+        for i, j in pairs:
+            reach = r[i] + r[j]
+            gap_x = x[j] - x[i]
+            gap_y = y[j] - y[i]
+            if gap_x * gap_x + gap_y * gap_y < reach * reach:
+                found.append((i, j))
+        return found
+
+    def collide_balls(self):
+        contacts = self.touching(self.candidate_pairs())
+        contacts.sort()
+        resolve_contacts(contacts, self.x, self.y, self.dx, self.dy, self.r)
+        return len(contacts)
+
+    # --------------------------
+    # Rendering
+    # --------------------------
+    def boxes(self, alpha):
+        x, y, px, py, r = self.x, self.y, self.px, self.py, self.r
+        out = []
+        for i in range(self.count):
+            bx = px[i] + (x[i] - px[i]) * alpha
+            by = py[i] + (y[i] - py[i]) * alpha
+            ri = r[i]
+            out.append((bx - ri, by - ri, bx + ri, by + ri))
+        return out
+
+
+def resolve_contacts(contacts, x, y, dx, dy, r):
+    # One pair at a time in index order, so both backends agree exactly.
+    for i, j in contacts:
+        nx = x[j] - x[i]
+        ny = y[j] - y[i]
+        dist = math.sqrt(nx * nx + ny * ny)
+        if dist == 0.0:
+            nx, ny, dist = 1.0, 0.0, 1.0
+        nx /= dist
+        ny /= dist
+        push = (r[i] + r[j] - dist) / 2.0
+        if push > 0.0:
+            x[i] -= nx * push
+            y[i] -= ny * push
+            x[j] += nx * push
+            y[j] += ny * push
+        # Equal masses: swap the velocity components along the line of centres.
+        closing = (dx[i] - dx[j]) * nx + (dy[i] - dy[j]) * ny
+        if closing > 0.0:
+            dx[i] = engine.clamp(dx[i] - closing * nx, -engine.MAX_H_SPEED, engine.MAX_H_SPEED)
+            dy[i] = engine.clamp(dy[i] - closing * ny, -engine.MAX_V_SPEED, engine.MAX_V_SPEED)
+            dx[j] = engine.clamp(dx[j] + closing * nx, -engine.MAX_H_SPEED, engine.MAX_H_SPEED)
+            dy[j] = engine.clamp(dy[j] + closing * ny, -engine.MAX_V_SPEED, engine.MAX_V_SPEED)
+
+
+class NumpyBallField(BallField):
+    def _allocate(self, count):
+        for name in ("x", "y", "px", "py", "dx", "dy", "r"):
+            setattr(self, name, np.zeros(count))
+        self.stage = np.zeros(count, dtype=np.int64)
+
+    def step(self):
+        left, top, right, _bottom = self.bounds
+        x, y, dx, dy, r = self.x, self.y, self.dx, self.dy, self.r
+        self.px[:] = x
+        self.py[:] = y
+        x += dx
+        y += dy
+        hit = x - r <= left
+        x[hit] = left + r[hit]
+        dx[hit] = np.abs(dx[hit])
+        hit = x + r >= right
+        x[hit] = right - r[hit]
+        dx[hit] = -np.abs(dx[hit])
+        hit = y - r <= top
+        y[hit] = top + r[hit]
+        dy[hit] = np.abs(dy[hit])
+        if self.collide:
+            self.collide_balls()
+
+    def paddle_contacts(self, paddle, paddle_y=engine.PADDLE_Y):
+        x1, y1, x2, y2 = engine.paddle_rect(paddle["x"], paddle["w"], paddle_y)
+        x, y, r = self.x, self.y, self.r
+        self.rebounds.clear()
+        reached = y + r >= y1
+        hit = reached & (y - r <= y2) & (self.dy > 0) & (x1 <= x) & (x <= x2)
+        swept = np.zeros(self.count, dtype=bool)
+        for i in np.flatnonzero(reached & (self.py < y1)).tolist():
+            swept[i] = self.sweep(i, paddle, paddle_y)
+        hit |= swept
+        missed = ~hit & (y - r > self.bounds[3])
+        return np.flatnonzero(hit).tolist(), np.flatnonzero(missed).tolist()
+
+    def bounce_off_paddle(self, i, paddle, paddle_y=engine.PADDLE_Y):
+        rebound = self.rebounds.pop(i, None)
+        if rebound is not None:
+            self.x[i], self.y[i], self.dx[i], self.dy[i] = rebound
+            return
+        self.y[i] = paddle_y - engine.PADDLE_H / 2 - float(self.r[i]) - 1
+        self.dy[i] = -abs(float(self.dy[i]))
+        paddle_offset = (float(self.x[i]) - paddle["x"]) / max(1.0, paddle["w"] / 2.0)
+        self.dx[i] = engine.clamp(float(self.dx[i]) + paddle_offset * 0.9, -engine.MAX_H_SPEED, engine.MAX_H_SPEED)
+
+    def apply_speed_step(self, i, score):
+        current_stage = engine.speed_stage(score)
+        previous_stage = int(self.stage[i])
+        if current_stage <= previous_stage:
+            return False
+        factor = engine.SPEED_STEP_FACTOR ** (current_stage - previous_stage)
+        self.dx[i] = engine.clamp(float(self.dx[i]) * factor, -engine.MAX_H_SPEED, engine.MAX_H_SPEED)
+        self.dy[i] = engine.clamp(float(self.dy[i]) * factor, -engine.MAX_V_SPEED, engine.MAX_V_SPEED)
+        self.stage[i] = current_stage
+        return True
+
+    def cell_size(self):
+        return 2.0 * float(self.r.max()) if self.count else 1.0
+
+    def candidate_pairs(self):
+        n = self.count
+        if n < 2:
+            return []
+        cell = self.cell_size()
+        left, top, right, _bottom = self.bounds
+        # One empty column of padding on each side keeps the neighbour offsets from wrapping rows.
+        cols = int((right - left) // cell) + 3
+        cx = np.floor((self.x - left) / cell).astype(np.int64) + 1
+        cy = np.floor((self.y - top) / cell).astype(np.int64) + 1
+        keys = cy * cols + cx
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        position = np.arange(n)
+        firsts = []
+        seconds = []
+        for offset in (0, 1, cols - 1, cols, cols + 1):
+            lo = np.searchsorted(sorted_keys, sorted_keys + offset, "left")
+            hi = np.searchsorted(sorted_keys, sorted_keys + offset, "right")
+            if offset == 0:
+                lo = np.maximum(lo, position + 1)
+            counts = np.maximum(hi - lo, 0)
+            total = int(counts.sum())
+            if not total:
+                continue
+            owner = np.repeat(position, counts)
+            starts = np.cumsum(counts) - counts
+            partner = lo[owner] + (np.arange(total) - starts[owner])
+            firsts.append(order[owner])
+            seconds.append(order[partner])
+        if not firsts:
+            return []
+        a = np.concatenate(firsts)
+        b = np.concatenate(seconds)
+        return np.minimum(a, b), np.maximum(a, b)
+
+    def touching(self, pairs):
+        if not len(pairs):
+            return []
+        i, j = pairs
+        reach = self.r[i] + self.r[j]
+        gap_x = self.x[j] - self.x[i]
+        gap_y = self.y[j] - self.y[i]
+        close = gap_x * gap_x + gap_y * gap_y < reach * reach
+        return list(zip(i[close].tolist(), j[close].tolist()))
+
+    def collide_balls(self):
+        # Broad and narrow phase are vectorised; the few contacts left are resolved on Python floats.
+        contacts = self.touching(self.candidate_pairs())
+        if not contacts:
+            return 0
+        contacts.sort()
+        touched = sorted({k for pair in contacts for k in pair})
+        state = {name: dict(zip(touched, getattr(self, name)[touched].tolist())) for name in ("x", "y", "dx", "dy", "r")}
+        resolve_contacts(contacts, state["x"], state["y"], state["dx"], state["dy"], state["r"])
+        for name in ("x", "y", "dx", "dy"):
+            values = state[name]
+            getattr(self, name)[touched] = [values[k] for k in touched]
+        return len(contacts)
+
+    def boxes(self, alpha):
+        bx = self.px + (self.x - self.px) * alpha
+        by = self.py + (self.y - self.py) * alpha
+        r = self.r
+        return list(zip((bx - r).tolist(), (by - r).tolist(), (bx + r).tolist(), (by + r).tolist()))
+
+
+def _load_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        np = numpy
+    return np
+
+
+def ball_field(count, rng, level, score, **kwargs):
+    # A single ball is cheaper in plain Python than through NumPy's per-call overhead.
+    if count > 1 and _load_numpy():
+        return NumpyBallField(count, rng, level, score, **kwargs)
+    return BallField(count, rng, level, score, **kwargs)
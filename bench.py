@@ -0,0 +1,324 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import headless
+from results_store import default_data_dir
+
+
+GAMES = ("attention", "coordination", "multiball", "decision", "reaction", "memory")
+WARMUP_FRAMES = 20
+# A frame that makes more Tk calls, or takes this much longer, than the previous build is flagged.
+TIME_TOLERANCE = 0.25
+# ...as long as it is at least this many microseconds slower; below that it is timer noise.
+TIME_FLOOR_US = 20.0
+
+
+class VirtualTime:
+    # Stands in for a session recorder: the session clock and the scheduler share one simulated time.
+    closed = False
+
+    def __init__(self):
+        self.t = 0.0
+
+    def now(self):
+        return self.t
+
+    def timer(self, callback):
+        return callback
+
+    def input(self, _sequence, callback):
+        return callback
+
+    def score(self, _score, _level):
+        pass
+
+    def finish(self, _session, _settings):
+        return None
+
+
+def build_app():
+    os.environ["FPSCI_DATA_DIR"] = tempfile.mkdtemp(prefix="fpsci-bench-")
+    os.environ.pop("FPSCI_AGGREGATOR", None)
+    tk = headless.install()
+    import TennisCognitiveGame as game
+    from session import PlayerSession
+
+    vt = VirtualTime()
+
+    class BenchApp(game.TennisCognitiveApp):
+        def ask_player_name(self, game_name, on_name):
+            on_name("Bench")
+
+        def new_session(self, player, game_name):
+            return PlayerSession(self.canvas, player, game_name, 1, 0.0, seed=1, recorder=vt)
+
+    root = tk.Tk()
+    app = BenchApp(root)
+    app.scheduler.clock = vt.now
+    app.scheduler.precise = False
+    return app, vt
+
+
+# --------------------------
+# Bots: answer whatever is on screen so each game keeps progressing
+# --------------------------
+def _items(canvas, kind=None, tag=None, **options):
+    for item, (item_kind, coords, item_options) in canvas.items.items():
+        if kind is not None and item_kind != kind:
+            continue
+        if tag is not None and tag not in headless._tags(item_options):
+            continue
+        if all(item_options.get(k) == v for k, v in options.items()):
+            yield item, coords
+
+
+def bot_attention(app):
+    for _item, (x0, y0, x1, y1) in _items(app.canvas, "oval", fill="yellow", state="normal"):
+        app.canvas.fire("<Button-1>", headless.Event(x=int((x0 + x1) / 2), y=int((y0 + y1) / 2)))
+        return True
+    return False
+
+
+def bot_coordination(app):
+    balls = list(_items(app.canvas, "oval"))
+    if not balls:
+        return False
+    x0, _y0, x1, _y1 = balls[0][1]
+    app.canvas.fire("<Motion>", headless.Event(x=int((x0 + x1) / 2), y=300))
+    return True
+
+
+def bot_decision(app):
+    if not app.correct_key:
+        return False
+    app.master.fire("<KeyPress>", headless.Event(keysym=app.correct_key))
+    app.correct_key = None
+    return True
+
+
+def bot_reaction(app):
+    if not app.waiting_green:
+        return False
+    app.master.fire("<space>", headless.Event(keysym="space"))
+    return True
+
+
+def bot_memory(app):
+    if not any(True for _ in _items(app.canvas, "rectangle", tag="keypad", state="normal")):
+        return False
+    for digit in list(app.current_sequence):
+        app.master.fire("<KeyPress>", headless.Event(keysym=str(digit)))
+    return True
+
+
+BOTS = {
+    "attention": bot_attention,
+    "coordination": bot_coordination,
+    "multiball": bot_coordination,
+    "decision": bot_decision,
+    "reaction": bot_reaction,
+    "memory": bot_memory
+}
+
+
+# --------------------------
+# Measurement
+# --------------------------
+class Sample:
+    def __init__(self):
+        self.count = 0
+        self.calls = {}
+        self.times = []
+        self.item_ids = 0
+
+    def measure(self, canvas, fn):
+        before_calls = dict(headless.calls)
+        before_ids = canvas.last_item_id
+        started = time.perf_counter()
+        result = fn()
+        self.times.append(time.perf_counter() - started)
+        for name, total in headless.calls.items():
+            delta = total - before_calls.get(name, 0)
+            if delta:
+                self.calls[name] = self.calls.get(name, 0) + delta
+        self.item_ids += canvas.last_item_id - before_ids
+        self.count += 1
+        return result
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        times = sorted(self.times)
+        return {
+            "count": self.count,
+            "calls": {name: round(total / self.count, 3) for name, total in sorted(self.calls.items())},
+            "calls_total": round(sum(self.calls.values()) / self.count, 3),
+            "us_mean": round(sum(times) / len(times) * 1e6, 2),
+            "us_p50": round(times[len(times) // 2] * 1e6, 2),
+            "us_p95": round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1e6, 2),
+            "item_ids": round(self.item_ids / self.count, 3)
+        }
+
+
+def bench_screen(app, name, fn, repeat):
+    sample = Sample()
+    for _ in range(repeat):
+        sample.measure(app.canvas if name != "start_menu" else app.menu_canvas, fn)
+    return sample.summary()
+
+
+def bench_game(app, vt, game, frames):
+    frame = Sample()
+    inputs = Sample()
+    start = Sample()
+    if game == "multiball":
+        start.measure(app.canvas, lambda: app.start_coordination(app.multiball_count))
+    else:
+        start.measure(app.canvas, getattr(app, "start_" + game))
+    bot = BOTS[game]
+    live_before = len(app.canvas.items)
+    ids_before = app.canvas.last_item_id
+    measured = 0
+    while measured < frames and app.session.game_running:
+        due = app.scheduler.next_due()
+        if due is None:
+            break
+        vt.t = max(vt.t, due)
+        if measured >= WARMUP_FRAMES:
+            frame.measure(app.canvas, app.master.run_jobs)
+            inputs.measure(app.canvas, lambda: bot(app))
+        else:
+            app.master.run_jobs()
+            bot(app)
+        measured += 1
+    result = {
+        "start": start.summary(),
+        "frame": frame.summary(),
+        "input": inputs.summary(),
+        "score": app.session.total_score,
+        "level": app.session.level,
+        "live_items_growth": len(app.canvas.items) - live_before,
+        "item_id_growth": app.canvas.last_item_id - ids_before
+    }
+    app.exit_current_game()
+    return result
+
+
+def run(frames=600, repeat=200, games=GAMES):
+    app, vt = build_app()
+    report = {
+        "build": build_label(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": time.time(),
+        "frames": frames,
+        "screens": {
+            "start_menu": bench_screen(app, "start_menu", app.start_menu, repeat)
+        },
+        "games": {}
+    }
+    app.start_decision()
+    report["screens"]["refresh_hud"] = bench_screen(app, "refresh_hud", app.refresh_hud, repeat)
+    app.exit_current_game()
+    for game in games:
+        report["games"][game] = bench_game(app, vt, game, frames)
+    app.services.close()
+    return report
+
+
+def build_label():
+    try:
+        out = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=5
+        )
+        if out.returncode == 0:
+            return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return "unknown"
+
+
+# --------------------------
+# Regression check
+# --------------------------
+def compare(current, previous):
+    flagged = []
+
+    def check(name, now, then):
+        if not now.get("count") or not then.get("count"):
+            return
+        if now["calls_total"] > then["calls_total"]:
+            flagged.append(f"{name}: {then['calls_total']} -> {now['calls_total']} Tk calls")
+        if now["us_p50"] > max(then["us_p50"] * (1 + TIME_TOLERANCE), then["us_p50"] + TIME_FLOOR_US):
+            flagged.append(f"{name}: p50 {then['us_p50']} -> {now['us_p50']} us")
+        if now["item_ids"] > then["item_ids"]:
+            flagged.append(f"{name}: {then['item_ids']} -> {now['item_ids']} new item IDs")
+
+    for screen, now in current["screens"].items():
+        check(screen, now, previous.get("screens", {}).get(screen, {}))
+    for game, now in current["games"].items():
+        then = previous.get("games", {}).get(game, {})
+        for part in ("start", "frame", "input"):
+            check(f"{game}.{part}", now[part], then.get(part, {}))
+    return flagged
+
+
+def print_report(report):
+    print(f"build {report['build']}  python {report['python']}")
+    print(f"{'':<22}{'calls':>8}{'us p50':>10}{'us p95':>10}{'new ids':>9}")
+    rows = [(name, summary) for name, summary in report["screens"].items()]
+    for game, result in report["games"].items():
+        rows.append((f"{game} start", result["start"]))
+        rows.append((f"{game} frame", result["frame"]))
+        rows.append((f"{game} input", result["input"]))
+    for name, s in rows:
+        if s.get("count"):
+            print(f"{name:<22}{s['calls_total']:>8}{s['us_p50']:>10}{s['us_p95']:>10}{s['item_ids']:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count Tk calls and time the render paths on a headless canvas.")
+    parser.add_argument("--frames", type=int, default=600, help="scheduler frames measured per game")
+    parser.add_argument("--repeat", type=int, default=200, help="repetitions for the menu and HUD screens")
+    parser.add_argument("--games", nargs="*", default=list(GAMES), choices=GAMES)
+    parser.add_argument("--results-dir", default=None, help="where results are saved (default: data directory)")
+    parser.add_argument("--baseline", default=None, help="compare against this result instead of the latest saved one")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    # Resolve before the benchmark points FPSCI_DATA_DIR at its scratch directory.
+    results_dir = args.results_dir or os.path.join(default_data_dir(), "benchmarks")
+    os.makedirs(results_dir, exist_ok=True)
+    previous = sorted(glob.glob(os.path.join(results_dir, "bench-*.json")))
+    baseline = args.baseline or (previous[-1] if previous else None)
+
+    report = run(args.frames, args.repeat, args.games)
+    print_report(report)
+
+    flagged = []
+    if baseline:
+        with open(baseline, "r", encoding="utf-8") as fh:
+            flagged = compare(report, json.load(fh))
+        print(f"\ncompared with {os.path.basename(baseline)}: " + ("no regressions" if not flagged else ""))
+        for line in flagged:
+            print("  REGRESSION " + line)
+    if not args.no_save:
+        path = os.path.join(results_dir, time.strftime("bench-%Y%m%d-%H%M%S.json"))
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+        print(f"saved {path}")
+    if flagged and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
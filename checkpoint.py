@@ -0,0 +1,238 @@
+import os
+import struct
+import threading
+import time
+import zlib
+
+from game_engine import GAMES
+from results_store import default_data_dir
+
+
+# Append-only journal of in-progress sessions. Each frame is body length + CRC32, then a body:
+#   kind, game, level, station, session_key, t_ns, score, total_score, trial, balls, player length,
+#   player (UTF-8), then the RNG state on progress frames taken at the start of a trial
+# A torn or corrupt frame ends the journal; anything after it is dropped on the next scan.
+FRAME = struct.Struct("<II")
+STATE = struct.Struct("<BBBBqqiiIHH")
+HEAD = struct.Struct("<Bxxxq")
+RNG_HEADER = struct.Struct("<BBd")
+RNG_WORDS = struct.Struct("<625I")
+
+KIND_PROGRESS = 1
+KIND_CLOSED = 2
+
+GAME_CODES = {game: idx for idx, game in enumerate(GAMES, start=1)}
+GAME_NAMES = {idx: game for game, idx in GAME_CODES.items()}
+
+# Progress frames are written straight to the file, which survives the process dying; an fsync
+# for power loss is handed to the write-behind thread at most this often.
+SYNC_INTERVAL = 2.0
+
+# The journal is emptied whenever no session is open. While some are, it is rewritten down to
+# their latest frames once it passes this size, so stations that overlap all day stay bounded.
+COMPACT_BYTES = 256 * 1024
+
+
+def default_journal_path():
+    return os.path.join(default_data_dir(), "sessions.journal")
+
+
+def pack_rng(state):
+    version, internal, gauss_next = state
+    return RNG_HEADER.pack(version, gauss_next is not None, gauss_next or 0.0) + RNG_WORDS.pack(*internal)
+
+
+def unpack_rng(data):
+    version, has_gauss, gauss_next = RNG_HEADER.unpack_from(data)
+    return version, RNG_WORDS.unpack_from(data, RNG_HEADER.size), gauss_next if has_gauss else None
+
+
+def session_state(session, station, balls=1, rng=True):
+    return {
+        "game": session.current_game,
+        "level": session.level,
+        "station": station,
+        "session_key": session.session_key,
+        "t_ns": time.time_ns(),
+        "score": session.score,
+        "total_score": session.total_score,
+        "trial": session.trial_index,
+        "balls": balls,
+        "player": session.current_player or "",
+        # getstate() is most of a checkpoint's cost, so score-only checkpoints leave it out.
+        "rng_state": session.rng.getstate() if rng else None
+    }
+
+
+def encode(kind, state):
+    player = state["player"].encode("utf-8")
+    body = STATE.pack(
+        kind,
+        GAME_CODES[state["game"]],
+        state["level"],
+        state["station"],
+        state["session_key"],
+        state["t_ns"],
+        state["score"],
+        state["total_score"],
+        state["trial"],
+        state["balls"],
+        len(player)
+    ) + player
+    if kind == KIND_PROGRESS and state["rng_state"] is not None:
+        body += pack_rng(state["rng_state"])
+    return FRAME.pack(len(body), zlib.crc32(body)) + body
+
+
+def decode(body, rng_body=None):
+    kind, game, level, station, session_key, t_ns, score, total_score, trial, balls, name_len = STATE.unpack_from(body)
+    offset = STATE.size + name_len
+    rng_state = None
+    if rng_body is not None:
+        rng_state = unpack_rng(rng_body[STATE.size + STATE.unpack_from(rng_body)[-1]:])
+    return {
+        "kind": kind,
+        "game": GAME_NAMES[game],
+        "level": level,
+        "station": station,
+        "session_key": session_key,
+        "t_ns": t_ns,
+        "score": score,
+        "total_score": total_score,
+        "trial": trial,
+        "balls": balls,
+        "player": body[STATE.size:offset].decode("utf-8"),
+        "rng_state": rng_state
+    }
+
+
+def scan(data):
+    # One pass: the last progress frame of every session that never got a closed frame, with
+    # the RNG state from its last trial start. Returns those and the length of the intact prefix.
+    open_sessions = {}
+    rng_frames = {}
+    offset = 0
+    while offset + FRAME.size <= len(data):
+        length, crc = FRAME.unpack_from(data, offset)
+        body = data[offset + FRAME.size:offset + FRAME.size + length]
+        if len(body) < max(length, STATE.size) or zlib.crc32(body) != crc:
+            break
+        offset += FRAME.size + length
+        kind, key = HEAD.unpack_from(body)
+        if kind == KIND_CLOSED:
+            open_sessions.pop(key, None)
+            rng_frames.pop(key, None)
+            continue
+        open_sessions[key] = body
+        if len(body) > STATE.size + STATE.unpack_from(body)[-1]:
+            rng_frames[key] = body
+    return [decode(body, rng_frames.get(key)) for key, body in open_sessions.items()], offset
+
+
+class SessionJournal:
+    def __init__(self, path=None, writer=None, clock=time.monotonic):
+        self.path = path or default_journal_path()
+        self.writer = writer
+        self.clock = clock
+        self.lock = threading.Lock()
+        # session_key -> (latest frame, latest frame carrying the RNG state), for compaction.
+        self.open = {}
+        self.orphans = self._recover()
+        self.fd = self._open()
+        self.last_sync_request = clock()
+        self.frames = 0
+
+    def _open(self):
+        return os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0))
+
+    def _recover(self):
+        self.size = 0
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as fh:
+            data = fh.read()
+        orphans, intact = scan(data)
+        # Nothing left open: start the journal over rather than letting it grow across launches.
+        if not orphans:
+            intact = 0
+        if intact != len(data):
+            with open(self.path, "r+b") as fh:
+                fh.truncate(intact)
+        self.size = intact
+        for state in orphans:
+            frame = encode(KIND_PROGRESS, state)
+            self.open[state["session_key"]] = (frame, frame)
+        orphans.sort(key=lambda checkpoint: checkpoint["t_ns"], reverse=True)
+        return orphans
+
+    def checkpoint(self, session, station, balls=1, rng=True):
+        frame = encode(KIND_PROGRESS, session_state(session, station, balls, rng))
+        with self.lock:
+            os.write(self.fd, frame)
+            self.size += len(frame)
+            last = self.open.get(session.session_key)
+            self.open[session.session_key] = (frame, frame if rng else last and last[1])
+        self.frames += 1
+        if self.writer is not None and self.clock() - self.last_sync_request >= SYNC_INTERVAL:
+            self.last_sync_request = self.clock()
+            self.writer(b"")
+
+    def write_frames(self, frames, sync=True):
+        # Write-behind sink: closed frames go out after the session rows queued before them. The
+        # lock is only held for the appends and bookkeeping; the UI thread's checkpoints wait on it.
+        data = b"".join(frames)
+        with self.lock:
+            if data:
+                os.write(self.fd, data)
+                self.size += len(data)
+            for frame in frames:
+                if frame:
+                    kind, key = HEAD.unpack_from(frame, FRAME.size)
+                    if kind == KIND_CLOSED:
+                        self.open.pop(key, None)
+            compact = False
+            if not self.open and self.size:
+                os.ftruncate(self.fd, 0)
+                self.size = 0
+            else:
+                compact = self.size > COMPACT_BYTES
+            fd = self.fd
+        # Only this thread swaps the fd, so the snapshot stays valid outside the lock.
+        if compact:
+            self._compact()
+        elif sync:
+            os.fsync(fd)
+
+    def _compact(self):
+        with self.lock:
+            mark = self.size
+            latest = list(self.open.values())
+        frames = []
+        for frame, rng_frame in latest:
+            if rng_frame is not None and rng_frame is not frame:
+                frames.append(rng_frame)
+            frames.append(frame)
+        data = b"".join(frames)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        with self.lock:
+            # Frames checkpointed while the copy was written follow it, in the order they came.
+            with open(self.path, "rb") as old:
+                old.seek(mark)
+                tail = old.read()
+            with open(tmp, "ab") as fh:
+                fh.write(tail)
+            # Closed first: Windows will not replace a file that is still open.
+            os.close(self.fd)
+            os.replace(tmp, self.path)
+            self.fd = self._open()
+            self.size = len(data) + len(tail)
+
+    def close(self):
+        with self.lock:
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
@@ -0,0 +1,89 @@
+import time
+
+
+class FixedStepLoop:
+    def __init__(
+        self,
+        schedule,
+        update,
+        render,
+        step=0.016,
+        target_fps=60,
+        max_steps_per_frame=5,
+        max_frame_time=0.25,
+        clock=time.perf_counter,
+        on_frame=None
+    ):
+        self.schedule = schedule
+        self.update = update
+        self.render = render
+        self.step = step
+        self.target_fps = target_fps
+        self.max_steps_per_frame = max_steps_per_frame
+        self.max_frame_time = max_frame_time
+        self.clock = clock
+        self.on_frame = on_frame
+
+        self.running = False
+        self.accumulator = 0.0
+        self.last_time = None
+        self.next_frame_time = None
+        self.frames = 0
+        self.steps = 0
+        self.skipped_steps = 0
+
+    def frame_period(self):
+        return 1.0 / max(1, self.target_fps)
+
+    def start(self):
+        self.running = True
+        self.accumulator = 0.0
+        self.last_time = self.clock()
+        self.next_frame_time = self.last_time
+        self.render(0.0)
+        self._queue_next()
+
+    def stop(self):
+        self.running = False
+
+    def _queue_next(self):
+        self.next_frame_time += self.frame_period()
+        now = self.clock()
+        if self.next_frame_time < now:
+            # We are already behind; re-anchor instead of firing a burst of catch-up frames.
+            self.next_frame_time = now
+        delay_ms = max(1, int(round((self.next_frame_time - now) * 1000)))
+        self.schedule(delay_ms, self.tick)
+
+    def tick(self):
+        if not self.running:
+            return
+
+        now = self.clock()
+        frame_dt = min(self.max_frame_time, max(0.0, now - self.last_time))
+        self.last_time = now
+        self.accumulator += frame_dt
+
+        steps = 0
+        while self.accumulator >= self.step and steps < self.max_steps_per_frame:
+            if self.update(self.step) is False:
+                self.running = False
+                return
+            self.accumulator -= self.step
+            steps += 1
+
+        if self.accumulator >= self.step:
+            # Frame-skip limit reached: drop the backlog so the game slows down
+            # briefly instead of spiralling into ever longer catch-up frames.
+            dropped = int(self.accumulator // self.step)
+            self.skipped_steps += dropped
+            self.accumulator -= dropped * self.step
+
+        self.steps += steps
+        self.frames += 1
+        self.render(self.accumulator / self.step)
+        if self.on_frame is not None:
+            self.on_frame()
+
+        if self.running:
+            self._queue_next()
@@ -0,0 +1,750 @@
+import math
+import random
+import sys
+import time
+from collections import deque
+
+
+GAMES = ("Attention", "Coordination", "Decision", "Reaction", "Memory")
+
+BASE_SPEED = {
+    "Attention": 1200,
+    "Coordination": 20,
+    "Decision": 1400,
+    "Reaction": 1500,
+    "Memory": 2600
+}
+LEVEL_2_UNLOCK_SCORE = 50
+LEVEL_3_UNLOCK_SCORE = 100
+
+ATTENTION_FIELD = (130, 130, 780, 560)
+ATTENTION_RADIUS = 18
+ATTENTION_GAP = 6
+ATTENTION_MAX_LEVEL = 3
+ATTENTION_COLORS = ("red", "blue", "white", "orange", "pink", "cyan")
+
+PLAY_BOUNDS = (120, 120, 790, 560)
+PADDLE_H = 16.0
+PADDLE_Y = PLAY_BOUNDS[3] - 20
+PHYSICS_STEP = 0.016
+SPEED_STEP_SCORE = 5
+SPEED_STEP_FACTOR = 1.06
+MAX_H_SPEED = 7.5
+MAX_V_SPEED = 10.5
+PADDLE_SMOOTHING = 0.32
+# Headless Coordination: "stepped" runs the app's 60 Hz physics and swept paddle test step by step.
+# "analytic" solves each ball flight to the paddle line in closed form, about 100x faster, but
+# approximates paddle smoothing as a fixed delay and uses the overlap hit rule, so its results
+# only approximate the app's; it is opt-in.
+PHYSICS_MODES = ("stepped", "analytic")
+
+
+# --------------------------
+# Rules shared with the Tk app
+# --------------------------
+def clamp(val, lo, hi):
+    return max(lo, min(hi, val))
+
+
+def game_speed(base, score, level):
+    speed_boost = max(0, score - 25) * 0.015
+    level_boost = (level - 1) * 0.18
+    scale = max(0.35, 1.0 - speed_boost - level_boost)
+    return max(8, int(base * scale))
+
+
+def level_for_score(score, level_2_unlock_score=LEVEL_2_UNLOCK_SCORE, level_3_unlock_score=LEVEL_3_UNLOCK_SCORE):
+    if score >= level_3_unlock_score:
+        return 3
+    if score >= level_2_unlock_score:
+        return 2
+    return 1
+
+
+def points_from_reaction(reaction_time):
+    if reaction_time <= 0.20:
+        return 5
+    if reaction_time <= 0.30:
+        return 4
+    if reaction_time <= 0.40:
+        return 3
+    if reaction_time <= 0.55:
+        return 2
+    return 1
+
+
+def reaction_windows(speed):
+    wait_min = max(280, int(speed * 0.55))
+    wait_max = max(wait_min + 140, int(speed * 1.05))
+    green_window = max(220, int(speed * 0.45))
+    return wait_min, wait_max, green_window
+
+
+def attention_target_count(level):
+    return 6 + (level - 1) * 2
+
+
+def attention_layout(rng, count, field=ATTENTION_FIELD, radius=ATTENTION_RADIUS, gap=ATTENTION_GAP, attempts=30):
+    left, top, right, bottom = field
+    min_dist = 2 * radius + gap
+    min_dist_sq = min_dist * min_dist
+    cell = min_dist / 2 ** 0.5
+    grid = {}
+    points = []
+
+    # Dart throwing with a background grid (one point per cell) keeps circles apart.
+    for _ in range(count * attempts):
+        if len(points) == count:
+            break
+        x = rng.randint(left, right)
+        y = rng.randint(top, bottom)
+        gx, gy = int((x - left) / cell), int((y - top) / cell)
+        clear = True
+        for nx in range(gx - 2, gx + 3):
+            for ny in range(gy - 2, gy + 3):
+                other = grid.get((nx, ny))
+                if other is not None and (other[0] - x) ** 2 + (other[1] - y) ** 2 < min_dist_sq:
+                    clear = False
+                    break
+            if not clear:
+                break
+        if clear:
+            grid[(gx, gy)] = (x, y)
+            points.append((x, y))
+
+    if len(points) < count:
+        raise ValueError(f"Cannot place {count} targets without overlap")
+    return points
+
+
+class LayoutBank:
+    def __init__(self, rng, counts, layouts_per_count=48, **layout_kwargs):
+        self.layouts = {
+            count: [attention_layout(rng, count, **layout_kwargs) for _ in range(layouts_per_count)]
+            for count in counts
+        }
+
+    def pick(self, rng, count):
+        return rng.choice(self.layouts[count])
+
+
+class TargetField:
+    def __init__(self, radius=ATTENTION_RADIUS):
+        self.radius = radius
+        self.cell = 2.0 * radius
+        self.points = []
+        self.target_index = None
+        self.grid = {}
+
+    def set_targets(self, points, target_index):
+        cell = self.cell
+        grid = {}
+        for i, (x, y) in enumerate(points):
+            grid.setdefault((int(x // cell), int(y // cell)), []).append(i)
+        self.points = points
+        self.target_index = target_index
+        self.grid = grid
+
+    def clear(self):
+        self.set_targets([], None)
+
+    def hit_test(self, x, y):
+        cell = self.cell
+        gx, gy = int(x // cell), int(y // cell)
+        r_sq = self.radius * self.radius
+        # Cells are one diameter wide, so any circle containing the point has its centre in the 3x3 block.
+        for nx in (gx - 1, gx, gx + 1):
+            for ny in (gy - 1, gy, gy + 1):
+                for i in self.grid.get((nx, ny), ()):
+                    px, py = self.points[i]
+                    if (px - x) ** 2 + (py - y) ** 2 <= r_sq:
+                        return ("hit" if i == self.target_index else "distractor"), i
+        return "miss", None
+
+
+def memory_sequence_length(level, score):
+    return 3 + level + min(6, score // 12)
+
+
+def memory_display_ms(speed):
+    return max(900, speed)
+
+
+def speed_stage(score):
+    return score // SPEED_STEP_SCORE
+
+
+def paddle_width(level, score):
+    return float(max(84, 170 - ((level - 1) * 26) - (max(0, score - 25) // 2)))
+
+
+def spawn_ball(ball, rng, level, score, bounds=PLAY_BOUNDS):
+    play_left, play_top, play_right, _play_bottom = bounds
+    ball["r"] = rng.randint(12, 18)
+    ball["x"] = rng.randint(play_left + 24, play_right - 24)
+    ball["y"] = rng.randint(play_top + 25, play_top + 110)
+    stage_factor = SPEED_STEP_FACTOR ** speed_stage(score)
+    dx_mag = rng.uniform(1.8, 2.7) + (level - 1) * 0.20 + min(1.0, max(0, score - 25) * 0.02)
+    ball["dx"] = clamp(rng.choice([-1, 1]) * dx_mag * stage_factor, -MAX_H_SPEED, MAX_H_SPEED)
+    ball["dy"] = clamp(
+        (rng.uniform(2.3, 3.1) + (level - 1) * 0.35 + min(2.0, max(0, score - 25) * 0.04)) * stage_factor,
+        -MAX_V_SPEED,
+        MAX_V_SPEED
+    )
+    ball["speed_stage"] = speed_stage(score)
+    ball["px"] = ball["x"]
+    ball["py"] = ball["y"]
+    return ball
+
+
+def apply_speed_step(ball, score):
+    current_stage = speed_stage(score)
+    previous_stage = ball.get("speed_stage", current_stage)
+    if current_stage <= previous_stage:
+        return False
+
+    factor = SPEED_STEP_FACTOR ** (current_stage - previous_stage)
+    ball["dx"] = clamp(ball["dx"] * factor, -MAX_H_SPEED, MAX_H_SPEED)
+    ball["dy"] = clamp(ball["dy"] * factor, -MAX_V_SPEED, MAX_V_SPEED)
+    ball["speed_stage"] = current_stage
+    return True
+
+
+def step_paddle(paddle, level, score, bounds=PLAY_BOUNDS):
+    play_left, _play_top, play_right, _play_bottom = bounds
+    paddle["w"] = paddle_width(level, score)
+    paddle["prev_x"] = paddle["x"]
+
+    # Smooth paddle motion to make it a coordination challenge, not instant snapping.
+    paddle["x"] += (paddle["mouse_x"] - paddle["x"]) * PADDLE_SMOOTHING
+    half_w = paddle["w"] / 2
+    paddle["x"] = clamp(paddle["x"], play_left + half_w, play_right - half_w)
+
+
+def paddle_rect(paddle_x, paddle_w, paddle_y=PADDLE_Y, paddle_h=PADDLE_H):
+    half_w = paddle_w / 2
+    return (
+        paddle_x - half_w, paddle_y - paddle_h / 2,
+        paddle_x + half_w, paddle_y + paddle_h / 2
+    )
+
+
+def step_ball(ball, bounds=PLAY_BOUNDS):
+    play_left, play_top, play_right, _play_bottom = bounds
+    ball["px"] = ball["x"]
+    ball["py"] = ball["y"]
+    ball["x"] += ball["dx"]
+    ball["y"] += ball["dy"]
+
+    if ball["x"] - ball["r"] <= play_left:
+        ball["x"] = play_left + ball["r"]
+        ball["dx"] = abs(ball["dx"])
+    if ball["x"] + ball["r"] >= play_right:
+        ball["x"] = play_right - ball["r"]
+        ball["dx"] = -abs(ball["dx"])
+    if ball["y"] - ball["r"] <= play_top:
+        ball["y"] = play_top + ball["r"]
+        ball["dy"] = abs(ball["dy"])
+
+
+def resolve_paddle(ball, paddle, bounds=PLAY_BOUNDS, paddle_y=PADDLE_Y):
+    x1, y1, x2, y2 = paddle_rect(paddle["x"], paddle["w"], paddle_y)
+    ball_bottom = ball["y"] + ball["r"]
+    ball_top = ball["y"] - ball["r"]
+    ball_on_paddle_x = x1 <= ball["x"] <= x2
+    if ball_bottom >= y1 and ball_top <= y2 and ball["dy"] > 0 and ball_on_paddle_x:
+        return "hit"
+    if ball["y"] - ball["r"] > bounds[3]:
+        return "missed"
+    return None
+
+
+def bounce_off_paddle(ball, paddle, paddle_y=PADDLE_Y):
+    y1 = paddle_y - PADDLE_H / 2
+    ball["y"] = y1 - ball["r"] - 1
+    ball["dy"] = -abs(ball["dy"])
+    paddle_offset = (ball["x"] - paddle["x"]) / max(1.0, paddle["w"] / 2.0)
+    ball["dx"] = clamp(ball["dx"] + paddle_offset * 0.9, -MAX_H_SPEED, MAX_H_SPEED)
+
+
+def paddle_impact(x0, y0, x1, y1, r, paddle_x0, paddle_x1, paddle_w, paddle_y=PADDLE_Y):
+    # Earliest t in [0, 1] at which a ball moving (x0, y0) -> (x1, y1) over one step touches the top
+    # of a paddle moving paddle_x0 -> paddle_x1 over the same step, with the contact normal.
+    # Worked in the paddle's frame, so a fast paddle and a fast ball are both exact.
+    top = paddle_y - PADDLE_H / 2
+    half_w = paddle_w / 2
+    ax = x0 - paddle_x0
+    bx = (x1 - x0) - (paddle_x1 - paddle_x0)
+    by = y1 - y0
+    best = None
+
+    if by > 0 and y0 + r <= top:
+        t = (top - r - y0) / by
+        if t <= 1.0 and abs(ax + t * bx) <= half_w:
+            best = (t, 0.0, -1.0)
+
+    # Rounded ends: the circle reaching a top corner of the paddle.
+    qy = y0 - top
+    for corner in (-half_w, half_w):
+        qx = ax - corner
+        a = bx * bx + by * by
+        b = bx * qx + by * qy
+        c = qx * qx + qy * qy - r * r
+        if a == 0.0 or c <= 0.0 or b >= 0.0:
+            continue
+        disc = b * b - a * c
+        if disc < 0.0:
+            continue
+        t = (-b - disc ** 0.5) / a
+        if t > 1.0 or (best is not None and t >= best[0]):
+            continue
+        cx = qx + t * bx
+        cy = qy + t * by
+        if cy < 0.0 and abs(cx + corner) > half_w:
+            best = (t, cx / r, cy / r)
+    return best
+
+
+def paddle_rebound(x0, y0, x1, y1, impact, paddle_x0, paddle_x1, paddle_w):
+    # Position and per-step velocity after reflecting at the impact, or None when the contact
+    # cannot send the ball back up (a glancing touch on a corner).
+    t, nx, ny = impact
+    paddle_dx = paddle_x1 - paddle_x0
+    ux = (x1 - x0) - paddle_dx
+    uy = y1 - y0
+    dot = ux * nx + uy * ny
+    if dot >= 0.0:
+        return None
+    ux -= 2.0 * dot * nx
+    uy -= 2.0 * dot * ny
+    if uy >= 0.0:
+        return None
+    hit_x = x0 + t * (x1 - x0)
+    hit_y = y0 + t * (y1 - y0)
+    paddle_offset = (hit_x - (paddle_x0 + t * paddle_dx)) / max(1.0, paddle_w / 2.0)
+    dx = clamp(ux + paddle_dx + paddle_offset * 0.9, -MAX_H_SPEED, MAX_H_SPEED)
+    dy = max(-MAX_V_SPEED, uy)
+    # Spend the rest of the step travelling away from the paddle.
+    return hit_x + dx * (1.0 - t), hit_y + dy * (1.0 - t), dx, dy
+
+
+def sweep_paddle(ball, paddle, paddle_y=PADDLE_Y):
+    impact = paddle_impact(
+        ball["px"], ball["py"], ball["x"], ball["y"], ball["r"], paddle["prev_x"], paddle["x"], paddle["w"], paddle_y
+    )
+    if impact is None:
+        return None
+    return paddle_rebound(ball["px"], ball["py"], ball["x"], ball["y"], impact, paddle["prev_x"], paddle["x"], paddle["w"])
+
+
+def steps_until(distance, speed):
+    # Whole physics steps for a point moving `speed` per step to cover `distance` (at least one).
+    return max(1, int(math.ceil(distance / speed - 1e-9)))
+
+
+def advance_x(x, dx, r, steps, bounds=PLAY_BOUNDS):
+    # step_ball's horizontal motion over `steps` steps, one wall contact at a time.
+    play_left, _play_top, play_right, _play_bottom = bounds
+    while steps > 0:
+        if dx > 0:
+            to_wall = steps_until(play_right - r - x, dx)
+        elif dx < 0:
+            to_wall = steps_until(x - r - play_left, -dx)
+        else:
+            return x, dx
+        if to_wall > steps:
+            return x + dx * steps, dx
+        steps -= to_wall
+        if dx > 0:
+            x, dx = play_right - r, -abs(dx)
+        else:
+            x, dx = play_left + r, abs(dx)
+    return x, dx
+
+
+def steps_to_paddle(y, dy, r, bounds=PLAY_BOUNDS, paddle_y=PADDLE_Y):
+    # Steps until the ball's bottom first reaches the paddle's top edge, via the top wall if it
+    # is on its way up; returns the step count and the y it arrives at.
+    play_top = bounds[1]
+    steps = 0
+    if dy < 0:
+        steps = steps_until(y - r - play_top, -dy)
+        y, dy = play_top + r, -dy
+    down = steps_until(paddle_y - PADDLE_H / 2 - r - y, dy)
+    return steps + down, y + dy * down
+
+
+# --------------------------
+# Bot players
+# --------------------------
+class BotPlayer:
+    def __init__(
+        self,
+        name="bot",
+        rt_mean=0.38,
+        rt_sd=0.07,
+        rt_floor=0.12,
+        error_rate=0.05,
+        search_cost=0.035,
+        recall_digit_time=0.32,
+        tracking_lag=0.12,
+        aim_noise=6.0
+    ):
+        self.name = name
+        self.rt_mean = rt_mean
+        self.rt_sd = rt_sd
+        self.rt_floor = rt_floor
+        self.error_rate = error_rate
+        self.search_cost = search_cost
+        self.recall_digit_time = recall_digit_time
+        self.tracking_lag = tracking_lag
+        self.aim_noise = aim_noise
+
+    def response_time(self, rng, items=1):
+        rt = rng.gauss(self.rt_mean, self.rt_sd) + self.search_cost * max(0, items - 1)
+        return max(self.rt_floor, rt)
+
+    def makes_error(self, rng):
+        return rng.random() < self.error_rate
+
+    def recall(self, sequence, rng):
+        answer = [d if not self.makes_error(rng) else (d % 9) + 1 for d in sequence]
+        return answer, self.recall_digit_time * len(sequence)
+
+    def aim(self, observed_x, rng):
+        if self.aim_noise:
+            return observed_x + rng.gauss(0.0, self.aim_noise)
+        return observed_x
+
+
+# --------------------------
+# Headless sessions
+# --------------------------
+class HeadlessSession:
+    def __init__(
+        self,
+        game,
+        bot,
+        seed=None,
+        duration=120.0,
+        base_speed=None,
+        level_2_unlock_score=LEVEL_2_UNLOCK_SCORE,
+        level_3_unlock_score=LEVEL_3_UNLOCK_SCORE,
+        difficulty="fixed",
+        physics="stepped"
+    ):
+        if game not in GAMES:
+            raise ValueError(f"Unknown game: {game}")
+        if physics not in PHYSICS_MODES:
+            raise ValueError(f"physics must be one of {PHYSICS_MODES}")
+        self.game = game
+        self.bot = bot
+        self.seed = seed
+        self.duration = duration
+        self.base_speed = dict(BASE_SPEED if base_speed is None else base_speed)
+        self.level_2_unlock_score = level_2_unlock_score
+        self.level_3_unlock_score = level_3_unlock_score
+        self.physics = physics
+
+        # Every game keeps exactly one event pending, so a single slot stands in for a timer queue.
+        self.now = 0.0
+        self._due = None
+        self._next = None
+        self.rng = random.Random(seed)
+        self.level = 1
+        self.score = 0
+        self.total_score = 0
+        self.trials = 0
+        self.game_running = False
+        self.end_reason = None
+        self.level_up_times = {}
+
+        from adaptive import make_tracker
+
+        self.tracker = make_tracker(difficulty, game)
+        self.difficulty_trace = []
+
+    def game_speed(self):
+        if self.tracker is not None and self.tracker.measure == "speed":
+            return self.tracker.value()
+        return game_speed(self.base_speed[self.game], self.score, self.level)
+
+    def memory_length(self):
+        if self.tracker is not None and self.tracker.measure == "length":
+            return self.tracker.value()
+        return memory_sequence_length(self.level, self.score)
+
+    def adapt(self, success):
+        if self.tracker is not None:
+            self.tracker.update(success)
+            self.difficulty_trace.append(self.tracker.index)
+
+    def add_point(self, points=1):
+        self.score += points
+        self.total_score += points
+        previous_level = self.level
+        self.level = level_for_score(self.score, self.level_2_unlock_score, self.level_3_unlock_score)
+        if self.level > previous_level:
+            self.level_up_times[self.level] = self.now
+            return "next_level"
+        return "continue"
+
+    def end_game_session(self, reason):
+        if self.game_running:
+            self.game_running = False
+            self.end_reason = reason
+
+    def _reschedule(self, delay_ms, callback):
+        self._due = self.now + max(0, delay_ms) / 1000.0
+        self._next = callback
+
+    def run(self):
+        self.game_running = True
+        getattr(self, "_start_" + self.game.lower())()
+        while self._next is not None and self._due <= self.duration:
+            callback, self._next = self._next, None
+            self.now = self._due
+            callback()
+        self.now = max(self.now, self.duration)
+        self.end_game_session("Time up.")
+        return {
+            "game": self.game,
+            "player": self.bot.name,
+            "seed": self.seed,
+            "score": self.total_score,
+            "level": self.level,
+            "trials": self.trials,
+            "duration": min(self.now, self.duration),
+            "level_up_times": dict(self.level_up_times),
+            "end_reason": self.end_reason,
+            "threshold": self.tracker.threshold() if self.tracker is not None else None,
+            "difficulty_trace": self.difficulty_trace
+        }
+
+    # Attention
+    def _start_attention(self):
+        self._attention_round()
+
+    def _attention_round(self):
+        if not self.game_running:
+            return
+        self.trials += 1
+        count = attention_target_count(self.level)
+        interval = self.game_speed() / 1000.0
+        elapsed = self.bot.response_time(self.rng, count)
+        # A wrong click lands on a distractor and is ignored; the bot keeps searching.
+        while self.bot.makes_error(self.rng) and elapsed < interval:
+            elapsed += self.bot.response_time(self.rng, count)
+        if elapsed < interval:
+            self._reschedule(elapsed * 1000.0, self._attention_hit)
+        else:
+            self._reschedule(interval * 1000.0, self._attention_round)
+
+    def _attention_hit(self):
+        if not self.game_running:
+            return
+        self.add_point(1)
+        self._attention_round()
+
+    # Coordination
+    def _start_coordination(self):
+        self.paddle = {"x": 455.0, "prev_x": 455.0, "mouse_x": 455.0, "w": paddle_width(1, 0)}
+        self.balls = [spawn_ball({}, self.rng, self.level, self.score)]
+        lag_steps = max(0, int(round(self.bot.tracking_lag / PHYSICS_STEP)))
+        if self.physics == "analytic":
+            # The paddle filters the bot's aim, which trails the ball by lag_steps. Along a straight
+            # path the filter settles to a fixed extra delay, and the per-step aim noise to a
+            # smaller spread, so only the paddle's position at the moment of arrival is drawn.
+            self._paddle_delay = lag_steps + int(round((1.0 - PADDLE_SMOOTHING) / PADDLE_SMOOTHING))
+            self._paddle_noise = self.bot.aim_noise * math.sqrt(PADDLE_SMOOTHING / (2.0 - PADDLE_SMOOTHING))
+            self._coordination_flight()
+            return
+        self._seen_x = deque([self.balls[0]["x"]] * (lag_steps + 1), maxlen=lag_steps + 1)
+        self._reschedule(PHYSICS_STEP * 1000.0, self._coordination_step)
+
+    def _coordination_flight(self):
+        play_left, _play_top, play_right, play_bottom = PLAY_BOUNDS
+        ball = self.balls[0]
+        steps, y = steps_to_paddle(ball["y"], ball["dy"], ball["r"])
+        x, dx = advance_x(ball["x"], ball["dx"], ball["r"], steps)
+        seen = steps - self._paddle_delay
+        seen_x = advance_x(ball["x"], ball["dx"], ball["r"], seen)[0] if seen > 0 else ball["x"]
+        aim = clamp(seen_x + self.rng.gauss(0.0, self._paddle_noise), play_left + 42, play_right - 42)
+        half_w = paddle_width(self.level, self.score) / 2
+        paddle_x = clamp(aim, play_left + half_w, play_right - half_w)
+        ball["x"], ball["y"], ball["dx"], ball["dy"] = x, y, dx, abs(ball["dy"])
+        self._reschedule(steps * PHYSICS_STEP * 1000.0, lambda: self._coordination_arrive(paddle_x))
+
+    def _coordination_arrive(self, paddle_x):
+        if not self.game_running:
+            return
+        ball = self.balls[0]
+        self.paddle["x"] = paddle_x
+        self.paddle["w"] = paddle_width(self.level, self.score)
+        if resolve_paddle(ball, self.paddle) != "hit":
+            fall = steps_until(PLAY_BOUNDS[3] + ball["r"] - ball["y"], ball["dy"])
+            self._reschedule(fall * PHYSICS_STEP * 1000.0, lambda: self.end_game_session("You missed the ball. Game over."))
+            return
+        self.trials += 1
+        self.add_point(1)
+        bounce_off_paddle(ball, self.paddle)
+        apply_speed_step(ball, self.score)
+        self._coordination_flight()
+
+    def _coordination_step(self):
+        if not self.game_running:
+            return
+        play_left, _play_top, play_right, _play_bottom = PLAY_BOUNDS
+        target = self.bot.aim(self._seen_x[0], self.rng)
+        self.paddle["mouse_x"] = clamp(target, play_left + 42, play_right - 42)
+        step_paddle(self.paddle, self.level, self.score)
+
+        for ball in self.balls:
+            step_ball(ball)
+            rebound = sweep_paddle(ball, self.paddle)
+            outcome = "hit" if rebound is not None else resolve_paddle(ball, self.paddle)
+            if outcome == "hit":
+                self.trials += 1
+                self.add_point(1)
+                if rebound is not None:
+                    ball["x"], ball["y"], ball["dx"], ball["dy"] = rebound
+                else:
+                    bounce_off_paddle(ball, self.paddle)
+                apply_speed_step(ball, self.score)
+            elif outcome == "missed":
+                self.end_game_session("You missed the ball. Game over.")
+                return
+        self._seen_x.append(self.balls[0]["x"])
+        self._reschedule(PHYSICS_STEP * 1000.0, self._coordination_step)
+
+    # Decision
+    def _start_decision(self):
+        self._decision_round()
+
+    def _decision_round(self):
+        if not self.game_running:
+            return
+        self.trials += 1
+        timeout_ms = self.game_speed()
+        rt_ms = self.bot.response_time(self.rng, 1) * 1000.0
+        if rt_ms < timeout_ms:
+            correct = not self.bot.makes_error(self.rng)
+            self._reschedule(rt_ms, lambda: self._decision_response(correct))
+        else:
+            self._reschedule(timeout_ms, self._decision_timeout)
+
+    def _decision_timeout(self):
+        if not self.game_running:
+            return
+        self.adapt(False)
+        self._decision_round()
+
+    def _decision_response(self, correct):
+        if not self.game_running:
+            return
+        self.adapt(correct)
+        if correct:
+            self.add_point(1)
+        self._decision_round()
+
+    # Reaction
+    def _start_reaction(self):
+        self._reaction_prepare()
+
+    def _reaction_prepare(self):
+        if not self.game_running:
+            return
+        wait_min, wait_max, _green = reaction_windows(self.game_speed())
+        self._reschedule(self.rng.randint(wait_min, wait_max), self._reaction_green)
+
+    def _reaction_green(self):
+        if not self.game_running:
+            return
+        self.trials += 1
+        _wait_min, _wait_max, green_window = reaction_windows(self.game_speed())
+        rt = self.bot.response_time(self.rng, 1)
+        if not self.bot.makes_error(self.rng) and rt * 1000.0 < green_window:
+            self._reschedule(rt * 1000.0, lambda: self._reaction_press(rt))
+        else:
+            self._reschedule(green_window, self._reaction_timeout)
+
+    def _reaction_timeout(self):
+        if not self.game_running:
+            return
+        self.adapt(False)
+        self._reaction_prepare()
+
+    def _reaction_press(self, reaction_time):
+        if not self.game_running:
+            return
+        self.adapt(True)
+        self.add_point(points_from_reaction(reaction_time))
+        self._reaction_prepare()
+
+    # Memory
+    def _start_memory(self):
+        self._memory_round()
+
+    def _memory_round(self):
+        if not self.game_running:
+            return
+        self.trials += 1
+        length = self.memory_length()
+        self.current_sequence = [self.rng.randint(1, 9) for _ in range(length)]
+        self._reschedule(memory_display_ms(self.game_speed()), self._memory_recall)
+
+    def _memory_recall(self):
+        if not self.game_running:
+            return
+        answer, recall_time = self.bot.recall(self.current_sequence, self.rng)
+        correct = answer == self.current_sequence
+        self._reschedule(recall_time * 1000.0, lambda: self._memory_answer(correct))
+
+    def _memory_answer(self, correct):
+        if not self.game_running:
+            return
+        self.adapt(correct)
+        if correct:
+            self.add_point(1)
+            self._memory_round()
+        else:
+            self._reschedule(600, self._memory_round)
+
+
+# Single-core rates for 120 s sessions, which vary with the machine: Memory 3000-5000/s, Attention
+# 1100-1700/s, Decision 700-1250/s, Reaction 600-1100/s, Coordination 16-25/s stepped (1500-2500/s
+# analytic). Decision and Reaction fall short of thousands because each session is ~300 trials of
+# game time and every trial is a few RNG draws and calls.
+def simulate_sessions(game, bot, sessions=1000, seed=0, duration=120.0, **session_kwargs):
+    results = []
+    for i in range(sessions):
+        session = HeadlessSession(game, bot, seed=seed + i, duration=duration, **session_kwargs)
+        results.append(session.run())
+    return results
+
+
+def difficulty_curve(results, levels=(2, 3)):
+    curve = {"sessions": len(results)}
+    if not results:
+        return curve
+    scores = sorted(r["score"] for r in results)
+    curve["median_score"] = scores[len(scores) // 2]
+    for level in levels:
+        times = sorted(r["level_up_times"][level] for r in results if level in r["level_up_times"])
+        curve[f"level_{level}_reached"] = len(times) / len(results)
+        curve[f"level_{level}_median_time"] = times[len(times) // 2] if times else None
+    return curve
+
+
+if __name__ == "__main__":
+    physics = "stepped"
+    if "--physics" in sys.argv[1:]:
+        physics = sys.argv[sys.argv.index("--physics") + 1]
+        if physics not in PHYSICS_MODES:
+            sys.exit(f"--physics must be one of: {', '.join(PHYSICS_MODES)}")
+    bot = BotPlayer()
+    for game in GAMES:
+        started = time.perf_counter()
+        results = simulate_sessions(game, bot, sessions=500, duration=120.0, physics=physics)
+        elapsed = time.perf_counter() - started
+        print(f"{game:<13} {len(results) / elapsed:8.0f} sessions/s  {difficulty_curve(results)}")
@@ -0,0 +1,300 @@
+import functools
+import itertools
+import sys
+import types
+from collections import Counter
+
+
+END = "end"
+
+# Every Tk call made against these stand-ins, by method name; benchmarks diff it around the code they measure.
+calls = Counter()
+
+
+def counted(method):
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        calls[name] += 1
+        return method(*args, **kwargs)
+
+    return wrapper
+
+
+class TclError(Exception):
+    pass
+
+
+class Event:
+    def __init__(self, keysym="", x=0, y=0, char="", widget=None):
+        self.keysym = keysym
+        self.x = x
+        self.y = y
+        self.char = char
+        self.widget = widget
+
+
+class Widget:
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = dict(options)
+        self.bindings = {}
+        self._funcids = itertools.count(1)
+
+    def __getattr__(self, name):
+        # grid/pack/focus_set/transient/...: layout and window-manager calls have nothing to do here.
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def call(*_args, **_kwargs):
+            calls[name] += 1
+
+        return call
+
+    @counted
+    def configure(self, **options):
+        self.options.update(options)
+
+    def config(self, **options):
+        return self.configure(**options)
+
+    def cget(self, key):
+        return self.options.get(key)
+
+    @counted
+    def bind(self, sequence, callback=None, add=None):
+        funcid = f"bind{next(self._funcids)}"
+        self.bindings.setdefault(sequence, []).append((funcid, callback))
+        return funcid
+
+    @counted
+    def unbind(self, sequence, funcid=None):
+        if funcid is None:
+            self.bindings.pop(sequence, None)
+        else:
+            self.bindings[sequence] = [b for b in self.bindings.get(sequence, []) if b[0] != funcid]
+
+    def fire(self, sequence, event=None):
+        event = event or Event(widget=self)
+        for _funcid, callback in list(self.bindings.get(sequence, [])):
+            callback(event)
+
+    @counted
+    def event_generate(self, sequence, when=None, **fields):
+        self.fire(sequence, Event(widget=self, **fields))
+
+    def winfo_rootx(self):
+        return 0
+
+    winfo_rooty = winfo_width = winfo_height = winfo_rootx
+
+
+def _noop(*_args, **_kwargs):
+    return None
+
+
+class Tk(Widget):
+    def __init__(self, **options):
+        super().__init__(None, **options)
+        self.jobs = {}
+        self._job_ids = itertools.count(1)
+
+    @counted
+    def after(self, delay_ms, callback=None, *args):
+        job = f"after#{next(self._job_ids)}"
+        self.jobs[job] = (delay_ms, callback, args)
+        return job
+
+    def run_jobs(self):
+        # Fire whatever is pending, as Tk's event loop would once the delays have passed.
+        jobs, self.jobs = self.jobs, {}
+        for _delay, callback, args in jobs.values():
+            callback(*args)
+
+    @counted
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+
+    @counted
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        raise exc
+
+
+class Toplevel(Tk):
+    pass
+
+
+class Canvas(Widget):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.items = {}
+        self.last_item_id = 0
+
+    def _create(self, kind, coords, options):
+        self.last_item_id += 1
+        item = self.last_item_id
+        if len(coords) == 1 and isinstance(coords[0], (tuple, list)):
+            coords = coords[0]
+        self.items[item] = [kind, list(coords), dict(options)]
+        return item
+
+    @counted
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    @counted
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+
+    @counted
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    @counted
+    def create_line(self, *coords, **options):
+        return self._create("line", coords, options)
+
+    @counted
+    def create_window(self, *coords, **options):
+        return self._create("window", coords, options)
+
+    @counted
+    def find_withtag(self, tag):
+        return self._find(tag)
+
+    def _find(self, tag):
+        if isinstance(tag, int):
+            return (tag,) if tag in self.items else ()
+        if tag == "all":
+            return tuple(self.items)
+        return tuple(item for item, (_kind, _coords, options) in self.items.items() if tag in _tags(options))
+
+    @counted
+    def coords(self, tag, *coords):
+        items = self._find(tag)
+        if not coords:
+            return list(self.items[items[0]][1]) if items else []
+        if len(coords) == 1 and isinstance(coords[0], (tuple, list)):
+            coords = coords[0]
+        for item in items:
+            self.items[item][1] = list(coords)
+
+    @counted
+    def itemconfigure(self, tag, **options):
+        for item in self._find(tag):
+            self.items[item][2].update(options)
+
+    def itemconfig(self, tag, **options):
+        return self.itemconfigure(tag, **options)
+
+    @counted
+    def itemcget(self, tag, option):
+        items = self._find(tag)
+        return self.items[items[0]][2].get(option) if items else None
+
+    @counted
+    def gettags(self, tag):
+        items = self._find(tag)
+        return _tags(self.items[items[0]][2]) if items else ()
+
+    @counted
+    def move(self, tag, dx, dy):
+        for item in self._find(tag):
+            coords = self.items[item][1]
+            self.items[item][1] = [c + (dx if i % 2 == 0 else dy) for i, c in enumerate(coords)]
+
+    @counted
+    def delete(self, *tags):
+        for tag in tags:
+            for item in self._find(tag):
+                del self.items[item]
+
+
+def _tags(options):
+    tags = options.get("tags") or ()
+    return (tags,) if isinstance(tags, str) else tuple(tags)
+
+
+class Variable:
+    def __init__(self, master=None, value="", name=None):
+        self.value = value
+        self.traces = []
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        for callback in list(self.traces):
+            callback("", "", "write")
+
+    def trace_add(self, mode, callback):
+        self.traces.append(callback)
+        return f"trace{len(self.traces)}"
+
+
+class Listbox(Widget):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.rows = []
+
+    @counted
+    def insert(self, index, *values):
+        position = len(self.rows) if index == END else int(index)
+        self.rows[position:position] = values
+
+    @counted
+    def delete(self, first, last=None):
+        first = int(first)
+        if last is None:
+            del self.rows[first:first + 1]
+        else:
+            del self.rows[first:len(self.rows) if last == END else int(last) + 1]
+
+    @counted
+    def curselection(self):
+        return ()
+
+
+class OptionMenu(Widget):
+    def __init__(self, master, variable, value, *values, **options):
+        super().__init__(master, **options)
+        self.variable = variable
+        self.values = (value,) + values
+
+
+def _module():
+    tk = types.ModuleType("tkinter")
+    tk.END = END
+    tk.TclError = TclError
+    tk.Event = Event
+    tk.Tk = Tk
+    tk.Toplevel = Toplevel
+    tk.Canvas = Canvas
+    tk.Listbox = Listbox
+    tk.OptionMenu = OptionMenu
+    tk.StringVar = tk.IntVar = tk.Variable = Variable
+    for name in ("Frame", "Button", "Label", "Entry", "Scrollbar"):
+        setattr(tk, name, type(name, (Widget,), {}))
+
+    messagebox = types.ModuleType("tkinter.messagebox")
+    messagebox.showinfo = messagebox.showwarning = messagebox.showerror = _noop
+    messagebox.askyesno = lambda *_args, **_kwargs: False
+    simpledialog = types.ModuleType("tkinter.simpledialog")
+    simpledialog.askstring = _noop
+    tk.messagebox = messagebox
+    tk.simpledialog = simpledialog
+    return tk
+
+
+def install():
+    # Must run before the game module is imported: it binds `tkinter` at import time.
+    tk = _module()
+    sys.modules["tkinter"] = tk
+    sys.modules["tkinter.messagebox"] = tk.messagebox
+    sys.modules["tkinter.simpledialog"] = tk.simpledialog
+    return tk
@@ -0,0 +1,229 @@
+import tkinter as tk
+
+
+class HistoryView:
+    COLUMNS = (
+        ("game", "Game Name"),
+        ("player", "Player Name"),
+        ("score", "Score"),
+        ("level", "Level")
+    )
+    ALL_GAMES = "All Games"
+
+    def __init__(
+        self,
+        canvas,
+        results,
+        games,
+        top_y=130,
+        row_h=30,
+        visible_rows=13,
+        x_cols=(70, 320, 580, 690, 790),
+        cache_rows=300
+    ):
+        self.canvas = canvas
+        self.results = results
+        self.games = games
+        self.top_y = top_y
+        self.row_h = row_h
+        self.visible_rows = visible_rows
+        self.x_cols = x_cols
+        self.cache_rows = cache_rows
+
+        self.sort_key = "ended_at"
+        self.descending = True
+        self.player_filter = ""
+        self.game_filter = None
+        self.offset = 0
+        self.total = 0
+
+        self._cache = []
+        self._cache_start = 0
+        self._shown = {}
+
+        self.header_ids = {}
+        self.rows = []
+        self._build()
+
+    def _build(self):
+        c = self.canvas
+        x_cols = self.x_cols
+        filter_y = self.top_y - 22
+
+        c.create_text(x_cols[0], filter_y, text="Player:", fill="white", anchor="w", font=("Helvetica", 11, "bold"))
+        self.player_var = tk.StringVar()
+        player_entry = tk.Entry(c, textvariable=self.player_var, width=20, font=("Helvetica", 11))
+        c.create_window(x_cols[0] + 62, filter_y, window=player_entry, anchor="w")
+        self.player_var.trace_add("write", lambda *_args: self._on_filter())
+
+        c.create_text(x_cols[2] - 150, filter_y, text="Game:", fill="white", anchor="w", font=("Helvetica", 11, "bold"))
+        self.game_var = tk.StringVar(value=self.ALL_GAMES)
+        game_menu = tk.OptionMenu(c, self.game_var, self.ALL_GAMES, *self.games, command=lambda _v: self._on_filter())
+        game_menu.configure(width=12, bg="#e9efe9", highlightthickness=0)
+        c.create_window(x_cols[2] - 100, filter_y, window=game_menu, anchor="w")
+
+        self.count_id = c.create_text(x_cols[-1], filter_y, text="", fill="#d7f0d7", anchor="e", font=("Helvetica", 10))
+
+        c.create_rectangle(x_cols[0], self.top_y, x_cols[-1], self.top_y + self.row_h, fill="#0f2f22", outline="white")
+        for idx, (key, label) in enumerate(self.COLUMNS):
+            cx = (x_cols[idx] + x_cols[idx + 1]) // 2
+            tag = f"sort_{key}"
+            self.header_ids[key] = c.create_text(
+                cx, self.top_y + self.row_h // 2, text=label, fill="yellow",
+                font=("Helvetica", 12, "bold"), tags=("history_header", tag)
+            )
+            c.tag_bind(tag, "<Button-1>", lambda _e, k=key: self.sort_by(k))
+
+        for i in range(self.visible_rows):
+            y1 = self.top_y + (i + 1) * self.row_h
+            rect = c.create_rectangle(x_cols[0], y1, x_cols[-1], y1 + self.row_h, fill="#1d5c45", outline="white")
+            texts = []
+            for col in range(len(self.COLUMNS)):
+                cx = (x_cols[col] + x_cols[col + 1]) // 2
+                texts.append(c.create_text(cx, y1 + self.row_h // 2, text="", fill="white", font=("Helvetica", 11)))
+            self.rows.append((rect, texts))
+
+        body_top = self.top_y + self.row_h
+        body_h = self.visible_rows * self.row_h
+        self.scrollbar = tk.Scrollbar(c, orient="vertical", command=self.yview)
+        c.create_window(x_cols[-1] + 3, body_top, window=self.scrollbar, anchor="nw", height=body_h)
+
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            c.bind(seq, self._on_wheel)
+        c.bind("<Up>", lambda _e: self.scroll(-1))
+        c.bind("<Down>", lambda _e: self.scroll(1))
+        c.bind("<Prior>", lambda _e: self.scroll(-self.visible_rows))
+        c.bind("<Next>", lambda _e: self.scroll(self.visible_rows))
+        c.bind("<Button-1>", lambda _e: c.focus_set(), add="+")
+
+        self._update_headers()
+
+    # --------------------------
+    # Data
+    # --------------------------
+    def _query_filters(self):
+        return {"player_prefix": self.player_filter or None, "game": self.game_filter}
+
+    def refresh(self):
+        self.total = self.results.count(**self._query_filters())
+        self._cache = []
+        self._cache_start = 0
+        self.offset = max(0, min(self.offset, self.total - self.visible_rows))
+        self.render()
+
+    def _page_position(self, start):
+        # Page from the nearest cached row (keyset) when that skips fewer rows than an offset
+        # from the top, so scrolling deep into a long history stays as cheap as near the top.
+        position = {"offset": start, "limit": self.cache_rows}
+        cache, cache_start = self._cache, self._cache_start
+        if not cache:
+            return position
+        cache_end = cache_start + len(cache)
+        end = start + self.cache_rows
+        if start > cache_start:
+            anchor = min(start, cache_end) - 1
+            skip = start - anchor - 1
+            if skip < start:
+                position.update(offset=skip, after=cache[anchor - cache_start])
+        elif end < cache_end:
+            anchor = max(end, cache_start)
+            skip = anchor - end
+            if skip < start:
+                position.update(offset=skip, before=cache[anchor - cache_start])
+        return position
+
+    def _window(self):
+        end = self.offset + self.visible_rows
+        cache_end = self._cache_start + len(self._cache)
+        if self.offset < self._cache_start or end > cache_end:
+            # Fetch a block around the viewport so most scroll steps are served from memory.
+            start = max(0, self.offset - (self.cache_rows - self.visible_rows) // 2)
+            self._cache = self.results.page(
+                order_by=self.sort_key,
+                descending=self.descending,
+                **self._page_position(start),
+                **self._query_filters()
+            )
+            self._cache_start = start
+        i = self.offset - self._cache_start
+        return self._cache[i:i + self.visible_rows]
+
+    # --------------------------
+    # Rendering
+    # --------------------------
+    def _set(self, item, **options):
+        if self._shown.get(item) != options:
+            self._shown[item] = options
+            self.canvas.itemconfigure(item, **options)
+
+    def render(self):
+        records = self._window()
+        for i, (rect, texts) in enumerate(self.rows):
+            if i < len(records):
+                rec = records[i]
+                vals = (rec["game"], rec["player"], str(rec["score"]), str(rec["level"]))
+                self._set(rect, state="normal")
+                for item, val in zip(texts, vals):
+                    self._set(item, text=val, state="normal")
+            else:
+                self._set(rect, state="hidden")
+                for item in texts:
+                    self._set(item, state="hidden")
+
+        self._set(self.count_id, text=f"{self.total} sessions")
+        if self.total:
+            first = self.offset / self.total
+            last = min(1.0, (self.offset + self.visible_rows) / self.total)
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
+
+    def _update_headers(self):
+        for key, label in self.COLUMNS:
+            if key == self.sort_key:
+                label = f"{label} {'▼' if self.descending else '▲'}"
+            self._set(self.header_ids[key], text=label)
+
+    # --------------------------
+    # Interaction
+    # --------------------------
+    def scroll_to(self, offset):
+        offset = max(0, min(int(offset), self.total - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def scroll(self, rows):
+        self.scroll_to(self.offset + rows)
+
+    def yview(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * self.total)
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.scroll(int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll(-3)
+        else:
+            self.scroll(3)
+
+    def sort_by(self, key):
+        if key == self.sort_key:
+            self.descending = not self.descending
+        else:
+            self.sort_key = key
+            self.descending = key in ("score", "level", "ended_at")
+        self.offset = 0
+        self._update_headers()
+        self.refresh()
+
+    def _on_filter(self):
+        self.player_filter = self.player_var.get().strip()
+        game = self.game_var.get()
+        self.game_filter = None if game == self.ALL_GAMES else game
+        self.offset = 0
+        self.refresh()
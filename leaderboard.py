@@ -0,0 +1,80 @@
+import bisect
+import time
+
+
+class TopK:
+    def __init__(self, k=10, better="higher"):
+        self.k = k
+        self.sign = -1 if better == "higher" else 1
+        self.entries = []
+        self.player_best = {}
+
+    def _key(self, entry):
+        return (self.sign * entry["score"], entry["ended_at"], entry["player"])
+
+    def offer(self, entry):
+        player = entry["player"]
+        key = self._key(entry)
+        best = self.player_best.get(player)
+        if best is not None and self._key(best) <= key:
+            return False
+        self.player_best[player] = entry
+
+        if len(self.entries) >= self.k and key >= self.entries[-1][0]:
+            return False
+        if best is not None:
+            # Scores only ever improve, so an evicted player can't still be listed.
+            old_key = self._key(best)
+            idx = bisect.bisect_left(self.entries, (old_key,))
+            if idx < len(self.entries) and self.entries[idx][0] == old_key:
+                del self.entries[idx]
+        bisect.insort(self.entries, (key, entry))
+        if len(self.entries) > self.k:
+            self.entries.pop()
+        return True
+
+    def top(self, n=None):
+        n = self.k if n is None else min(n, self.k)
+        return [entry for _key, entry in self.entries[:n]]
+
+
+class Leaderboard:
+    def __init__(self, k=10, better="higher"):
+        self.k = k
+        self.better = better
+        self.boards = {}
+
+    def _board(self, game, level):
+        board = self.boards.get((game, level))
+        if board is None:
+            board = self.boards[(game, level)] = TopK(self.k, self.better)
+        return board
+
+    def add(self, player, game, level, score, ended_at=None):
+        entry = {
+            "player": player,
+            "game": game,
+            "level": level,
+            "score": score,
+            "ended_at": time.time() if ended_at is None else ended_at
+        }
+        changed = self._board(game, level).offer(entry)
+        changed = self._board(game, None).offer(entry) or changed
+        return changed
+
+    def top(self, game, level=None, n=None):
+        board = self.boards.get((game, level))
+        return board.top(n) if board is not None else []
+
+    def best(self, player, game, level=None):
+        board = self.boards.get((game, level))
+        if board is None:
+            return None
+        return board.player_best.get(player)
+
+    @classmethod
+    def from_records(cls, records, k=10, better="higher"):
+        board = cls(k, better)
+        for rec in records:
+            board.add(rec["player"], rec["game"], rec["level"], rec["score"], rec["ended_at"])
+        return board
@@ -0,0 +1,49 @@
+class CanvasBatch:
+    # Collects one frame's canvas updates and, on flush, sends only what differs from what Tk
+    # already shows. Coordinates are rounded to whole pixels first, so sub-pixel motion that
+    # would not move anything on screen costs no Tk call either.
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.shown_coords = {}
+        self.shown_options = {}
+        self.pending_coords = {}
+        self.pending_options = {}
+        self.sent = 0
+        self.skipped = 0
+
+    def coords(self, item, *coords):
+        self.pending_coords[item] = tuple(int(round(c)) for c in coords)
+
+    def itemconfigure(self, item, **options):
+        self.pending_options.setdefault(item, {}).update(options)
+
+    def forget(self, item):
+        for table in (self.shown_coords, self.shown_options, self.pending_coords, self.pending_options):
+            table.pop(item, None)
+
+    def delete(self, item):
+        self.forget(item)
+        self.canvas.delete(item)
+
+    def flush(self):
+        canvas = self.canvas
+        shown_coords = self.shown_coords
+        for item, coords in self.pending_coords.items():
+            if shown_coords.get(item) == coords:
+                self.skipped += 1
+                continue
+            canvas.coords(item, *coords)
+            shown_coords[item] = coords
+            self.sent += 1
+        self.pending_coords.clear()
+
+        for item, options in self.pending_options.items():
+            shown = self.shown_options.setdefault(item, {})
+            changed = {key: value for key, value in options.items() if shown.get(key) != value}
+            if not changed:
+                self.skipped += 1
+                continue
+            canvas.itemconfigure(item, **changed)
+            shown.update(changed)
+            self.sent += 1
+        self.pending_options.clear()
@@ -0,0 +1,324 @@
+import argparse
+import glob
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+
+import headless
+from results_store import default_data_dir
+
+
+MAGIC = b"FPSREC01"
+VERSION = 1
+SIZES = struct.Struct("<III")
+# kind, sequence id, keysym id, timer index, x, y, clock reads taken before this entry
+ENTRY = struct.Struct("<BHHIiiI")
+ENTRY_TIMER = 1
+ENTRY_INPUT = 2
+SETTINGS = (
+    "base_speed",
+    "physics_step",
+    "target_fps",
+    "max_physics_steps_per_frame",
+    "level_2_unlock_score",
+    "level_3_unlock_score",
+    "difficulty",
+    "coordination_balls",
+    "multiball_seconds"
+)
+
+
+class ReplayDiverged(Exception):
+    pass
+
+
+def default_recordings_dir():
+    path = os.path.join(default_data_dir(), "recordings")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class Recording:
+    def __init__(self, header, entries, reads):
+        self.header = header
+        self.entries = entries
+        self.reads = reads
+
+    @property
+    def score_trace(self):
+        return [tuple(point) for point in self.header["score_trace"]]
+
+    def iter_entries(self):
+        return ENTRY.iter_unpack(self.entries)
+
+    def duration(self):
+        return self.reads[-1] - self.reads[0] if len(self.reads) > 1 else 0.0
+
+    def to_bytes(self):
+        header = json.dumps(self.header, separators=(",", ":")).encode("utf-8")
+        reads = self.reads.tobytes()
+        body = SIZES.pack(len(header), len(self.entries), len(reads)) + header + bytes(self.entries) + reads
+        return MAGIC + zlib.compress(body, 6)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a session recording")
+        body = zlib.decompress(data[len(MAGIC):])
+        header_len, entries_len, reads_len = SIZES.unpack_from(body)
+        offset = SIZES.size
+        header = json.loads(body[offset:offset + header_len])
+        missing = [name for name in SETTINGS if name not in header.get("settings", {})]
+        if missing:
+            raise ValueError(f"recording has no {', '.join(missing)} setting")
+        offset += header_len
+        entries = body[offset:offset + entries_len]
+        offset += entries_len
+        reads = array("d")
+        reads.frombytes(body[offset:offset + reads_len])
+        return cls(header, entries, reads)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as fh:
+            return cls.from_bytes(fh.read())
+
+
+class InputRecorder:
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.entries = bytearray()
+        self.reads = array("d")
+        self.names = {}
+        self.timers = 0
+        self.score_trace = []
+        self.closed = False
+
+    def _name(self, text):
+        return self.names.setdefault(text, len(self.names))
+
+    def now(self):
+        value = self.clock()
+        if not self.closed:
+            self.reads.append(value)
+        return value
+
+    def timer(self, callback):
+        index = self.timers
+        self.timers += 1
+
+        def fire():
+            if not self.closed:
+                self.entries += ENTRY.pack(ENTRY_TIMER, 0, 0, index, 0, 0, len(self.reads))
+                self.now()
+            callback()
+
+        return fire
+
+    def input(self, sequence, callback):
+        sequence_id = self._name(sequence)
+
+        def dispatch(event):
+            if not self.closed:
+                self.entries += ENTRY.pack(
+                    ENTRY_INPUT, sequence_id, self._name(getattr(event, "keysym", "") or ""), 0,
+                    int(getattr(event, "x", 0) or 0), int(getattr(event, "y", 0) or 0), len(self.reads)
+                )
+                self.now()
+            return callback(event)
+
+        return dispatch
+
+    def score(self, score, level):
+        if not self.closed:
+            self.score_trace.append((len(self.reads), score, level))
+
+    def finish(self, session, settings):
+        self.closed = True
+        header = {
+            "version": VERSION,
+            "player": session.current_player,
+            "game": session.current_game,
+            "seed": session.seed,
+            "session_key": session.session_key,
+            "started_at": session.session_started_at,
+            "settings": settings,
+            "names": sorted(self.names, key=self.names.get),
+            "score_trace": self.score_trace,
+            "final_score": session.total_score
+        }
+        return Recording(header, bytes(self.entries), self.reads)
+
+
+class ReplayFeed:
+    def __init__(self, recording):
+        self.reads = recording.reads
+        self.position = 0
+        self.timers = {}
+        self.next_timer = 0
+        self.inputs = {}
+        self.score_trace = []
+        self.closed = False
+
+    def now(self):
+        if self.closed:
+            return self.reads[self.position - 1] if self.position else 0.0
+        if self.position >= len(self.reads):
+            raise ReplayDiverged(f"asked for clock reading {self.position} of {len(self.reads)}")
+        value = self.reads[self.position]
+        self.position += 1
+        return value
+
+    def timer(self, callback):
+        index = self.next_timer
+        self.next_timer += 1
+
+        def fire():
+            self.now()
+            callback()
+
+        self.timers[index] = fire
+        return fire
+
+    def input(self, sequence, callback):
+        def dispatch(event):
+            self.now()
+            return callback(event)
+
+        self.inputs[sequence] = dispatch
+        return dispatch
+
+    def score(self, score, level):
+        if not self.closed:
+            self.score_trace.append((self.position, score, level))
+
+    def finish(self, session, settings):
+        # Mirrors InputRecorder.finish: whatever runs after the session ended was never recorded.
+        self.closed = True
+        return None
+
+
+_replay_app = None
+
+
+def replay_app():
+    global _replay_app
+    if _replay_app is None:
+        # Replays must never touch the station's own results, trial log, recordings or aggregator.
+        os.environ["FPSCI_DATA_DIR"] = tempfile.mkdtemp(prefix="fpsci-replay-")
+        os.environ.pop("FPSCI_AGGREGATOR", None)
+        tk = headless.install()
+        import TennisCognitiveGame as game
+        from session import PlayerSession
+
+        class ReplayApp(game.TennisCognitiveApp):
+            recording = None
+            feed = None
+
+            def ask_player_name(self, game_name, on_name):
+                on_name(self.recording.header["player"])
+
+            def new_session(self, player, game_name):
+                header = self.recording.header
+                return PlayerSession(
+                    self.canvas, player, game_name, header["session_key"], header["started_at"],
+                    seed=header["seed"], recorder=self.feed
+                )
+
+            def input_latency_correction(self):
+                return self.recording.header["settings"]["input_latency_correction"]
+
+            def start_coordination(self, balls=1):
+                super().start_coordination(self.coordination_balls)
+
+        root = tk.Tk()
+        _replay_app = ReplayApp(root)
+        _replay_app.record_inputs = False
+    return _replay_app
+
+
+def replay(recording):
+    app = replay_app()
+    header = recording.header
+    feed = ReplayFeed(recording)
+    app.recording, app.feed = recording, feed
+    for name in SETTINGS:
+        setattr(app, name, header["settings"][name])
+
+    started = time.perf_counter()
+    getattr(app, "start_" + header["game"].lower())()
+    names = header["names"]
+    entries = 0
+    for kind, sequence_id, keysym_id, index, x, y, reads_before in recording.iter_entries():
+        if not app.session.game_running:
+            raise ReplayDiverged(f"session ended after {entries} of the recorded entries")
+        if feed.position != reads_before:
+            raise ReplayDiverged(f"entry {entries}: clock reading {feed.position}, recorded {reads_before}")
+        if kind == ENTRY_TIMER:
+            fire = feed.timers.pop(index, None)
+            if fire is None:
+                raise ReplayDiverged(f"entry {entries}: timer {index} was never scheduled")
+            fire()
+        else:
+            dispatch = feed.inputs.get(names[sequence_id])
+            if dispatch is None:
+                raise ReplayDiverged(f"entry {entries}: nothing bound to {names[sequence_id]}")
+            dispatch(headless.Event(keysym=names[keysym_id], x=x, y=y))
+        entries += 1
+    if app.session.game_running and feed.position != len(recording.reads):
+        raise ReplayDiverged(f"used {feed.position} of {len(recording.reads)} clock readings")
+    final_score = app.session.total_score
+    app.exit_current_game()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "game": header["game"],
+        "player": header["player"],
+        "entries": entries,
+        "final_score": final_score,
+        "matches": feed.score_trace == recording.score_trace and final_score == header["final_score"],
+        "recorded_s": recording.duration(),
+        "replay_s": elapsed,
+        "speedup": recording.duration() / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-run recorded sessions headless and check their score traces.")
+    parser.add_argument("paths", nargs="*", help="recordings or directories of them (default: the recordings folder)")
+    parser.add_argument("--json", action="store_true", help="print one JSON result per recording")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for path in args.paths or [default_recordings_dir()]:
+        paths.extend(sorted(glob.glob(os.path.join(path, "*.fprec"))) if os.path.isdir(path) else [path])
+    recordings = [(path, Recording.load(path)) for path in paths]
+
+    failures = 0
+    for path, recording in recordings:
+        try:
+            result = replay(recording)
+        except ReplayDiverged as exc:
+            result = {"game": recording.header["game"], "matches": False, "error": str(exc)}
+        result["path"] = path
+        failures += not result["matches"]
+        if args.json:
+            print(json.dumps(result, sort_keys=True))
+        elif "error" in result:
+            print(f"DIVERGED {path}: {result['error']}")
+        else:
+            print(
+                f"{'ok      ' if result['matches'] else 'MISMATCH'} {os.path.basename(path)}  {result['game']:<12}"
+                f" score {result['final_score']:>4}  {result['recorded_s']:8.1f}s in {result['replay_s'] * 1000:8.1f} ms"
+                f"  ({result['speedup']:.0f}x)"
+            )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
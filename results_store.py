@@ -0,0 +1,212 @@
+import os
+import sqlite3
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    game TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    started_at REAL,
+    ended_at REAL NOT NULL,
+    session_key INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_ended ON sessions (ended_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_player ON sessions (player, ended_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_player_game ON sessions (player, game, ended_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_game ON sessions (game, ended_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_game_level ON sessions (game, level, ended_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_score ON sessions (score, ended_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_level ON sessions (level, ended_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_game_player ON sessions (game, player, ended_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_game_score ON sessions (game, score, ended_at);
+"""
+INSERT_SESSION = (
+    "INSERT INTO sessions (player, game, level, score, started_at, ended_at, session_key) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+SORT_COLUMNS = ("ended_at", "player", "game", "level", "score")
+
+
+def default_data_dir():
+    path = os.environ.get("FPSCI_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".fpsci")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def default_results_path():
+    return os.path.join(default_data_dir(), "results.sqlite3")
+
+
+def session_rows(records):
+    return [
+        (
+            r["player"], r["game"], r["level"], r["score"], r.get("started_at"),
+            time.time() if r.get("ended_at") is None else r["ended_at"],
+            r.get("session_key")
+        )
+        for r in records
+    ]
+
+
+class ResultsStore:
+    def __init__(self, path=None):
+        self.path = path or default_results_path()
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(sessions)")}
+        if "session_key" not in columns:
+            self.conn.execute("ALTER TABLE sessions ADD COLUMN session_key INTEGER")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_key ON sessions (session_key)")
+        self.conn.commit()
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def add_session(self, player, game, level, score, started_at=None, ended_at=None, session_key=None):
+        ended_at = time.time() if ended_at is None else ended_at
+        with self.conn:
+            cur = self.conn.execute(
+                INSERT_SESSION,
+                (player, game, level, score, started_at, ended_at, session_key)
+            )
+        return cur.lastrowid
+
+    def add_sessions(self, records):
+        rows = session_rows(records)
+        with self.conn:
+            self.conn.executemany(INSERT_SESSION, rows)
+        return len(rows)
+
+    def has_session(self, session_key):
+        return self.conn.execute(
+            "SELECT 1 FROM sessions WHERE session_key = ? LIMIT 1", (session_key,)
+        ).fetchone() is not None
+
+    def checkpoint(self):
+        if self.path != ":memory:":
+            self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def _query(self, sql, params=()):
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def _filters(self, player=None, game=None, player_prefix=None):
+        clauses, params = [], []
+        if player is not None:
+            clauses.append("player = ?")
+            params.append(player)
+        if player_prefix:
+            # Range form of a prefix match so SQLite can use the player index.
+            clauses.append("player >= ? AND player < ?")
+            params.extend((player_prefix, player_prefix + "\uffff"))
+        if game is not None:
+            clauses.append("game = ?")
+            params.append(game)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def count(self, player=None, game=None, player_prefix=None):
+        where, params = self._filters(player, game, player_prefix)
+        return self.conn.execute("SELECT COUNT(*) FROM sessions" + where, params).fetchone()[0]
+
+    def page(self, offset, limit, order_by="ended_at", descending=True, player_prefix=None, game=None, after=None, before=None):
+        # Rows in sort order starting `offset` rows past the top, or past the row `after` (keyset),
+        # or the `limit` rows ending `offset` rows ahead of the row `before`. Ties break on
+        # ended_at then id so every order matches a (column, ended_at) index.
+        if order_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort sessions by {order_by!r}")
+        keys = (order_by, "id") if order_by == "ended_at" else (order_by, "ended_at", "id")
+        backward = before is not None
+        anchor = before if backward else after
+        where, params = self._filters(game=game, player_prefix=player_prefix)
+        if anchor is not None:
+            # Row-value comparison: strictly past the anchor in the direction being read.
+            past = ">" if descending == backward else "<"
+            placeholders = ", ".join("?" * len(keys))
+            where += (" AND " if where else " WHERE ") + f"({', '.join(keys)}) {past} ({placeholders})"
+            params.extend(anchor[key] for key in keys)
+        direction = "DESC" if descending != backward else "ASC"
+        order = ", ".join(f"{key} {direction}" for key in keys)
+        params.extend((limit, offset))
+        # Skip rows through the covering index, then read whole rows for just the page.
+        rows = self._query(
+            f"SELECT * FROM sessions WHERE id IN (SELECT id FROM sessions{where} ORDER BY {order} LIMIT ? OFFSET ?) "
+            f"ORDER BY {order}",
+            params
+        )
+        if backward:
+            rows.reverse()
+        return rows
+
+    def recent(self, limit=12, before=None):
+        if before is None:
+            return self._query("SELECT * FROM sessions ORDER BY ended_at DESC, id DESC LIMIT ?", (limit,))
+        return self._query(
+            "SELECT * FROM sessions WHERE ended_at < ? ORDER BY ended_at DESC, id DESC LIMIT ?",
+            (before, limit)
+        )
+
+    def players(self):
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT player FROM sessions ORDER BY player")]
+
+    def player_history(self, player, limit=100, game=None):
+        if game is None:
+            return self._query(
+                "SELECT * FROM sessions WHERE player = ? ORDER BY ended_at DESC, id DESC LIMIT ?",
+                (player, limit)
+            )
+        return self._query(
+            "SELECT * FROM sessions WHERE player = ? AND game = ? ORDER BY ended_at DESC, id DESC LIMIT ?",
+            (player, game, limit)
+        )
+
+    def game_range(self, game, start=None, end=None, level=None, limit=1000):
+        clauses, params = ["game = ?"], [game]
+        if level is not None:
+            clauses.append("level = ?")
+            params.append(level)
+        if start is not None:
+            clauses.append("ended_at >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("ended_at < ?")
+            params.append(end)
+        params.append(limit)
+        return self._query(
+            "SELECT * FROM sessions WHERE " + " AND ".join(clauses) + " ORDER BY ended_at DESC, id DESC LIMIT ?",
+            params
+        )
+
+    def iter_sessions(self, after_id=0, chunk_size=5000):
+        while True:
+            rows = self.conn.execute(
+                "SELECT * FROM sessions WHERE id > ? ORDER BY id LIMIT ?", (after_id, chunk_size)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            after_id = rows[-1]["id"]
+
+
+def session_writer(path):
+    state = {}
+
+    # SQLite connections are bound to their thread, so the writer opens its own on first use.
+    def write(records, sync=False):
+        store = state.get("store")
+        if store is None:
+            store = state["store"] = ResultsStore(path)
+        store.add_sessions(records)
+        if sync:
+            store.checkpoint()
+
+    return write
@@ -0,0 +1,45 @@
+import bisect
+
+
+class PlayerRoster:
+    def __init__(self, names=()):
+        # Parallel sorted lists: casefolded keys for bisect, display names for the UI.
+        pairs = {}
+        for name in names:
+            pairs.setdefault(name.casefold(), name)
+        self.keys = sorted(pairs)
+        self.names = [pairs[key] for key in self.keys]
+
+    @classmethod
+    def from_store(cls, store):
+        return cls(store.players())
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, name):
+        return self.canonical(name) is not None
+
+    def canonical(self, name):
+        key = name.casefold()
+        idx = bisect.bisect_left(self.keys, key)
+        if idx < len(self.keys) and self.keys[idx] == key:
+            return self.names[idx]
+        return None
+
+    def add(self, name):
+        key = name.casefold()
+        idx = bisect.bisect_left(self.keys, key)
+        if idx < len(self.keys) and self.keys[idx] == key:
+            return self.names[idx]
+        self.keys.insert(idx, key)
+        self.names.insert(idx, name)
+        return name
+
+    def complete(self, prefix, limit=8):
+        key = prefix.casefold()
+        if not key:
+            return []
+        lo = bisect.bisect_left(self.keys, key)
+        hi = min(bisect.bisect_left(self.keys, key + "\U0010ffff", lo), lo + limit)
+        return self.names[lo:hi]
@@ -0,0 +1,131 @@
+import heapq
+import math
+import sys
+import time
+
+
+# Precise jobs arm Tk's timer early by the lateness it has been showing, then poll the clock for
+# the last stretch. The lead is capped so a bad spell of lateness cannot stall the loop for long.
+LATENESS_SMOOTHING = 0.1
+LATENESS_SPREAD = 2.0
+MAX_LEAD = 0.008
+
+
+class SharedScheduler:
+    def __init__(self, root, clock=time.perf_counter):
+        self.root = root
+        self.clock = clock
+        self._queue = []
+        self._seq = 0
+        self._cancelled = set()
+        self._owners = {}
+        self._timer = None
+        self._timer_due = None
+        self._timer_fires = None
+        # Running estimate of how late Tk fires our timer, and of how much that varies.
+        self.lateness = 0.0
+        self.lateness_spread = 0.0
+        # Off where the clock is simulated: polling a clock that only moves between jobs never ends.
+        self.precise = True
+        # Optional observer(owner, lateness_seconds), called as each job fires.
+        self.observer = None
+
+    def after(self, delay_ms, callback, owner=None, onset=None):
+        # With onset=callable(planned, actual) the job is precise: it fires within about a
+        # millisecond of its due time, and onset is told when it was due and when it ran.
+        self._seq += 1
+        due = self.clock() + max(0, delay_ms) / 1000.0
+        arm_at = due - self.lead() if onset is not None else due
+        heapq.heappush(self._queue, (arm_at, self._seq, due, callback, owner, onset))
+        self._owners[self._seq] = owner
+        self._arm()
+        return self._seq
+
+    def cancel(self, job):
+        if job in self._owners:
+            del self._owners[job]
+            self._cancelled.add(job)
+
+    def cancel_owner(self, owner):
+        for job in [job for job, job_owner in self._owners.items() if job_owner is owner]:
+            self.cancel(job)
+
+    def pending(self, owner=None):
+        if owner is None:
+            return len(self._owners)
+        return sum(1 for job_owner in self._owners.values() if job_owner is owner)
+
+    def lead(self):
+        if not self.precise:
+            return 0.0
+        return min(MAX_LEAD, max(0.0, self.lateness + LATENESS_SPREAD * self.lateness_spread))
+
+    def _observe_timer(self, now):
+        if self._timer_fires is None:
+            return
+        late = max(0.0, now - self._timer_fires)
+        self.lateness_spread += LATENESS_SMOOTHING * (abs(late - self.lateness) - self.lateness_spread)
+        self.lateness += LATENESS_SMOOTHING * (late - self.lateness)
+
+    def _wait_until(self, due):
+        # Tk timers only resolve whole milliseconds; poll out the remainder.
+        if not self.precise:
+            return
+        deadline = min(due, self.clock() + MAX_LEAD)
+        while self.clock() < deadline:
+            pass
+
+    def _arm(self):
+        due = self.next_due()
+        if due is None:
+            return
+        if self._timer is not None and self._timer_due <= due:
+            return
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+        delay_ms = max(0, int(math.ceil((due - self.clock()) * 1000.0)))
+        self._timer = self.root.after(delay_ms, self._run)
+        self._timer_due = due
+        self._timer_fires = self.clock() + delay_ms / 1000.0
+
+    def next_due(self):
+        while self._queue and self._queue[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._queue)[1])
+        return self._queue[0][0] if self._queue else None
+
+    def _take(self, ready, until):
+        while self._queue and self._queue[0][0] <= until:
+            _arm_at, job, due, callback, owner, onset = heapq.heappop(self._queue)
+            heapq.heappush(ready, (due, job, callback, owner, onset))
+
+    def _run(self):
+        self._timer = None
+        self._timer_due = None
+        now = self.clock()
+        self._observe_timer(now)
+        self._timer_fires = None
+        # Precise jobs come off the heap before they are due. Whatever falls due ahead of the
+        # next ready job is taken with it, so nothing waits behind a spin and all run in due order.
+        ready = []
+        self._take(ready, now)
+        while ready:
+            self._take(ready, ready[0][0])
+            due, job, callback, owner, onset = heapq.heappop(ready)
+            if job in self._cancelled:
+                self._cancelled.discard(job)
+                continue
+            del self._owners[job]
+            if due > now:
+                self._wait_until(due)
+                now = self.clock()
+                self._take(ready, now)
+            started = self.clock()
+            if self.observer is not None:
+                self.observer(owner, started - due)
+            try:
+                callback()
+                if onset is not None:
+                    onset(due, started)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+        self._arm()
@@ -0,0 +1,68 @@
+import random
+import time
+
+
+class PlayerSession:
+    __slots__ = (
+        "canvas",
+        "current_player",
+        "current_game",
+        "level",
+        "score",
+        "total_score",
+        "game_running",
+        "session_key",
+        "session_started_at",
+        "trial_index",
+        "bindings",
+        "seed",
+        "rng",
+        "recorder",
+        "difficulty",
+        "telemetry"
+    )
+
+    def __init__(self, canvas, player=None, game=None, session_key=None, started_at=None, seed=None, recorder=None):
+        self.canvas = canvas
+        self.current_player = player
+        self.current_game = game
+        self.level = 1
+        self.score = 0
+        self.total_score = 0
+        self.game_running = False
+        self.session_key = session_key
+        self.session_started_at = started_at
+        self.trial_index = 0
+        self.bindings = []
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.recorder = recorder
+        self.difficulty = None
+        self.telemetry = None
+
+    # Game code reads time and schedules timers through the session so a recorder can capture
+    # (or a replay feed can supply) every source of nondeterminism.
+    def now(self):
+        if self.recorder is None:
+            return time.perf_counter()
+        return self.recorder.now()
+
+    def timer(self, callback):
+        if self.recorder is None:
+            return callback
+        return self.recorder.timer(callback)
+
+    def bind(self, widget, sequence, callback):
+        if self.recorder is not None:
+            callback = self.recorder.input(sequence, callback)
+        funcid = widget.bind(sequence, callback)
+        self.bindings.append((widget, sequence, funcid))
+        return funcid
+
+    def unbind_all(self):
+        for widget, seq, funcid in self.bindings:
+            try:
+                widget.unbind(seq, funcid=funcid)
+            except Exception:
+                pass
+        self.bindings.clear()
@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+
+
+def _linux_start_time(pid):
+    with open(f"/proc/{pid}/stat", "r", encoding="ascii") as fh:
+        fields = fh.read().rsplit(")", 1)[1].split()
+    with open("/proc/uptime", "r", encoding="ascii") as fh:
+        uptime = float(fh.read().split()[0])
+    started_after_boot = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    return time.time() - uptime + started_after_boot
+
+
+def _windows_start_time(pid):
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+    if not handle:
+        return None
+    try:
+        times = [wintypes.FILETIME() for _ in range(4)]
+        if not kernel32.GetProcessTimes(handle, *[ctypes.byref(t) for t in times]):
+            return None
+        created = (times[0].dwHighDateTime << 32) | times[0].dwLowDateTime
+        return created / 1e7 - 11644473600.0
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def process_start_time(pid=None):
+    pid = os.getpid() if pid is None else pid
+    try:
+        if sys.platform.startswith("linux"):
+            return _linux_start_time(pid)
+        if sys.platform == "win32":
+            return _windows_start_time(pid)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    return None
+
+
+class StartupTimer:
+    def __init__(self):
+        self.wall_origin = time.time()
+        self.origin = time.perf_counter()
+        self.marks = []
+
+        self.process_origin = self.origin
+        started = process_start_time()
+        if started is not None:
+            self.process_origin = self._to_perf(started)
+            self.marks.append(("python process start", self.process_origin))
+        if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
+            # A onefile build runs in a child of the bootloader that unpacked it; count from the parent.
+            parent_started = process_start_time(os.getppid())
+            if parent_started is not None:
+                self.process_origin = self._to_perf(parent_started)
+                self.marks.append(("bootloader start", self.process_origin))
+        self.mark("script start")
+
+    def _to_perf(self, wall_time):
+        return self.origin - (self.wall_origin - wall_time)
+
+    def mark(self, phase, at=None):
+        self.marks.append((phase, time.perf_counter() if at is None else at))
+
+    def report(self):
+        marks = sorted(self.marks, key=lambda m: m[1])
+        lines = [f"{'phase':<28}{'at ms':>10}{'delta ms':>10}"]
+        previous = self.process_origin
+        for phase, at in marks:
+            lines.append(f"{phase:<28}{(at - self.process_origin) * 1000:>10.1f}{(at - previous) * 1000:>10.1f}")
+            previous = at
+        return "\n".join(lines)
+
+    def emit(self, fallback_path=None):
+        text = self.report()
+        if sys.stdout is not None:
+            print(text, flush=True)
+        elif fallback_path:
+            # Windowed builds have no console; leave the report next to the other station data.
+            with open(fallback_path, "w", encoding="utf-8") as fh:
+                fh.write(text + "\n")
+        return text
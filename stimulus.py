@@ -0,0 +1,98 @@
+import json
+import os
+import time
+
+from results_store import default_data_dir
+
+
+def present(widget, draw, clock=time.perf_counter):
+    draw()
+    # Canvas redraws run as idle callbacks; flush them so the timestamp follows the repaint.
+    widget.update_idletasks()
+    return clock()
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def calibration_path():
+    return os.path.join(default_data_dir(), "calibration.json")
+
+
+def load_calibration(path=None):
+    try:
+        with open(path or calibration_path(), "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def save_calibration(summary, path=None):
+    with open(path or calibration_path(), "w", encoding="utf-8") as fh:
+        json.dump(summary, fh, indent=2)
+
+
+class StationCalibration:
+    PROBE_EVENT = "<<CalibrationProbe>>"
+
+    def __init__(self, canvas, schedule, bind, probe_item, samples=60, interval=25, on_done=None, clock=time.perf_counter):
+        self.canvas = canvas
+        self.schedule = schedule
+        self.bind = bind
+        self.probe_item = probe_item
+        self.samples = samples
+        self.interval = interval
+        self.on_done = on_done
+        self.clock = clock
+
+        self.dispatch_ms = []
+        self.flush_ms = []
+        self._sent_at = None
+        self._count = 0
+
+    def start(self):
+        self.bind(self.canvas, self.PROBE_EVENT, self._on_probe)
+        self.schedule(self.interval, self._probe)
+
+    def _probe(self):
+        fill = "lime" if self._count % 2 == 0 else "red"
+        self.canvas.itemconfigure(self.probe_item, fill=fill)
+        started = self.clock()
+        self.canvas.update_idletasks()
+        self.flush_ms.append((self.clock() - started) * 1000.0)
+
+        # Time for a queued virtual event to reach its binding: Tk's event-queue dispatch only, not
+        # the keyboard-to-callback latency, which this cannot see.
+        self._sent_at = self.clock()
+        self.canvas.event_generate(self.PROBE_EVENT, when="tail")
+
+    def _on_probe(self, _event):
+        if self._sent_at is None:
+            return
+        self.dispatch_ms.append((self.clock() - self._sent_at) * 1000.0)
+        self._sent_at = None
+        self._count += 1
+        if self._count >= self.samples:
+            if self.on_done:
+                self.on_done(self.summary())
+            return
+        self.schedule(self.interval, self._probe)
+
+    def summary(self):
+        return {
+            "samples": self._count,
+            "measured_at": time.time(),
+            "event_dispatch_ms": {
+                "median": percentile(self.dispatch_ms, 50),
+                "p95": percentile(self.dispatch_ms, 95)
+            },
+            "draw_to_flush_ms": {
+                "median": percentile(self.flush_ms, 50),
+                "p95": percentile(self.flush_ms, 95)
+            }
+        }
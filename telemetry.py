@@ -0,0 +1,144 @@
+import bisect
+import json
+import os
+import time
+
+from results_store import default_data_dir
+
+
+# Bucket upper edges in ms; one overflow bucket past the last edge. Memory is fixed per session.
+LATENESS_EDGES_MS = (0.5, 1, 2, 4, 6, 8, 12, 16, 25, 33, 50, 100, 250)
+FRAME_EDGES_MS = (8, 10, 12, 14, 15, 16, 17, 18, 20, 25, 33, 50, 100, 250)
+OVERLAY_INTERVAL = 0.25
+# A session whose p95 frame time or scheduler lateness passes these is flagged as over budget.
+FRAME_BUDGET_FACTOR = 1.5
+LATENESS_BUDGET_MS = 8.0
+
+
+def telemetry_path():
+    return os.path.join(default_data_dir(), "telemetry.jsonl")
+
+
+class Histogram:
+    def __init__(self, edges):
+        self.edges = edges
+        self.counts = [0] * (len(edges) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.edges, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct):
+        # Upper edge of the bucket holding the percentile; the overflow bucket reports the max seen.
+        if not self.count:
+            return None
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.edges[idx] if idx < len(self.edges) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max, 3),
+            "edges_ms": list(self.edges),
+            "counts": list(self.counts)
+        }
+
+
+class SessionTelemetry:
+    # Wall-clock timing for one session. It reads time.perf_counter() directly rather than the
+    # session clock, so turning it on never changes what a recording captures.
+    def __init__(self, target_fps=60, on_update=None, clock=time.perf_counter):
+        self.clock = clock
+        self.period_ms = 1000.0 / max(1, target_fps)
+        self.lateness = Histogram(LATENESS_EDGES_MS)
+        self.frame_time = Histogram(FRAME_EDGES_MS)
+        self.jitter = Histogram(LATENESS_EDGES_MS)
+        self.on_update = on_update
+        self.last_frame = None
+        self.window_started = clock()
+        self.window_frames = 0
+        self.fps = 0.0
+
+    def job_ran(self, lateness):
+        self.lateness.add(max(0.0, lateness * 1000.0))
+        self._maybe_update()
+
+    def frame(self):
+        now = self.clock()
+        if self.last_frame is not None:
+            frame_ms = (now - self.last_frame) * 1000.0
+            self.frame_time.add(frame_ms)
+            self.jitter.add(abs(frame_ms - self.period_ms))
+        self.last_frame = now
+        self.window_frames += 1
+
+    def _maybe_update(self):
+        now = self.clock()
+        elapsed = now - self.window_started
+        if elapsed < OVERLAY_INTERVAL:
+            return
+        self.fps = self.window_frames / elapsed
+        self.window_started = now
+        self.window_frames = 0
+        if self.on_update is not None:
+            self.on_update(self)
+
+    def overlay_text(self):
+        late = self.lateness.percentile(95)
+        text = f"late p95 {late:g} ms" if late is not None else "late -"
+        if self.frame_time.count:
+            text = f"{self.fps:4.1f} fps  jitter p95 {self.jitter.percentile(95):g} ms  " + text
+        return text
+
+    def over_budget(self):
+        frame_p95 = self.frame_time.percentile(95)
+        late_p95 = self.lateness.percentile(95)
+        return (
+            (frame_p95 is not None and frame_p95 > self.period_ms * FRAME_BUDGET_FACTOR)
+            or (late_p95 is not None and late_p95 > LATENESS_BUDGET_MS)
+        )
+
+    def summary(self, session, station):
+        return {
+            "session_key": session.session_key,
+            "player": session.current_player,
+            "game": session.current_game,
+            "station": station,
+            "ended_at": time.time(),
+            "target_frame_ms": round(self.period_ms, 3),
+            "over_budget": self.over_budget(),
+            "lateness": self.lateness.summary(),
+            "frame_time": self.frame_time.summary(),
+            "frame_jitter": self.jitter.summary()
+        }
+
+
+def observe_job(owner, lateness):
+    # SharedScheduler observer: attribute each job's lateness to the session that scheduled it.
+    stats = getattr(owner, "telemetry", None)
+    if stats is not None:
+        stats.job_ran(lateness)
+
+
+def write_summaries(summaries, sync=False):
+    with open(telemetry_path(), "a", encoding="utf-8") as fh:
+        for summary in summaries:
+            fh.write(json.dumps(summary, sort_keys=True) + "\n")
+        if sync:
+            fh.flush()
+            os.fsync(fh.fileno())
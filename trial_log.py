@@ -0,0 +1,132 @@
+import mmap
+import os
+import struct
+import time
+
+from game_engine import GAMES
+from results_store import default_data_dir
+
+
+# One record per stimulus or response:
+#   t_ns, session_key, latency_ns, trial, stimulus, response, game, kind (+2 pad bytes)
+RECORD = struct.Struct("<qqqIiiBBxx")
+MAGIC = b"FPSTRL01"
+HEADER = MAGIC + bytes(RECORD.size - len(MAGIC))
+
+GAME_CODES = {game: idx for idx, game in enumerate(GAMES, start=1)}
+GAME_NAMES = {idx: game for game, idx in GAME_CODES.items()}
+
+KIND_STIMULUS = 1
+KIND_RESPONSE = 2
+KIND_TIMEOUT = 3
+KIND_LEVEL_UP = 4
+# One per keystroke of a typed answer: stimulus is the keystroke ordinal within the trial,
+# response the digit (or KEY_DELETE), latency the time since the previous keystroke or the prompt.
+KIND_KEY = 5
+# One per precisely scheduled stimulus event: stimulus is the event (ONSET_*), response the
+# requested delay in ms, t_ns the planned onset and latency the actual minus the planned onset,
+# so the actual onset is t_ns + latency_ns.
+KIND_ONSET = 6
+
+ONSET_REACTION_GREEN = 1
+ONSET_REACTION_TIMEOUT = 2
+ONSET_DECISION_ROUND = 3
+
+NO_RESPONSE = -1
+TOO_EARLY = -2
+KEY_DELETE = 0
+
+DECISION_KEYS = ("Left", "Right", "Up", "Down")
+ATTENTION_OUTCOMES = {"hit": 0, "distractor": 1, "miss": 2}
+
+FIELDS = ("t_ns", "session_key", "latency_ns", "trial", "stimulus", "response", "game", "kind")
+NUMPY_DTYPE = [
+    ("t_ns", "<i8"),
+    ("session_key", "<i8"),
+    ("latency_ns", "<i8"),
+    ("trial", "<u4"),
+    ("stimulus", "<i4"),
+    ("response", "<i4"),
+    ("game", "u1"),
+    ("kind", "u1"),
+    ("_pad", "V2")
+]
+
+
+def default_trial_log_path():
+    return os.path.join(default_data_dir(), "trials.bin")
+
+
+class TrialLog:
+    def __init__(self, path=None, buffer_records=1024, writer=None):
+        self.path = path or default_trial_log_path()
+        self.writer = writer
+        self.buffer_limit = buffer_records * RECORD.size
+        self.buffer = bytearray()
+        self.records = 0
+        self._pack = RECORD.pack
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "wb") as fh:
+                fh.write(HEADER)
+
+    def log(self, session_key, game, trial, kind, stimulus=0, response=NO_RESPONSE, latency=0.0, t_ns=None):
+        self.buffer += self._pack(
+            time.time_ns() if t_ns is None else t_ns,
+            session_key,
+            int(latency * 1e9),
+            trial,
+            stimulus,
+            response,
+            GAME_CODES[game],
+            kind
+        )
+        self.records += 1
+        if len(self.buffer) >= self.buffer_limit:
+            self.flush()
+
+    def take(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.writer is not None:
+            self.writer(self.take())
+        else:
+            with open(self.path, "ab") as fh:
+                fh.write(self.take())
+
+    def close(self):
+        self.flush()
+
+
+def _check_header(view, path):
+    if len(view) < RECORD.size or bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{path} is not a trial log")
+
+
+def iter_records(path=None):
+    path = path or default_trial_log_path()
+    unpack_from = RECORD.unpack_from
+    size = RECORD.size
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _check_header(mm, path)
+            end = size + (len(mm) - size) // size * size
+            for offset in range(size, end, size):
+                yield dict(zip(FIELDS, unpack_from(mm, offset)))
+
+
+def open_memmap(path=None):
+    import numpy as np
+
+    path = path or default_trial_log_path()
+    size = os.path.getsize(path)
+    with open(path, "rb") as fh:
+        _check_header(fh.read(RECORD.size), path)
+    count = (size - RECORD.size) // RECORD.size
+    return np.memmap(path, dtype=np.dtype(NUMPY_DTYPE), mode="r", offset=RECORD.size, shape=(count,))
@@ -0,0 +1,213 @@
+import os
+import queue
+import threading
+import time
+
+
+FSYNC_POLICIES = ("never", "batch", "interval")
+# Seconds before each retry of a batch whose sink raised; after the last it is dropped.
+RETRY_BACKOFF = (0.5, 1.0, 2.0, 4.0, 8.0)
+
+
+def append_bytes(path, chunks, sync=False):
+    data = memoryview(b"".join(chunks))
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0))
+    try:
+        start = os.lseek(fd, 0, os.SEEK_END)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+            if sync:
+                os.fsync(fd)
+        except OSError:
+            # Cut a partial append off before the batch is retried: a torn record would misalign
+            # every fixed-size record after it.
+            os.ftruncate(fd, start)
+            raise
+    finally:
+        os.close(fd)
+
+
+def write_files(items, sync=False):
+    for path, data in items:
+        with open(path, "wb") as fh:
+            fh.write(data)
+            if sync:
+                fh.flush()
+                os.fsync(fh.fileno())
+
+
+class WriteBehind:
+    def __init__(self, flush_interval=0.25, max_batch=512, fsync="interval", fsync_interval=5.0, name="write-behind"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+
+        self.sinks = {}
+        self.queue = queue.Queue()
+        self.submitted = {}
+        self.written = {}
+        self.dropped = {}
+        self.retrying = {}
+        self.errors = 0
+        self.last_error = None
+        self.batches = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self._last_sync = time.monotonic()
+        self._closed = False
+        self._flushed = threading.Condition()
+        # Failed batches waiting to be retried: (due, attempts so far, name, items).
+        self._retries = []
+
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def register(self, name, writer):
+        self.sinks[name] = writer
+        self.submitted.setdefault(name, 0)
+        self.written.setdefault(name, 0)
+        self.dropped.setdefault(name, 0)
+        self.retrying.setdefault(name, 0)
+
+    def submit(self, name, item):
+        # Sinks may hand items on to another sink while the queue is closing.
+        if self._closed and threading.current_thread() is not self.thread:
+            raise RuntimeError("write-behind queue is closed")
+        self.submitted[name] += 1
+        self.queue.put((name, item))
+
+    def pending(self, name=None):
+        if name is None:
+            return sum(self.pending(n) for n in self.submitted)
+        return self.submitted.get(name, 0) - self.written.get(name, 0) - self.dropped.get(name, 0)
+
+    def metrics(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "pending": self.pending(),
+            "batches": self.batches,
+            "items": sum(self.written.values()),
+            "errors": self.errors,
+            "retrying": sum(self.retrying.values()),
+            "dropped": sum(self.dropped.values()),
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms,
+            "avg_flush_ms": self._total_flush_ms / self.batches if self.batches else 0.0
+        }
+
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._flushed:
+            while self.pending():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._flushed.wait(remaining)
+        return True
+
+    def close(self, timeout=5.0):
+        # True once the thread has finished: only then may what the sinks write to be closed.
+        if not self._closed:
+            self._closed = True
+            self.queue.put(None)
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                first = self.queue.get(timeout=self._retry_wait())
+            except queue.Empty:
+                self._write([])
+                continue
+            if first is None:
+                break
+            batch = [first]
+            # Keep collecting for flush_interval so bursts become one transaction / write.
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self.queue.get(timeout=max(0.0, remaining)) if remaining > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+        # Closing: everything still queued or waiting on a retry gets one last attempt, including
+        # items sinks hand on while this runs.
+        while True:
+            batch = []
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    batch.append(item)
+            if not batch and not self._retries:
+                break
+            self._write(batch, final=True)
+
+    def _retry_wait(self):
+        if not self._retries:
+            return None
+        return max(0.0, min(retry[0] for retry in self._retries) - time.monotonic())
+
+    def _write(self, batch, final=False):
+        now = time.monotonic()
+        due = [retry for retry in self._retries if final or retry[0] <= now]
+        self._retries = [retry for retry in self._retries if not (final or retry[0] <= now)]
+        grouped = {}
+        for name, item in batch:
+            grouped.setdefault(name, []).append(item)
+
+        sync = final or self.fsync == "batch" or (
+            self.fsync == "interval" and now - self._last_sync >= self.fsync_interval
+        )
+        if sync:
+            self._last_sync = now
+
+        started = time.perf_counter()
+        # Retries go first so a sink still sees its items in submission order.
+        for _due, attempts, name, items in due:
+            self.retrying[name] -= len(items)
+            self._deliver(name, items, sync, attempts, final)
+        for name, items in grouped.items():
+            waiting = next((retry for retry in self._retries if retry[2] == name), None)
+            if waiting is not None:
+                # Held behind the failed batch so the sink still sees items in submission order.
+                waiting[3].extend(items)
+                self.retrying[name] += len(items)
+                continue
+            self._deliver(name, items, sync, 0, final)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+        self.batches += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        with self._flushed:
+            self._flushed.notify_all()
+
+    def _deliver(self, name, items, sync, attempts, final):
+        try:
+            self.sinks[name](items, sync)
+        except Exception as exc:
+            self.errors += 1
+            self.last_error = exc
+            if final or attempts >= len(RETRY_BACKOFF):
+                self.dropped[name] += len(items)
+            else:
+                self.retrying[name] += len(items)
+                self._retries.append((time.monotonic() + RETRY_BACKOFF[attempts], attempts + 1, name, items))
+            return
+        self.written[name] += len(items)